@@ -0,0 +1,78 @@
+"""
+Latency comparison of the sync and async execution engines.
+
+Runs a batch of pipeline events and a dashboard generation on both engines against the in-process fakes in
+fake_services.py, with a fixed latency on every API call standing in for the network. The async engine lists the
+executions of the pipelines in a batch concurrently and writes the dashboards while the existing ones are listed, so
+the gap grows with the number of pipelines and the latency.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_async_engine.py [latency in ms] [pipelines]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault('AWS_REGION', 'us-east-1')
+os.environ.setdefault('PIPELINE_PATTERN', '*')
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+for variable in ['EXECUTION_STORE', 'PIPELINE_REGISTRY']:
+    os.environ.pop(variable, None)
+
+import dashboard_generator  # noqa: E402
+from async_batch_event_handler import AsyncBatchEventHandler  # noqa: E402
+from async_dashboard_generator import AsyncDashboardGenerator  # noqa: E402
+from async_engine import run_async  # noqa: E402
+from batch_event_handler import BatchEventHandler  # noqa: E402
+from bench_suite import generate_events  # noqa: E402
+from fake_services import FakeCloudWatch, FakeCodePipeline  # noqa: E402
+from pipeline_event_handler import shared_execution_cache  # noqa: E402
+
+DASHBOARD_PIPELINES = 1000
+
+
+def run_batch(engine: str, pipelines: int, latency: float) -> float:
+    codepipeline = FakeCodePipeline(pipelines, 500, latency=latency)
+    cloudwatch = FakeCloudWatch(latency=latency)
+    records = generate_events(codepipeline, pipelines * 2)
+    shared_execution_cache.clear()
+
+    start = time.perf_counter()
+    if engine == 'sync':
+        BatchEventHandler(records, codepipeline=codepipeline, cloudwatch=cloudwatch).execute_batch_steps()
+    else:
+        run_async(
+            AsyncBatchEventHandler(records, codepipeline=codepipeline, cloudwatch=cloudwatch).execute_batch_steps_async
+        )
+    return time.perf_counter() - start
+
+
+def run_dashboard(engine: str, latency: float) -> float:
+    cloudwatch = FakeCloudWatch([f'pipeline-{index:05d}' for index in range(DASHBOARD_PIPELINES)], latency=latency)
+    dashboard_generator.published_dashboard_hashes.clear()
+
+    start = time.perf_counter()
+    if engine == 'sync':
+        dashboard_generator.DashboardGenerator(cloudwatch=cloudwatch).cloudwatch_put_dashboard()
+    else:
+        run_async(AsyncDashboardGenerator(cloudwatch=cloudwatch).cloudwatch_put_dashboard_async)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    latency = float(sys.argv[1]) / 1000 if len(sys.argv) > 1 else 0.05
+    pipelines = int(sys.argv[2]) if len(sys.argv) > 2 else 25
+
+    print(f"{'scenario':<40} {'sync':>10} {'async':>10} {'speedup':>8}")
+    scenarios = [
+        (f'batch of {pipelines * 2} events, {pipelines} pipelines', lambda engine: run_batch(engine, pipelines, latency)),
+        (f'dashboard, {DASHBOARD_PIPELINES} pipelines', lambda engine: run_dashboard(engine, latency))
+    ]
+    for name, scenario in scenarios:
+        sync_seconds = scenario('sync')
+        async_seconds = scenario('async')
+        print(f"{name:<40} {sync_seconds:>9.2f}s {async_seconds:>9.2f}s {sync_seconds / async_seconds:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
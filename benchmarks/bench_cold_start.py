@@ -0,0 +1,71 @@
+"""
+Import time and cold start benchmark for the Lambda entry points.
+
+Every measurement runs in a fresh interpreter with ``python -X importtime``, importing ``main`` followed by the modules
+the entry point loads when it is invoked, the same work a Lambda cold start does before the handler code runs. The
+median of several runs is reported along with the slowest top level imports, so import regressions stand out.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_cold_start.py [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+SRC_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+# Modules imported by each entry point in main.py
+ENTRY_POINTS = {
+    'main (no handler)': [],
+    'pipeline_event_handler': ['pipeline_event_handler'],
+    'pipeline_batch_event_handler': ['batch_event_handler'],
+    'dashboard_handler': ['dashboard_generator']
+}
+
+
+def import_times(modules: list) -> dict:
+    """
+    Imports main and the modules in a fresh interpreter
+
+    Returns:
+        dict: Cumulative import time in microseconds of every module imported
+    """
+    statement = '; '.join(f'import {module}' for module in ['main'] + modules)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=SRC_DIRECTORY,
+        env=dict(os.environ, PYTHONPATH=SRC_DIRECTORY),
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True
+    )
+    times = {}
+
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _self_time, cumulative_time, name = line[len('import time:'):].split('|')
+        # Only top level imports, nested imports are already part of the cumulative time of their parent
+        if name.startswith(' ' * 3):
+            continue
+        times[name.strip()] = int(cumulative_time)
+
+    return times
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    for entry_point, modules in ENTRY_POINTS.items():
+        samples = [import_times(modules) for _ in range(runs)]
+        total = statistics.median(sum(times.values()) for times in samples)
+        slowest = sorted(samples[-1].items(), key=lambda item: item[1], reverse=True)[:3]
+
+        print(f"{entry_point:<30} {total / 1000:>8.1f} ms")
+        for name, cumulative_time in slowest:
+            print(f"    {name:<26} {cumulative_time / 1000:>8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
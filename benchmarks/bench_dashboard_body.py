@@ -0,0 +1,88 @@
+"""
+Benchmark for building the dashboard bodies of large fleets.
+
+Compares the previous build, a tree of dicts with a new widget for every pipeline serialised and hashed with json.dumps,
+with the template builder, which serialises the pipeline widget once and streams each widget into the body. Both build
+the same shards and produce the same bodies. Reports the build time and the peak memory traced while building.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_dashboard_body.py [pipelines ...]
+"""
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault('AWS_REGION', 'us-east-1')
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+from dashboard_generator import DashboardGenerator, dashboard_body_hash  # noqa: E402
+
+FLEET_SIZES = [1000, 5000, 10000]
+RUNS = 3
+
+
+def build_dicts(generator: DashboardGenerator, shards: list) -> list:
+    bodies = []
+    for shard in shards:
+        widgets = [generator._generate_fleet_widget(0, generator.period)]
+        widgets.extend(
+            generator._generate_widget(index * 3, generator.period, pipeline, source)
+            for index, (source, pipeline) in enumerate(shard, 1)
+        )
+        y = (len(shard) + 1) * 3
+        widgets.extend(
+            generator._generate_widget_descriptions(index * 4, y, description['title'], description['description'])
+            for index, description in enumerate(generator.widget_descriptions)
+        )
+        dashboard = {'widgets': widgets}
+        bodies.append((json.dumps(dashboard), dashboard_body_hash(dashboard)))
+    return bodies
+
+
+def build_template(generator: DashboardGenerator, shards: list) -> list:
+    widget_templates = generator._generate_widget_templates()
+    return [
+        (dashboard.body, dashboard.hash)
+        for dashboard in (generator._generate_dashboard(shard, widget_templates) for shard in shards)
+    ]
+
+
+def measure(build, generator: DashboardGenerator, shards: list) -> tuple:
+    seconds = min(timed(build, generator, shards) for _ in range(RUNS))
+
+    tracemalloc.start()
+    build(generator, shards)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return seconds, peak / 1024 / 1024
+
+
+def timed(build, generator: DashboardGenerator, shards: list) -> float:
+    start = time.perf_counter()
+    build(generator, shards)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    fleet_sizes = [int(argument) for argument in sys.argv[1:]] or FLEET_SIZES
+    generator = DashboardGenerator(cloudwatch=object(), pipeline_registry=object())
+
+    print(f"{'pipelines':>10} {'dashboards':>10} {'dicts':>10} {'template':>10} {'dicts peak':>11} {'template peak':>14}")
+    for pipelines in fleet_sizes:
+        names = [(generator.home_source, f'pipeline-{index:05d}') for index in range(pipelines)]
+        shards = generator._split_pipelines(names, generator._generate_widget_templates())
+        assert build_dicts(generator, shards) == build_template(generator, shards)
+
+        dict_seconds, dict_peak = measure(build_dicts, generator, shards)
+        template_seconds, template_peak = measure(build_template, generator, shards)
+        print(
+            f"{pipelines:>10} {len(shards):>10} {dict_seconds:>9.3f}s {template_seconds:>9.3f}s "
+            f"{dict_peak:>8.1f} MiB {template_peak:>10.1f} MiB"
+        )
+
+
+if __name__ == '__main__':
+    main()
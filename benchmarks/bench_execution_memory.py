@@ -0,0 +1,68 @@
+"""
+Memory benchmark for holding long pipeline execution histories.
+
+Compares the resident size of the raw ``list_pipeline_executions`` summaries (as boto3 returns them, with the nested
+``sourceRevisions`` and ``trigger`` structures) against the ``ExecutionRecord`` tuples the handler, the execution cache
+and the backfill now keep, measured with ``tracemalloc``.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_execution_memory.py [executions ...]
+"""
+import datetime
+import sys
+import tracemalloc
+from typing import Callable
+
+from execution_record import parse_execution_summaries
+
+
+def pipeline_executions(count: int) -> list:
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return [
+        {
+            'pipelineExecutionId': f'{index:08d}-c777-4b06-859a-378e2f3a8abe',
+            'status': 'Succeeded' if index % 3 else 'Failed',
+            'startTime': now - datetime.timedelta(hours=index),
+            'lastUpdateTime': now - datetime.timedelta(hours=index, minutes=-5),
+            'sourceRevisions': [
+                {
+                    'actionName': 'Repo',
+                    'revisionId': f'{index:040x}',
+                    'revisionSummary': f'Merge pull request #{index} from foo/bar',
+                    'revisionUrl': f'https://github.com/foo/bar/commit/{index:040x}'
+                }
+            ],
+            'trigger': {
+                'triggerType': 'StartPipelineExecution',
+                'triggerDetail': 'arn:aws:sts::123456789012:assumed-role/AWSReservedSSO_FOOBAR/foobar'
+            }
+        }
+        for index in range(count)
+    ]
+
+
+def allocated_bytes(build: Callable[[], list]) -> int:
+    tracemalloc.start()
+    snapshot = build()
+    allocated, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del snapshot
+    return allocated
+
+
+def main() -> None:
+    counts = [int(count) for count in sys.argv[1:]] or [10000, 50000]
+
+    for count in counts:
+        summaries_bytes = allocated_bytes(lambda: pipeline_executions(count))
+        # The summaries are released once parsed, so only the records and their execution ids stay allocated
+        records_bytes = allocated_bytes(lambda: parse_execution_summaries(pipeline_executions(count)))
+
+        print(
+            f"{count:>7} executions  summaries {summaries_bytes / 2 ** 20:>8.1f} MiB  "
+            f"records {records_bytes / 2 ** 20:>7.1f} MiB  ({summaries_bytes / records_bytes:.1f}x smaller)"
+        )
+
+
+if __name__ == '__main__':
+    main()
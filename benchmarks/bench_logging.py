@@ -0,0 +1,77 @@
+"""
+Micro-benchmark for the per-event logging overhead of the pipeline event handler.
+
+Compares the previous call-site pattern (``inspect.stack()`` plus eager f-string formatting of API responses) against
+the lazy %-style calls now used with the ``Logger`` module, with the logger at its default INFO level so that debug
+records are discarded.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_logging.py [events]
+"""
+import datetime
+import inspect
+import io
+import logging
+import sys
+import timeit
+
+from logger import Logger
+
+# Number of debug log lines written while handling a single successful pipeline event
+DEBUG_CALLS_PER_EVENT = 20
+
+
+def pipeline_executions(count: int = 100) -> dict:
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return {
+        'pipelineExecutionSummaries': [
+            {
+                'pipelineExecutionId': f'{index:08d}-c777-4b06-859a-378e2f3a8abe',
+                'status': 'Succeeded' if index % 3 else 'Failed',
+                'startTime': now - datetime.timedelta(hours=index),
+                'lastUpdateTime': now - datetime.timedelta(hours=index, minutes=-5),
+                'sourceRevisions': [
+                    {
+                        'actionName': 'Repo',
+                        'revisionId': 'baz',
+                        'revisionSummary': 'foobar',
+                        'revisionUrl': 'https://github.com/foo/bar/commit/baz'
+                    }
+                ],
+                'trigger': {
+                    'triggerType': 'StartPipelineExecution',
+                    'triggerDetail': 'arn:aws:sts::123456789012:assumed-role/AWSReservedSSO_FOOBAR/foobar'
+                }
+            }
+            for index in range(count)
+        ]
+    }
+
+
+def legacy_event(logger: logging.Logger, response: dict) -> None:
+    logger.debug(f"{inspect.stack()[0][3]} - response: {response}")
+    logger.debug(f"{inspect.stack()[0][3]} - pipeline_summaries: {response['pipelineExecutionSummaries']}")
+    for _ in range(DEBUG_CALLS_PER_EVENT - 2):
+        logger.debug(f"{inspect.stack()[0][3]} - Checking the current execution status")
+
+
+def lazy_event(logger: logging.Logger, response: dict) -> None:
+    logger.debug("response: %s", response)
+    logger.debug("pipeline_summaries: %s", response['pipelineExecutionSummaries'])
+    for _ in range(DEBUG_CALLS_PER_EVENT - 2):
+        logger.debug("Checking the current execution status")
+
+
+def main() -> None:
+    events = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    logger = Logger(logger_name='LoggingBenchmark', level='INFO').setup_logger()
+    logger.handlers[0].stream = io.StringIO()
+    response = pipeline_executions()
+
+    for name, handle_event in [('before (inspect.stack + f-string)', legacy_event), ('after (lazy)', lazy_event)]:
+        seconds = timeit.timeit(lambda: handle_event(logger, response), number=events)
+        print(f"{name:<36} {seconds / events * 1e6:>10.1f} us/event")
+
+
+if __name__ == '__main__':
+    main()
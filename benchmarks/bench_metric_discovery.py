@@ -0,0 +1,96 @@
+"""
+Benchmark for discovering the pipelines on the dashboard from the CloudWatch Metrics.
+
+Runs the previous discovery (every metric in the namespace, filtered client side) and the current discovery (one
+server side filtered query per discovery metric, run concurrently) against a stubbed CloudWatch client. The stub
+serves pages of 500 metrics, the ListMetrics page size, with a fixed latency per page.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_metric_discovery.py [pipelines] [page latency in ms]
+"""
+import os
+import sys
+import threading
+import time
+
+os.environ.setdefault('AWS_REGION', 'us-east-1')
+
+from dashboard_generator import DashboardGenerator  # noqa: E402
+
+METRIC_NAMES = [
+    'SuccessCount', 'FailureCount', 'SuccessLeadTime', 'DeliveryLeadTime',
+    'SuccessCycleTime', 'YellowTime', 'RedTime', 'FailureLeadTime'
+]
+PAGE_SIZE = 500
+
+
+class StubPaginator():
+    def __init__(self, client: 'StubCloudWatch') -> None:
+        self.client = client
+
+    def paginate(self, Namespace: str, MetricName: str = None, Dimensions: list = None, **kwargs):
+        metrics = [
+            metric for metric in self.client.metrics
+            if (MetricName is None or metric['MetricName'] == MetricName)
+            and all(
+                any(dimension['Name'] == metric_dimension['Name'] for metric_dimension in metric['Dimensions'])
+                for dimension in Dimensions or []
+            )
+        ]
+        for index in range(0, max(len(metrics), 1), PAGE_SIZE):
+            time.sleep(self.client.page_latency)
+            with self.client.lock:
+                self.client.pages += 1
+            yield {'Metrics': metrics[index:index + PAGE_SIZE]}
+
+
+class StubCloudWatch():
+    def __init__(self, pipelines: int, page_latency: float) -> None:
+        self.metrics = [
+            {
+                'Namespace': 'Pipeline',
+                'MetricName': metric_name,
+                'Dimensions': [{'Name': 'PipelineName', 'Value': f'pipeline-{index:05d}'}]
+            }
+            for index in range(pipelines)
+            for metric_name in METRIC_NAMES
+        ]
+        self.page_latency = page_latency
+        self.lock = threading.Lock()
+        self.pages = 0
+
+    def get_paginator(self, operation_name: str) -> StubPaginator:
+        return StubPaginator(self)
+
+
+def legacy_discovery(cloudwatch: StubCloudWatch) -> list:
+    metrics_list = []
+    for response in cloudwatch.get_paginator('list_metrics').paginate(Namespace='Pipeline', RecentlyActive='PT3H'):
+        metrics_list.extend(response['Metrics'])
+
+    pipelines = []
+    for metric in metrics_list:
+        for dimension in metric['Dimensions']:
+            if dimension['Name'] == 'PipelineName':
+                pipelines.append(dimension['Value'])
+
+    return sorted(set(pipelines))
+
+
+def main() -> None:
+    pipelines = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    page_latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 50) / 1000
+
+    for name, discover in [
+        ('before (full namespace)', legacy_discovery),
+        ('after (filtered, concurrent)', lambda cloudwatch: DashboardGenerator(cloudwatch=cloudwatch)._get_pipelines())
+    ]:
+        cloudwatch = StubCloudWatch(pipelines, page_latency)
+        start_time = time.perf_counter()
+        discovered = discover(cloudwatch)
+        seconds = time.perf_counter() - start_time
+        print(f"{name:<30} {len(discovered):>6} pipelines {cloudwatch.pages:>5} pages {seconds:>8.3f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark for matching pipeline names against many pipeline patterns.
+
+Compares checking every pattern with ``fnmatch`` against the compiled ``PipelineMatcher``, both before its memoised
+results are warm and once they are, for team owned prefix patterns mixed with a few other globs and exclusions.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_pipeline_matcher.py [patterns] [names]
+"""
+import fnmatch
+import random
+import sys
+import time
+
+from pipeline_matcher import PipelineMatcher
+
+
+def pipeline_patterns(count: int) -> list:
+    patterns = [f'team-{index:04d}-*' for index in range(count - count // 10)]
+    patterns += [f'*-service-{index:04d}' for index in range(count // 20)]
+    patterns += [f'!team-{index:04d}-sandbox*' for index in range(count // 10 - count // 20)]
+    return patterns
+
+
+def pipeline_names(count: int, teams: int) -> list:
+    generator = random.Random(0)
+    return [
+        f"team-{generator.randrange(teams * 2):04d}-{generator.choice(['api', 'sandbox', 'web'])}" for _ in range(count)
+    ]
+
+
+def fnmatch_filter(patterns: list, names: list) -> list:
+    includes = [pattern for pattern in patterns if not pattern.startswith('!')]
+    excludes = [pattern[1:] for pattern in patterns if pattern.startswith('!')]
+    return [
+        name for name in names
+        if any(fnmatch.fnmatch(name, pattern) for pattern in includes)
+        and not any(fnmatch.fnmatch(name, pattern) for pattern in excludes)
+    ]
+
+
+def main() -> None:
+    pattern_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    name_count = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    patterns = pipeline_patterns(pattern_count)
+    names = pipeline_names(name_count, pattern_count)
+
+    start_time = time.perf_counter()
+    expected = fnmatch_filter(patterns, names)
+    print(f"{'before (fnmatch per pattern)':<32} {time.perf_counter() - start_time:>8.3f} s")
+
+    start_time = time.perf_counter()
+    matcher = PipelineMatcher(','.join(patterns), cache_size=name_count)
+    print(f"{'compile':<32} {time.perf_counter() - start_time:>8.3f} s")
+
+    for name in ['after (cold)', 'after (memoised)']:
+        start_time = time.perf_counter()
+        assert matcher.filter(names) == expected
+        print(f"{name:<32} {time.perf_counter() - start_time:>8.3f} s")
+
+
+if __name__ == '__main__':
+    main()
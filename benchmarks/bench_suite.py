@@ -0,0 +1,227 @@
+"""
+Benchmark suite for event handling and dashboard generation against synthetic fleets.
+
+Each scenario serves a synthetic fleet through the in-process fakes in fake_services.py, with the same page sizes as
+the real APIs, so the results don't depend on the network:
+
+* events: pipeline events handled one after the other, as the pipeline event handler Lambda does, for fleets from 10
+  pipelines with 10,000 executions each to 10,000 pipelines with 100 executions each. Reports the events handled per
+  second and the API calls made per event.
+* dashboard: a full dashboard generation run for fleets of 10 to 10,000 pipelines. Reports the build time and the API
+  calls made.
+
+The best time of three runs is reported, and every scenario is run once more under tracemalloc to report its peak
+memory. The results are compared against a stored baseline, and the suite exits with a non-zero status when a result is
+worse than the baseline by more than the tolerance. Times depend on the machine, so the baseline should be saved on
+the machine it is compared on; API calls and peak memory are stable across machines.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_suite.py [--baseline path] [--save-baseline] [--tolerance 0.25]
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault('AWS_REGION', 'us-east-1')
+os.environ.setdefault('PIPELINE_PATTERN', '*')
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+for variable in ['EXECUTION_STORE', 'PIPELINE_REGISTRY']:
+    os.environ.pop(variable, None)
+
+import dashboard_generator  # noqa: E402
+from cache import TTLCache  # noqa: E402
+from fake_services import FakeCloudWatch, FakeCodePipeline  # noqa: E402
+from pipeline_event_handler import PipelineEventHandler  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+EVENTS_PER_SCENARIO = 1000
+# Timings are the best of several runs, to keep noise from other processes out of the comparison
+RUNS = 3
+
+# (pipelines, executions per pipeline)
+EVENT_FLEETS = [(10, 10000), (1000, 1000), (10000, 100)]
+DASHBOARD_FLEETS = [10, 1000, 10000]
+
+# Whether a larger value of a result is an improvement
+HIGHER_IS_BETTER = {
+    'events_per_second': True,
+    'api_calls_per_event': False,
+    'build_seconds': False,
+    'api_calls': False,
+    'peak_memory_mib': False
+}
+
+# Absolute differences below these are noise rather than regressions
+NOISE_FLOOR = {'build_seconds': 0.05}
+
+
+def generate_events(codepipeline: FakeCodePipeline, count: int) -> list:
+    """
+    Builds pipeline events in a round robin over the fleet. The first round is for the most recent final execution of
+    each pipeline, the next round for the one before it, and so on.
+
+    Returns:
+        list: EventBridge CodePipeline execution state change events
+    """
+    events = []
+    positions = {}
+
+    while len(events) < count:
+        pipeline_name = codepipeline.pipeline_names[len(events) % len(codepipeline.pipeline_names)]
+        index = positions.get(pipeline_name, codepipeline.executions_per_pipeline) - 1
+        execution = codepipeline.execution(pipeline_name, index)
+        while execution['status'] not in ['Succeeded', 'Failed']:
+            index -= 1
+            execution = codepipeline.execution(pipeline_name, index)
+        positions[pipeline_name] = index
+
+        events.append({
+            'time': execution['lastUpdateTime'].strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'detail': {
+                'pipeline': pipeline_name,
+                'execution-id': execution['pipelineExecutionId'],
+                'state': execution['status'].upper()
+            }
+        })
+
+    return events
+
+
+def run_events(pipelines: int, executions_per_pipeline: int) -> dict:
+    codepipeline = FakeCodePipeline(pipelines, executions_per_pipeline)
+    cloudwatch = FakeCloudWatch()
+    execution_cache = TTLCache(maxsize=128, ttl=30)
+    events = generate_events(codepipeline, EVENTS_PER_SCENARIO)
+
+    start = time.perf_counter()
+    for event in events:
+        PipelineEventHandler(
+            event, codepipeline=codepipeline, cloudwatch=cloudwatch, execution_cache=execution_cache
+        ).execute_event_steps()
+    elapsed = time.perf_counter() - start
+
+    return {
+        'events_per_second': len(events) / elapsed,
+        'api_calls_per_event': (codepipeline.api_calls() + cloudwatch.api_calls()) / len(events)
+    }
+
+
+def run_dashboard(pipelines: int) -> dict:
+    cloudwatch = FakeCloudWatch(f'pipeline-{index:05d}' for index in range(pipelines))
+    dashboard_generator.published_dashboard_hashes.clear()
+
+    start = time.perf_counter()
+    dashboard_generator.DashboardGenerator(cloudwatch=cloudwatch).cloudwatch_put_dashboard()
+    elapsed = time.perf_counter() - start
+
+    return {'build_seconds': elapsed, 'api_calls': cloudwatch.api_calls()}
+
+
+def peak_memory(scenario, *args) -> float:
+    """
+    Runs a scenario under tracemalloc
+
+    Returns:
+        float: Peak traced memory in MiB
+    """
+    tracemalloc.start()
+    try:
+        scenario(*args)
+        return tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+        tracemalloc.stop()
+
+
+def run_suite() -> dict:
+    results = {}
+
+    for pipelines, executions_per_pipeline in EVENT_FLEETS:
+        name = f'events {pipelines} pipelines x {executions_per_pipeline} executions'
+        results[name] = max(
+            (run_events(pipelines, executions_per_pipeline) for _ in range(RUNS)),
+            key=lambda result: result['events_per_second']
+        )
+        results[name]['peak_memory_mib'] = peak_memory(run_events, pipelines, executions_per_pipeline)
+
+    for pipelines in DASHBOARD_FLEETS:
+        name = f'dashboard {pipelines} pipelines'
+        results[name] = min(
+            (run_dashboard(pipelines) for _ in range(RUNS)), key=lambda result: result['build_seconds']
+        )
+        results[name]['peak_memory_mib'] = peak_memory(run_dashboard, pipelines)
+
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Prints every result next to its baseline
+
+    Returns:
+        list: Descriptions of the results that are worse than the baseline by more than the tolerance
+    """
+    regressions = []
+
+    for name, metrics in results.items():
+        print(name)
+        for metric, value in metrics.items():
+            expected = baseline.get(name, {}).get(metric)
+            if expected is None:
+                print(f"    {metric:<20} {value:>12.3f}")
+                continue
+
+            change = (value - expected) / expected if expected else 0.0
+            worse = -change if HIGHER_IS_BETTER[metric] else change
+            regressed = worse > tolerance and abs(value - expected) > NOISE_FLOOR.get(metric, 0)
+            marker = '  REGRESSION' if regressed else ''
+            print(f"    {metric:<20} {value:>12.3f} {expected:>12.3f} {change:>+8.1%}{marker}")
+            if marker:
+                regressions.append(f'{name}: {metric} {value:.2f} against a baseline of {expected:.2f}')
+
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark event handling and dashboard generation')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='Path of the baseline results')
+    parser.add_argument('--save-baseline', action='store_true', help='Store the results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed relative regression, 0.25 for 25%%')
+    args = parser.parse_args()
+
+    results = run_suite()
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as baseline_file:
+            json.dump(
+                {
+                    'created': datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+                    'results': results
+                },
+                baseline_file,
+                indent=2,
+                sort_keys=True
+            )
+            baseline_file.write('\n')
+        compare(results, {}, args.tolerance)
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)['results']
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} result(s) regressed by more than {args.tolerance:.0%}:")
+        for regression in regressions:
+            print(f"    {regression}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
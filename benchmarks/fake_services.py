@@ -0,0 +1,260 @@
+"""
+In-process fakes of the CodePipeline and CloudWatch clients used by the benchmarks and the tests.
+
+The fakes serve synthetic fleets with the same paging behaviour as the real APIs (100 executions per
+list_pipeline_executions page, 500 metrics per list_metrics page) and count every API call, including each page that
+is requested through a paginator. Every call can be given a fixed latency to stand in for the network, and the highest
+number of calls in flight at the same time is recorded. Executions are generated page by page from a seed, so fleets of
+thousands of pipelines with long histories never have to be held in memory.
+"""
+import datetime
+import random
+import threading
+import time
+from collections import Counter
+
+import botocore
+from botocore.paginate import TokenDecoder
+
+EXECUTIONS_PER_PAGE = 100
+METRICS_PER_PAGE = 500
+START_TIME = datetime.datetime(2021, 4, 1, tzinfo=datetime.timezone.utc)
+
+
+class FakePaginator():
+    def __init__(self, client: 'FakeService', operation_name: str) -> None:
+        self.client = client
+        self.operation_name = operation_name
+
+    def paginate(self, PaginationConfig: dict = None, **kwargs):
+        starting_token = (PaginationConfig or {}).get('StartingToken')
+        next_token = TokenDecoder().decode(starting_token)['nextToken'] if starting_token else None
+
+        while True:
+            self.client.record_call(self.operation_name)
+            response = getattr(self.client, self.operation_name)(_count=False, nextToken=next_token, **kwargs)
+            yield response
+            next_token = response.get('nextToken')
+            if next_token is None:
+                return
+
+
+class FakeService():
+    def __init__(self, latency: float = 0.0) -> None:
+        self.lock = threading.Lock()
+        self.calls = Counter()
+        self.latency = latency
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def record_call(self, operation_name: str) -> None:
+        with self.lock:
+            self.calls[operation_name] += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        if self.latency:
+            time.sleep(self.latency)
+        with self.lock:
+            self.in_flight -= 1
+
+    def get_paginator(self, operation_name: str) -> FakePaginator:
+        return FakePaginator(self, operation_name)
+
+    def api_calls(self) -> int:
+        return sum(self.calls.values())
+
+
+class FakeCodePipeline(FakeService):
+    def __init__(
+        self,
+        pipelines: int,
+        executions_per_pipeline: int,
+        seed: int = 0,
+        latency: float = 0.0,
+        prefix: str = 'pipeline',
+        statuses: list = None,
+        failing_pipelines: tuple = ()
+    ) -> None:
+        """
+        Args:
+            pipelines (int): Number of pipelines, named with the prefix and their index
+            executions_per_pipeline (int): Length of the execution history of every pipeline
+            seed (int): Seed the executions are generated from
+            latency (float): Seconds every call takes
+            prefix (str): Prefix of the pipeline names
+            statuses (list): Statuses the executions cycle through from the oldest, instead of random statuses
+            failing_pipelines (tuple): Pipelines whose executions can't be listed
+        """
+        super().__init__(latency)
+        self.pipeline_names = [f'{prefix}-{index:05d}' for index in range(pipelines)]
+        self.executions_per_pipeline = executions_per_pipeline
+        self.seed = seed
+        self.statuses = statuses
+        self.failing_pipelines = failing_pipelines
+
+    def execution(self, pipeline_name: str, index: int) -> dict:
+        """
+        Builds an execution summary of a pipeline. Executions start roughly an hour apart, so any page of the history
+        can be built without building the executions before it.
+
+        Args:
+            pipeline_name (str): Name of the pipeline
+            index (int): Position of the execution in the history, 0 being the oldest
+
+        Returns:
+            dict: Execution summary
+        """
+        generator = random.Random(f'{self.seed}-{pipeline_name}-{index}')
+        start_time = START_TIME + datetime.timedelta(seconds=index * 3600 + generator.randint(0, 1800))
+        return {
+            'pipelineExecutionId': f'{pipeline_name}-{index:05d}',
+            'status': (
+                self.statuses[index % len(self.statuses)] if self.statuses
+                else generator.choice(['Succeeded', 'Succeeded', 'Succeeded', 'Failed', 'Stopped'])
+            ),
+            'startTime': start_time,
+            'lastUpdateTime': start_time + datetime.timedelta(seconds=generator.randint(30, 1800)),
+            'sourceRevisions': [
+                {
+                    'actionName': 'Source',
+                    'revisionId': f'{generator.getrandbits(160):040x}',
+                    'revisionSummary': 'Merge pull request',
+                    'revisionUrl': 'https://github.com/foo/bar/commit/baz'
+                }
+            ],
+            'trigger': {
+                'triggerType': 'Webhook',
+                'triggerDetail': f'arn:aws:codepipeline:us-east-1:123456789012:{pipeline_name}'
+            }
+        }
+
+    def list_pipeline_executions(self, pipelineName: str, nextToken: str = None, _count: bool = True) -> dict:
+        if _count:
+            self.record_call('list_pipeline_executions')
+        if pipelineName in self.failing_pipelines:
+            raise botocore.exceptions.ClientError({'Error': {'Code': 'ThrottlingException'}}, 'ListPipelineExecutions')
+        offset = int(nextToken or 0)
+        # Most recent first, like the real API
+        newest = self.executions_per_pipeline - 1 - offset
+        oldest = max(newest - EXECUTIONS_PER_PAGE, -1)
+        response = {
+            'pipelineExecutionSummaries': [self.execution(pipelineName, index) for index in range(newest, oldest, -1)]
+        }
+        if offset + EXECUTIONS_PER_PAGE < self.executions_per_pipeline:
+            response['nextToken'] = str(offset + EXECUTIONS_PER_PAGE)
+        return response
+
+    def event(self, pipeline_name: str, index: int = 0) -> dict:
+        """
+        Builds the state change event of an execution
+
+        Args:
+            pipeline_name (str): Name of the pipeline
+            index (int): Position of the execution in the history, 0 being the most recent
+
+        Returns:
+            dict: CodePipeline execution state change event
+        """
+        execution = self.execution(pipeline_name, self.executions_per_pipeline - 1 - index)
+        return {
+            'id': execution['pipelineExecutionId'],
+            'time': execution['lastUpdateTime'].strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'detail': {
+                'pipeline': pipeline_name,
+                'execution-id': execution['pipelineExecutionId'],
+                'state': execution['status'].upper()
+            }
+        }
+
+    def list_pipelines(self, nextToken: str = None, _count: bool = True) -> dict:
+        if _count:
+            self.record_call('list_pipelines')
+        offset = int(nextToken or 0)
+        response = {'pipelines': [{'name': name} for name in self.pipeline_names[offset:offset + EXECUTIONS_PER_PAGE]]}
+        if offset + EXECUTIONS_PER_PAGE < len(self.pipeline_names):
+            response['nextToken'] = str(offset + EXECUTIONS_PER_PAGE)
+        return response
+
+
+class FakeCloudWatch(FakeService):
+    def __init__(
+        self,
+        pipeline_names: list = (),
+        dashboards: dict = None,
+        latency: float = 0.0,
+        keep_metric_data: bool = False
+    ) -> None:
+        """
+        Args:
+            pipeline_names (list): Pipelines the metrics are listed for
+            dashboards (dict): Bodies of the existing dashboards by name
+            latency (float): Seconds every call takes
+            keep_metric_data (bool): Keeps the published data points, which the benchmarks leave out of the traced
+                memory
+        """
+        super().__init__(latency)
+        self.pipeline_names = list(pipeline_names)
+        self.keep_metric_data = keep_metric_data
+        self.metric_data = []
+        self.dashboards = dict(dashboards or {})
+
+    def put_metric_data(self, Namespace: str, MetricData: list) -> dict:
+        self.record_call('put_metric_data')
+        if self.keep_metric_data:
+            with self.lock:
+                self.metric_data.extend(MetricData)
+        return {}
+
+    def list_metrics(
+        self,
+        Namespace: str,
+        MetricName: str = None,
+        Dimensions: list = None,
+        nextToken: str = None,
+        _count: bool = True,
+        **kwargs
+    ) -> dict:
+        if _count:
+            self.record_call('list_metrics')
+        metric_names = [MetricName] if MetricName else ['SuccessCount', 'FailureCount', 'SuccessLeadTime', 'RedTime']
+        offset = int(nextToken or 0)
+        # Metrics are built one page at a time, like the real API serves them
+        metrics = []
+        for index in range(offset, min(offset + METRICS_PER_PAGE, len(self.pipeline_names) * len(metric_names))):
+            pipeline_name = self.pipeline_names[index // len(metric_names)]
+            metrics.append({
+                'Namespace': Namespace,
+                'MetricName': metric_names[index % len(metric_names)],
+                'Dimensions': [{'Name': 'PipelineName', 'Value': pipeline_name}]
+            })
+        response = {'Metrics': metrics}
+        if offset + METRICS_PER_PAGE < len(self.pipeline_names) * len(metric_names):
+            response['nextToken'] = str(offset + METRICS_PER_PAGE)
+        return response
+
+    def get_dashboard(self, DashboardName: str) -> dict:
+        self.record_call('get_dashboard')
+        with self.lock:
+            if DashboardName not in self.dashboards:
+                raise botocore.exceptions.ClientError({'Error': {'Code': 'ResourceNotFound'}}, 'GetDashboard')
+            return {'DashboardName': DashboardName, 'DashboardBody': self.dashboards[DashboardName]}
+
+    def put_dashboard(self, DashboardName: str, DashboardBody: str) -> dict:
+        self.record_call('put_dashboard')
+        with self.lock:
+            self.dashboards[DashboardName] = DashboardBody
+        return {'DashboardValidationMessages': []}
+
+    def list_dashboards(self, DashboardNamePrefix: str = '', nextToken: str = None, _count: bool = True) -> dict:
+        if _count:
+            self.record_call('list_dashboards')
+        with self.lock:
+            names = sorted(name for name in self.dashboards if name.startswith(DashboardNamePrefix))
+        return {'DashboardEntries': [{'DashboardName': name} for name in names]}
+
+    def delete_dashboards(self, DashboardNames: list) -> dict:
+        self.record_call('delete_dashboards')
+        with self.lock:
+            for dashboard_name in DashboardNames:
+                self.dashboards.pop(dashboard_name, None)
+        return {}
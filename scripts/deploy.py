@@ -14,6 +14,7 @@ class Deploy:
         self.s3_bucket = sys.argv[2]
         self.cft_file_name = sys.argv[3]
         self.pipeline_pattern = sys.argv[4]
+        self.pipeline_filter = sys.argv[5] if len(sys.argv) > 5 else ''
         self.cft_s3_file_name = 'aws-codepipeline-dashboard-cft.yaml'
         self.lambda_zip_file_name = 'aws-codepipeline-dashboard-lambda-1.0.1'
         self.lambda_dir_name = 'src'
@@ -22,6 +23,10 @@ class Deploy:
                 'ParameterKey': 'PipelinePattern',
                 'ParameterValue': self.pipeline_pattern
             },
+            {
+                'ParameterKey': 'PipelineFilter',
+                'ParameterValue': self.pipeline_filter
+            },
             {
                 'ParameterKey': 'BucketName',
                 'ParameterValue': self.s3_bucket
@@ -14,5 +14,6 @@ setup(
     packages=find_packages('src'),
     package_dir={'': 'src'},
     install_requires=['boto3'],
+    extras_require={'backfill': ['numpy']},
     python_requires='>=3.8'
 )
@@ -0,0 +1,78 @@
+import asyncio
+
+import botocore
+
+from async_engine import AsyncRunner
+from batch_event_handler import BatchEventHandler
+from metric_buffer import get_metric_emitter
+from pipeline_event_handler import PipelineEventHandler
+
+
+class AsyncBatchEventHandler(BatchEventHandler):
+    def _process_pipeline_events(self, pipeline_events: list) -> list:
+        """
+        Adds the metrics for the events of one pipeline to a buffer of its own, so pipelines can be processed
+        concurrently and a failed pipeline drops only its own data points
+
+        Args:
+            pipeline_events (list): List of (item identifier, event) pairs of the pipeline
+
+        Returns:
+            list: Data points of the events
+        """
+        metric_buffer = get_metric_emitter(self.cloudwatch, namespace='Pipeline')
+        for _item_identifier, event in pipeline_events:
+            PipelineEventHandler(
+                event,
+                codepipeline=self.codepipeline,
+                cloudwatch=self.cloudwatch,
+                metric_buffer=metric_buffer
+            ).process_event()
+
+        return metric_buffer.metric_data
+
+    async def execute_batch_steps_async(self, runner: AsyncRunner) -> dict:
+        """
+        Performs the same steps as execute_batch_steps, with the executions of every pipeline in the batch listed
+        concurrently and the metric requests sent concurrently. The data points are buffered in the same order as the
+        sync engine buffers them.
+
+        Args:
+            runner (AsyncRunner): Runner the blocking calls are made on
+
+        Returns:
+            dict: Partial batch response listing the item identifiers that failed
+        """
+        events, failed_items = self._parse_records()
+        processed_groups = []
+        pipeline_events = self._group_events_by_pipeline(events)
+
+        results = await asyncio.gather(
+            *[runner.run(self._process_pipeline_events, grouped_events) for grouped_events in pipeline_events.values()],
+            return_exceptions=True
+        )
+
+        for (pipeline_name, grouped_events), result in zip(pipeline_events.items(), results):
+            item_identifiers = [item_identifier for item_identifier, _event in grouped_events]
+            if isinstance(result, BaseException):
+                self.logger.exception(
+                    "Error occurred while processing the %s events\nException: \n%s",
+                    pipeline_name,
+                    result,
+                    exc_info=result
+                )
+                failed_items.extend(item_identifiers)
+                continue
+
+            self.metric_buffer.metric_data.extend(result)
+            processed_groups.append((item_identifiers, result))
+
+        try:
+            await runner.flush(self.metric_buffer)
+        except botocore.exceptions.ClientError:
+            failed_items.extend(self._unsent_items(processed_groups))
+
+        self.logger.info("Processed %s records, %s failed", len(self.records), len(failed_items))
+        return {
+            'batchItemFailures': [{'itemIdentifier': item_identifier} for item_identifier in failed_items]
+        }
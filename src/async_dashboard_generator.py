@@ -0,0 +1,40 @@
+import asyncio
+
+from async_engine import AsyncRunner
+from dashboard_generator import DashboardGenerator
+from instrumentation import Instrumentation
+
+
+class AsyncDashboardGenerator(DashboardGenerator):
+    async def cloudwatch_put_dashboard_async(self, runner: AsyncRunner) -> None:
+        """
+        Performs the same steps as cloudwatch_put_dashboard, with the dashboards written concurrently while the
+        existing dashboards are listed. The steps are timed as in cloudwatch_put_dashboard when the INSTRUMENTATION
+        setting is enabled, with the listing of the existing dashboards counted as part of DeleteDashboards.
+
+        Args:
+            runner (AsyncRunner): Runner the blocking calls are made on
+        """
+        instrumentation = Instrumentation('DashboardGenerator')
+        instrumentation.attach(self.cloudwatch)
+
+        pipelines = await runner.run_phase(instrumentation, 'GetPipelines', self._get_all_pipelines)
+        with instrumentation.phase('GenerateDashboards'):
+            dashboards = self._generate_dashboards(pipelines)
+
+        listing = asyncio.ensure_future(runner.run_phase(instrumentation, 'DeleteDashboards', self._list_dashboards))
+        with instrumentation.phase('PutDashboards'):
+            await asyncio.gather(
+                *[
+                    runner.run(self._put_dashboard, dashboard_name, dashboard)
+                    for dashboard_name, dashboard in dashboards.items()
+                ]
+            )
+        existing_dashboards = await listing
+
+        unused_dashboards = [
+            dashboard_name for dashboard_name in existing_dashboards if dashboard_name not in dashboards
+        ]
+        if unused_dashboards:
+            await runner.run_phase(instrumentation, 'DeleteDashboards', self._delete_dashboards, unused_dashboards)
+        instrumentation.emit()
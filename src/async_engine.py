@@ -0,0 +1,91 @@
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+# The async handlers live in the async_* modules next to their sync handlers, so an entry point only loads the modules
+# of the handler it runs
+
+
+def get_max_concurrency() -> int:
+    """
+    Returns:
+        int: Maximum number of blocking calls the async engine runs at the same time, from ASYNC_MAX_CONCURRENCY
+    """
+    return int(os.environ.get('ASYNC_MAX_CONCURRENCY', '8'))
+
+
+class AsyncRunner():
+    """
+    Runs the blocking Boto3 calls of a handler on a thread pool from an asyncio event loop, so independent calls
+    overlap. A semaphore bounds the number of calls in flight to the size of the pool, which should stay within the
+    BOTO_MAX_POOL_CONNECTIONS of the shared clients.
+    """
+
+    def __init__(self, max_concurrency: int) -> None:
+        self.max_concurrency = max_concurrency
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        self.semaphore = None
+
+    async def run(self, function: Callable, *args, **kwargs):
+        """
+        Runs a blocking function on the thread pool once a slot is free
+
+        Args:
+            function (Callable): Blocking function
+
+        Returns:
+            Any: Return value of the function
+        """
+        # The semaphore is created within the running loop, as Python 3.8 binds it to the loop it is created in
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async with self.semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, functools.partial(function, *args, **kwargs))
+
+    async def run_phase(self, instrumentation, phase_name: str, function: Callable, *args, **kwargs):
+        """
+        Runs a blocking function on the thread pool, timed as a step of the invocation. Steps that run concurrently are
+        each timed from the moment they start waiting for a slot.
+
+        Args:
+            instrumentation (Instrumentation): Instrumentation of the invocation
+            phase_name (str): Name of the step
+            function (Callable): Blocking function
+
+        Returns:
+            Any: Return value of the function
+        """
+        with instrumentation.phase(phase_name):
+            return await self.run(function, *args, **kwargs)
+
+    async def flush(self, metric_buffer) -> int:
+        """
+        Sends the buffered data points with their requests running concurrently on the thread pool. The flush itself
+        waits on the default executor, so it doesn't hold a slot of the pool its requests run on.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(metric_buffer.flush, self.executor))
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=True)
+
+
+def run_async(coroutine_function: Callable, *args):
+    """
+    Runs a coroutine of the async engine on a new event loop with its own runner
+
+    Args:
+        coroutine_function (Callable): Coroutine function taking the runner as its last argument
+
+    Returns:
+        Any: Return value of the coroutine
+    """
+    runner = AsyncRunner(get_max_concurrency())
+    try:
+        return asyncio.run(coroutine_function(*args, runner))
+    finally:
+        runner.shutdown()
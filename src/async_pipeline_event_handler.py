@@ -0,0 +1,36 @@
+import asyncio
+
+from async_engine import AsyncRunner
+from instrumentation import Instrumentation
+from pipeline_event_handler import PipelineEventHandler
+
+
+class AsyncPipelineEventHandler(PipelineEventHandler):
+    async def execute_event_steps_async(self, runner: AsyncRunner) -> None:
+        """
+        Performs the same steps as execute_event_steps, recording the pipeline in the registry while its executions are
+        listed and sending the metric requests concurrently. The steps are timed as in execute_event_steps when the
+        INSTRUMENTATION setting is enabled.
+
+        Args:
+            runner (AsyncRunner): Runner the blocking calls are made on
+        """
+        instrumentation = Instrumentation('PipelineEventHandler')
+        instrumentation.attach(self.codepipeline, self.cloudwatch)
+
+        with instrumentation.phase('CheckEvent'):
+            self._check_for_allowed_state()
+            self._check_for_pipeline_prefix()
+        await asyncio.gather(
+            runner.run_phase(instrumentation, 'RecordPipeline', self._record_pipeline),
+            runner.run_phase(instrumentation, 'ProcessExecutions', self._process_pipeline_executions)
+        )
+        with instrumentation.phase('AddMetrics'):
+            self._handle_final_state()
+            self._handle_pipeline_yellow_and_red_time()
+            self._handle_pipeline_cycle_time()
+            self._handle_pipeline_lead_time()
+        with instrumentation.phase('Flush'):
+            await runner.flush(self.metric_buffer)
+        self.logger.info("Execution cache statistics: %s", self.execution_cache.statistics())
+        instrumentation.emit()
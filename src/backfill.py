@@ -0,0 +1,304 @@
+import argparse
+import datetime
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import botocore
+
+from cache import TTLCache
+from clients import get_client
+from execution_record import parse_execution_summaries, to_epoch_milliseconds
+from logger import Logger
+from metric_buffer import MetricBuffer, get_fleet_dimensions
+from pipeline_event_handler import PipelineEventHandler
+from pipeline_matcher import get_pipeline_matcher
+from pipeline_registry import get_pipeline_registry
+from rate_limiter import RateLimiter
+
+# CloudWatch rejects data points with a timestamp more than two weeks in the past
+MAX_TIMESTAMP_AGE = datetime.timedelta(days=14)
+
+
+class Backfill():
+    def __init__(
+        self,
+        checkpoint_path: str = 'backfill-checkpoint.json',
+        max_workers: int = 8,
+        requests_per_second: float = 20,
+        engine: str = 'handler',
+        codepipeline=None,
+        cloudwatch=None
+    ) -> None:
+        self.logger = Logger(logger_name='Backfill', level='INFO').setup_logger()
+        self.pipeline_pattern = os.environ['PIPELINE_PATTERN']
+        self.pipeline_matcher = get_pipeline_matcher(self.pipeline_pattern)
+        self.checkpoint_path = checkpoint_path
+        self.max_workers = max_workers
+        self.rate_limiter = RateLimiter(requests_per_second)
+        self.engine = engine
+        self.codepipeline = codepipeline or get_client('codepipeline')
+        self.cloudwatch = cloudwatch or get_client('cloudwatch')
+        self.pipeline_registry = get_pipeline_registry()
+        self.checkpoint_lock = threading.Lock()
+        self.completed_pipelines = self._load_checkpoint()
+
+    def _load_checkpoint(self) -> set:
+        """
+        Reads the pipelines that were completed by a previous run, so an interrupted backfill can be resumed
+
+        Returns:
+            set: Names of the completed pipelines
+        """
+        if not os.path.exists(self.checkpoint_path):
+            return set()
+
+        with open(self.checkpoint_path, 'r') as checkpoint_file:
+            completed_pipelines = set(json.load(checkpoint_file)['completed_pipelines'])
+
+        self.logger.info("Resuming from %s with %s completed pipelines", self.checkpoint_path, len(completed_pipelines))
+        return completed_pipelines
+
+    def _save_checkpoint(self, pipeline_name: str) -> None:
+        """
+        Records a completed pipeline in the checkpoint file
+
+        Args:
+            pipeline_name (str): Name of the completed pipeline
+        """
+        with self.checkpoint_lock:
+            self.completed_pipelines.add(pipeline_name)
+            with open(self.checkpoint_path, 'w') as checkpoint_file:
+                json.dump({'completed_pipelines': sorted(self.completed_pipelines)}, checkpoint_file)
+
+    def _list_pipelines(self) -> list:
+        """
+        Uses the Boto3 API to list the pipelines that match the pipeline pattern and haven't been completed yet
+
+        Returns:
+            list: Names of the pipelines to backfill
+        """
+        pipelines = []
+
+        self.logger.debug("Listing the pipelines matching %s", self.pipeline_pattern)
+        try:
+            paginator = self.codepipeline.get_paginator('list_pipelines')
+
+            for response in paginator.paginate():
+                pipelines.extend(self.pipeline_matcher.filter([pipeline['name'] for pipeline in response['pipelines']]))
+        except (botocore.exceptions.BotoCoreError, botocore.exceptions.ClientError) as e:
+            self.logger.exception("Error occurred while listing the pipelines\nBotocore Exception: \n%s", e)
+            raise
+
+        return [pipeline for pipeline in pipelines if pipeline not in self.completed_pipelines]
+
+    def _list_executions(self, pipeline_name: str) -> list:
+        """
+        Uses the Boto3 API to page through the full execution history of a pipeline, parsing each page into execution
+        records so the summaries of long histories aren't held in memory
+
+        Args:
+            pipeline_name (str): Name of the pipeline
+
+        Returns:
+            list: Execution records of the executions with a final status, most recent first
+        """
+        executions = []
+
+        try:
+            paginator = self.codepipeline.get_paginator('list_pipeline_executions')
+
+            for response in paginator.paginate(pipelineName=pipeline_name):
+                executions.extend(parse_execution_summaries(response['pipelineExecutionSummaries']))
+        except (botocore.exceptions.BotoCoreError, botocore.exceptions.ClientError) as e:
+            self.logger.exception("Error occurred while listing the pipeline executions\nBotocore Exception: \n%s", e)
+            raise
+
+        self.logger.debug("Found %s executions for %s", len(executions), pipeline_name)
+        return executions
+
+    def _replay_with_event_handler(
+        self,
+        pipeline_name: str,
+        executions: list,
+        oldest_timestamp: datetime.datetime,
+        metric_buffer: MetricBuffer
+    ) -> int:
+        """
+        Recomputes the metrics of each execution by running it through the event handler
+
+        Args:
+            pipeline_name (str): Name of the pipeline
+            executions (list): Execution records, most recent first
+            oldest_timestamp (datetime.datetime): Executions that finished before this time are only used as history
+            metric_buffer (MetricBuffer): Buffer the data points are added to
+
+        Returns:
+            int: Number of executions replayed
+        """
+        execution_cache = TTLCache(maxsize=1, ttl=float('inf'))
+        oldest_milliseconds = to_epoch_milliseconds(oldest_timestamp)
+        replayed_executions = 0
+
+        for index, execution in enumerate(executions):
+            if execution.last_update_time < oldest_milliseconds:
+                continue
+
+            # The handler only reads the history from the replayed execution onwards, so it is served from the cache
+            execution_cache.set(
+                pipeline_name,
+                {'pages': [executions[index:]], 'next_token': None, 'complete': True}
+            )
+            finished = datetime.datetime.fromtimestamp(execution.last_update_time / 1000, tz=datetime.timezone.utc)
+            event = {
+                'time': finished.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                'detail': {
+                    'pipeline': pipeline_name,
+                    'execution-id': execution.execution_id,
+                    'state': execution.status.name
+                }
+            }
+            PipelineEventHandler(
+                event,
+                codepipeline=self.codepipeline,
+                cloudwatch=self.cloudwatch,
+                execution_cache=execution_cache,
+                metric_buffer=metric_buffer
+            ).process_event()
+            replayed_executions += 1
+
+        return replayed_executions
+
+    def _replay_with_metrics_engine(
+        self,
+        pipeline_name: str,
+        executions: list,
+        oldest_timestamp: datetime.datetime,
+        metric_buffer: MetricBuffer
+    ) -> int:
+        """
+        Recomputes the metrics of every execution at once with the NumPy metrics engine
+
+        Args:
+            pipeline_name (str): Name of the pipeline
+            executions (list): Execution records, most recent first
+            oldest_timestamp (datetime.datetime): Executions that finished before this time are only used as history
+            metric_buffer (MetricBuffer): Buffer the data points are added to
+
+        Returns:
+            int: Number of executions replayed
+        """
+        # NumPy is only needed by this engine, so it is imported on demand
+        from metrics_engine import MetricsEngine
+
+        fleet_dimensions = get_fleet_dimensions()
+        for metric_datum in MetricsEngine.from_executions(executions).metric_data(pipeline_name, oldest_timestamp):
+            metric_buffer.add(metric_datum)
+            # Matches the fleet data point the event handler publishes with every pipeline data point
+            if fleet_dimensions is not None:
+                metric_buffer.add(dict(metric_datum, Dimensions=fleet_dimensions))
+
+        # The event handler records each replayed pipeline itself, this engine does it once for the latest execution
+        if self.pipeline_registry and executions:
+            self.pipeline_registry.record_pipeline(pipeline_name, executions[0].last_update_time)
+
+        oldest_milliseconds = to_epoch_milliseconds(oldest_timestamp)
+        return sum(1 for execution in executions if execution.last_update_time >= oldest_milliseconds)
+
+    def _replay_pipeline(self, pipeline_name: str, oldest_timestamp: datetime.datetime) -> int:
+        """
+        Recomputes the metrics of every execution of a pipeline and publishes them in bulk, using the time each
+        execution finished as the metric timestamp
+
+        Args:
+            pipeline_name (str): Name of the pipeline
+            oldest_timestamp (datetime.datetime): Executions that finished before this time are only used as history
+
+        Returns:
+            int: Number of executions replayed
+        """
+        executions = self._list_executions(pipeline_name)
+        metric_buffer = MetricBuffer(self.cloudwatch, namespace='Pipeline', rate_limiter=self.rate_limiter)
+
+        if self.engine == 'numpy':
+            replayed_executions = self._replay_with_metrics_engine(
+                pipeline_name, executions, oldest_timestamp, metric_buffer
+            )
+        else:
+            replayed_executions = self._replay_with_event_handler(
+                pipeline_name, executions, oldest_timestamp, metric_buffer
+            )
+
+        metric_buffer.flush()
+        return replayed_executions
+
+    def run(self) -> dict:
+        """
+        Backfills every matching pipeline on a bounded thread pool, checkpointing each pipeline once its metrics have
+        been published
+
+        Returns:
+            dict: Throughput report of the backfill
+        """
+        pipelines = self._list_pipelines()
+        oldest_timestamp = datetime.datetime.now(datetime.timezone.utc) - MAX_TIMESTAMP_AGE
+        replayed_executions = 0
+        failed_pipelines = []
+        start_time = time.monotonic()
+
+        self.logger.info("Backfilling %s pipelines with %s workers", len(pipelines), self.max_workers)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self._replay_pipeline, pipeline, oldest_timestamp): pipeline for pipeline in pipelines
+            }
+            for future in as_completed(futures):
+                pipeline = futures[future]
+                try:
+                    replayed_executions += future.result()
+                except (botocore.exceptions.BotoCoreError, botocore.exceptions.ClientError) as e:
+                    self.logger.error("Unable to backfill %s: %s", pipeline, e)
+                    failed_pipelines.append(pipeline)
+                    continue
+
+                self._save_checkpoint(pipeline)
+
+        elapsed_seconds = time.monotonic() - start_time
+        report = {
+            'pipelines': len(pipelines) - len(failed_pipelines),
+            'failed_pipelines': sorted(failed_pipelines),
+            'executions': replayed_executions,
+            'elapsed_seconds': round(elapsed_seconds, 3),
+            'executions_per_second': round(replayed_executions / elapsed_seconds, 1) if elapsed_seconds else 0.0
+        }
+
+        self.logger.info("Backfill report: %s", report)
+        return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Recomputes the pipeline metrics from the CodePipeline history')
+    parser.add_argument('--pattern', default=os.environ.get('PIPELINE_PATTERN', '*'), help='Pipeline name pattern')
+    parser.add_argument('--checkpoint', default='backfill-checkpoint.json', help='Checkpoint file used to resume')
+    parser.add_argument('--workers', type=int, default=8, help='Number of pipelines backfilled concurrently')
+    parser.add_argument('--requests-per-second', type=float, default=20, help='PutMetricData request rate')
+    parser.add_argument(
+        '--engine',
+        choices=['handler', 'numpy'],
+        default='handler',
+        help='Replay each execution through the event handler, or compute every metric at once with NumPy'
+    )
+    args = parser.parse_args()
+
+    os.environ['PIPELINE_PATTERN'] = args.pattern
+    # Adaptive retries back off client side when CloudWatch starts throttling
+    os.environ.setdefault('BOTO_RETRY_MODE', 'adaptive')
+    os.environ.setdefault('BOTO_MAX_POOL_CONNECTIONS', str(args.workers * 2))
+
+    report = Backfill(args.checkpoint, args.workers, args.requests_per_second, args.engine).run()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+import json
+from collections import OrderedDict
+
+import botocore
+
+from clients import get_client
+from logger import Logger
+from metric_buffer import get_metric_emitter
+from pipeline_event_handler import PipelineEventHandler
+
+
+class BatchEventHandler():
+    def __init__(self, records: list, codepipeline=None, cloudwatch=None) -> None:
+        self.logger = Logger(logger_name='BatchEventHandler', level='INFO').setup_logger()
+        self.records = records
+        self.codepipeline = codepipeline or get_client('codepipeline')
+        self.cloudwatch = cloudwatch or get_client('cloudwatch')
+        self.metric_buffer = get_metric_emitter(self.cloudwatch, namespace='Pipeline')
+
+    def _parse_records(self) -> tuple:
+        """
+        Reads the pipeline events out of the incoming records. Records are either SQS messages with the EventBridge
+        event as the message body, or the EventBridge events themselves.
+
+        Returns:
+            tuple: List of (item identifier, event) pairs and the list of item identifiers that couldn't be parsed
+        """
+        events = []
+        failed_items = []
+
+        self.logger.debug("Parsing %s records", len(self.records))
+        for record in self.records:
+            item_identifier = record.get('messageId', record.get('id'))
+            try:
+                event = json.loads(record['body']) if 'body' in record else record
+                event['detail']['pipeline']  # Ensures the record holds a pipeline event
+                events.append((item_identifier, event))
+            except (KeyError, TypeError, ValueError) as e:
+                self.logger.error("Unable to read a pipeline event from record %s: %s", item_identifier, e)
+                failed_items.append(item_identifier)
+
+        return events, failed_items
+
+    def _group_events_by_pipeline(self, events: list) -> OrderedDict:
+        """
+        Groups the events by pipeline name, with the events of each pipeline in the order they occurred
+
+        Args:
+            events (list): List of (item identifier, event) pairs
+
+        Returns:
+            OrderedDict: Pipeline name mapped to its list of (item identifier, event) pairs
+        """
+        pipeline_events = OrderedDict()
+
+        for item_identifier, event in sorted(events, key=lambda item: item[1].get('time', '')):
+            pipeline_events.setdefault(event['detail']['pipeline'], []).append((item_identifier, event))
+
+        self.logger.debug("Grouped the events into %s pipelines", len(pipeline_events))
+        return pipeline_events
+
+    def _unsent_items(self, processed_groups: list) -> list:
+        """
+        Lists the items of the pipelines whose data points are still buffered after a failed flush. The buffer drops the
+        data points of every request that was sent, so the items whose data points were all published aren't retried
+        and counted twice.
+
+        Args:
+            processed_groups (list): List of (item identifiers, data points) pairs of each processed pipeline
+
+        Returns:
+            list: Item identifiers of the pipelines with data points left to send
+        """
+        unsent_data_points = {id(metric_datum) for metric_datum in self.metric_buffer.metric_data}
+
+        return [
+            item_identifier
+            for item_identifiers, data_points in processed_groups
+            if any(id(metric_datum) in unsent_data_points for metric_datum in data_points)
+            for item_identifier in item_identifiers
+        ]
+
+    def execute_batch_steps(self) -> dict:
+        """
+        Adds the metrics for every event in the batch, one pipeline at a time so that each pipeline's executions are
+        listed once and shared through the execution cache, then sends every data point in bulk. A pipeline whose
+        events can't be processed, or whose data points can't be sent, is reported as a partial batch failure instead of
+        failing the whole batch.
+
+        Returns:
+            dict: Partial batch response listing the item identifiers that failed
+        """
+        events, failed_items = self._parse_records()
+        processed_groups = []
+
+        for pipeline_name, pipeline_events in self._group_events_by_pipeline(events).items():
+            buffered_data_points = len(self.metric_buffer.metric_data)
+            try:
+                for _item_identifier, event in pipeline_events:
+                    PipelineEventHandler(
+                        event,
+                        codepipeline=self.codepipeline,
+                        cloudwatch=self.cloudwatch,
+                        metric_buffer=self.metric_buffer
+                    ).process_event()
+            except Exception as e:
+                self.logger.exception("Error occurred while processing the %s events\nException: \n%s", pipeline_name, e)
+                del self.metric_buffer.metric_data[buffered_data_points:]
+                failed_items.extend(item_identifier for item_identifier, _event in pipeline_events)
+                continue
+
+            processed_groups.append((
+                [item_identifier for item_identifier, _event in pipeline_events],
+                self.metric_buffer.metric_data[buffered_data_points:]
+            ))
+
+        try:
+            self.metric_buffer.flush()
+        except botocore.exceptions.ClientError:
+            failed_items.extend(self._unsent_items(processed_groups))
+
+        self.logger.info("Processed %s records, %s failed", len(self.records), len(failed_items))
+        return {
+            'batchItemFailures': [{'itemIdentifier': item_identifier} for item_identifier in failed_items]
+        }
@@ -0,0 +1,94 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class TTLCache():
+    def __init__(self, maxsize: int = 128, ttl: float = 30.0, timer: Callable[[], float] = time.monotonic) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Looks up a cached value, dropping it if it has outlived the TTL
+
+        Args:
+            key (Hashable): Cache key
+            default (Any): Value returned when the key isn't cached
+
+        Returns:
+            Any: Cached value or the default
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] <= self.timer():
+                if entry is not None:
+                    del self.entries[key]
+                    self.evictions += 1
+                self.misses += 1
+                return default
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Caches a value, evicting the least recently used entry once the cache is full
+
+        Args:
+            key (Hashable): Cache key
+            value (Any): Value to cache
+        """
+        with self.lock:
+            self.entries[key] = (self.timer() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Drops a cached value that is known to be out of date
+
+        Args:
+            key (Hashable): Cache key
+        """
+        with self.lock:
+            if self.entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        """
+        Drops every cached value and resets the counters
+        """
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.invalidations = 0
+
+    def statistics(self) -> dict:
+        """
+        Reports the cache counters, used to size the cache
+
+        Returns:
+            dict: Size, hit, miss, eviction and invalidation counts
+        """
+        with self.lock:
+            return {
+                'size': len(self.entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
@@ -0,0 +1,101 @@
+import datetime
+import os
+import threading
+from typing import Optional
+
+import boto3
+from botocore.config import Config
+
+# Clients are kept at module level so warm Lambda invocations reuse the same clients and their pooled connections
+_clients = {}
+# Sessions with the temporary credentials of each assumed role, and when those credentials expire
+_role_sessions = {}
+# Reentrant, as the client of an assumed role is created with the STS client
+_clients_lock = threading.RLock()
+
+# Assumed role credentials are renewed this long before they expire, so a call never starts with expiring credentials
+ROLE_CREDENTIALS_MARGIN = datetime.timedelta(minutes=5)
+
+
+def client_config() -> Config:
+    """
+    Builds the botocore Config shared by every client, tunable through environment variables
+
+    Returns:
+        Config: botocore client configuration
+    """
+    return Config(
+        max_pool_connections=int(os.environ.get('BOTO_MAX_POOL_CONNECTIONS', '10')),
+        connect_timeout=float(os.environ.get('BOTO_CONNECT_TIMEOUT', '5')),
+        read_timeout=float(os.environ.get('BOTO_READ_TIMEOUT', '10')),
+        retries={
+            'mode': os.environ.get('BOTO_RETRY_MODE', 'standard'),
+            'max_attempts': int(os.environ.get('BOTO_MAX_ATTEMPTS', '3'))
+        }
+    )
+
+
+def _get_role_session(role_arn: str) -> boto3.Session:
+    """
+    Returns a session with the temporary credentials of an assumed role, assuming the role again once the credentials
+    are about to expire. The caller holds the clients lock.
+
+    Args:
+        role_arn (str): ARN of the role to assume
+
+    Returns:
+        boto3.Session: Session using the credentials of the role
+    """
+    session, expiration = _role_sessions.get(role_arn, (None, None))
+    if session and expiration - ROLE_CREDENTIALS_MARGIN > datetime.datetime.now(datetime.timezone.utc):
+        return session
+
+    credentials = get_client('sts').assume_role(
+        RoleArn=role_arn,
+        RoleSessionName=os.environ.get('ROLE_SESSION_NAME', 'pipeline-dashboard')
+    )['Credentials']
+    session = boto3.Session(
+        aws_access_key_id=credentials['AccessKeyId'],
+        aws_secret_access_key=credentials['SecretAccessKey'],
+        aws_session_token=credentials['SessionToken']
+    )
+    _role_sessions[role_arn] = (session, credentials['Expiration'])
+
+    # The clients created with the expired credentials are dropped, so they are created again from the new session
+    for key in [key for key in _clients if key[2] == role_arn]:
+        del _clients[key]
+
+    return session
+
+
+def get_client(service_name: str, region_name: Optional[str] = None, role_arn: Optional[str] = None):
+    """
+    Returns the shared Boto3 client for a service and region, creating it on first use
+
+    Args:
+        service_name (str): Name of the AWS service, for example 'cloudwatch'
+        region_name (Optional[str]): AWS region of the client, defaults to the region of the environment
+        role_arn (Optional[str]): Role to assume for the client, usually in another account. The client uses the
+            credentials of the environment when not set.
+
+    Returns:
+        botocore.client.BaseClient: Boto3 client for the service
+    """
+    key = (service_name, region_name, role_arn)
+
+    # Creating clients from the default session isn't thread safe
+    with _clients_lock:
+        session = _get_role_session(role_arn) if role_arn else boto3
+        if key not in _clients:
+            _clients[key] = session.client(service_name, region_name=region_name, config=client_config())
+
+        return _clients[key]
+
+
+def reset_clients() -> None:
+    """
+    Drops every shared client so the next call to get_client creates a new one
+    """
+    with _clients_lock:
+        _clients.clear()
+        _role_sessions.clear()
@@ -0,0 +1,129 @@
+import hashlib
+import io
+import json
+import re
+from typing import NamedTuple
+
+# json.dumps options of the canonical serialisation dashboard bodies are hashed on, so equal bodies hash the same
+# regardless of key order or whitespace
+CANONICAL_JSON_OPTIONS = {'sort_keys': True, 'separators': (',', ':'), 'ensure_ascii': False}
+
+# Stand-ins for the values that differ between the pipeline widgets of a run. Control characters are always escaped by
+# json.dumps, so the serialised placeholders can't clash with anything else in a widget. The pipeline placeholder can
+# also be part of a longer string, such as a title.
+PIPELINE_PLACEHOLDER = '\x00pipeline\x00'
+Y_PLACEHOLDER = '\x00y\x00'
+
+
+def _format_string(widget: dict, **options) -> str:
+    """
+    Serialises a widget holding the placeholders into a %-format string with a named field for each placeholder
+
+    Args:
+        widget (dict): Widget built with PIPELINE_PLACEHOLDER and Y_PLACEHOLDER
+
+    Returns:
+        str: Format string taking the escaped 'pipeline' name, without quotes, and the 'y' position
+    """
+    fields = {
+        json.dumps(PIPELINE_PLACEHOLDER, **options)[1:-1]: '%(pipeline)s',
+        json.dumps(Y_PLACEHOLDER, **options): '%(y)d'
+    }
+    serialised = json.dumps(widget, **options).replace('%', '%%')
+    return re.sub('|'.join(re.escape(field) for field in fields), lambda match: fields[match.group()], serialised)
+
+
+class WidgetTemplate():
+    """
+    A pipeline widget serialised once per run, both as sent to CloudWatch and in the canonical form, so the widget of
+    each pipeline is rendered by substituting its name and y position instead of building and serialising a new tree
+    """
+
+    def __init__(self, widget: dict) -> None:
+        self.body_format = _format_string(widget)
+        self.canonical_format = _format_string(widget, **CANONICAL_JSON_OPTIONS)
+        self.metrics = len(widget.get('properties', {}).get('metrics', []))
+
+    def render(self, pipeline: str, y: int) -> str:
+        """
+        Returns:
+            str: Widget of the pipeline, exactly as json.dumps serialises the same widget
+        """
+        return self.body_format % {'pipeline': json.dumps(pipeline)[1:-1], 'y': y}
+
+    def render_canonical(self, pipeline: str, y: int) -> str:
+        """
+        Returns:
+            str: Widget of the pipeline in the canonical form
+        """
+        return self.canonical_format % {'pipeline': json.dumps(pipeline, ensure_ascii=False)[1:-1], 'y': y}
+
+
+class DashboardBody(NamedTuple):
+    """
+    Serialised dashboard body, with the hash of its canonical form and the counts checked against the dashboard limits
+    """
+    body: str
+    hash: str
+    widgets: int
+    metrics: int
+
+    @property
+    def size(self) -> int:
+        """
+        Returns:
+            int: Size of the body in bytes. json.dumps escapes every non-ASCII character, so it's the string length.
+        """
+        return len(self.body)
+
+
+class DashboardBodyBuilder():
+    """
+    Streams the widgets of a dashboard into a buffer as they are added, and the canonical form of each widget into the
+    body hash, so the body is never held as a tree of dicts. The body is identical to json.dumps of the same dashboard.
+    """
+
+    def __init__(self) -> None:
+        self.buffer = io.StringIO()
+        self.buffer.write('{"widgets": [')
+        self.body_hash = hashlib.sha256(b'{"widgets":[')
+        self.widgets = 0
+        self.metrics = 0
+
+    def _write(self, widget: str, canonical_widget: str) -> None:
+        if self.widgets:
+            self.buffer.write(', ')
+            self.body_hash.update(b',')
+        self.buffer.write(widget)
+        self.body_hash.update(canonical_widget.encode('utf-8'))
+        self.widgets += 1
+
+    def add_widget(self, widget: dict) -> None:
+        """
+        Adds a widget that is only used once in the run, such as a widget description
+
+        Args:
+            widget (dict): Widget array structure
+        """
+        self._write(json.dumps(widget), json.dumps(widget, **CANONICAL_JSON_OPTIONS))
+        self.metrics += len(widget.get('properties', {}).get('metrics', []))
+
+    def add_pipeline_widget(self, widget_template: WidgetTemplate, pipeline: str, y: int) -> None:
+        """
+        Adds the widget of a pipeline, rendered from a widget template
+
+        Args:
+            widget_template (WidgetTemplate): Template of the pipeline widgets
+            pipeline (str): Name of the pipeline
+            y (int): Vertical position of the widget on the dashboard grid
+        """
+        self._write(widget_template.render(pipeline, y), widget_template.render_canonical(pipeline, y))
+        self.metrics += widget_template.metrics
+
+    def build(self) -> DashboardBody:
+        """
+        Returns:
+            DashboardBody: Serialised dashboard body with the widgets added so far
+        """
+        self.body_hash.update(b']}')
+        return DashboardBody(self.buffer.getvalue() + ']}', self.body_hash.hexdigest(), self.widgets, self.metrics)
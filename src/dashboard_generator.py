@@ -1,21 +1,103 @@
-import inspect
+import hashlib
 import json
+import math
 import os
+import queue
+import re
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional
 
-import boto3
 import botocore
 
+from clients import get_client
+from dashboard_body import (
+    CANONICAL_JSON_OPTIONS,
+    PIPELINE_PLACEHOLDER,
+    Y_PLACEHOLDER,
+    DashboardBody,
+    DashboardBodyBuilder,
+    WidgetTemplate
+)
+from dashboard_sources import DashboardSource, get_dashboard_sources
+from instrumentation import Instrumentation
 from logger import Logger
+from metric_buffer import get_fleet_dimensions
+from pipeline_registry import PipelineRegistry, get_pipeline_registry
+
+# CloudWatch dashboard service limits
+MAX_WIDGETS_PER_DASHBOARD = 500
+MAX_METRICS_PER_DASHBOARD = 2500
+MAX_DASHBOARD_BODY_BYTES = 1000000
+# ListMetrics only returns the metrics that received data within this window (RecentlyActive=PT3H)
+RECENTLY_ACTIVE_SECONDS = 3 * 60 * 60
+
+# Hash of the body last published for each dashboard, kept at module level so warm Lambda containers can skip writing a
+# dashboard that hasn't changed since the previous scheduled run
+published_dashboard_hashes = {}
+dashboard_update_statistics = {'checks': 0, 'skips': 0}
+statistics_lock = threading.Lock()
+# Pipelines last discovered in each source, so warm Lambda containers keep showing the pipelines of a region or account
+# that can't be read during a run instead of dropping them from the dashboard
+discovered_pipelines = {}
+
+
+def _shard_of(key: str, shards: int) -> int:
+    """
+    Jump consistent hash of a key, so growing the number of shards by one only moves the keys that land on the new shard
+
+    Args:
+        key (str): Key to place
+        shards (int): Number of shards
+
+    Returns:
+        int: Index of the shard of the key
+    """
+    state = zlib.crc32(key.encode('utf-8'))
+    shard, candidate = -1, 0
+    while candidate < shards:
+        shard = candidate
+        state = (state * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        candidate = int((shard + 1) * (2147483648.0 / ((state >> 33) + 1)))
+    return shard
+
+
+def dashboard_body_hash(dashboard: dict) -> str:
+    """
+    Hashes the canonical JSON serialisation of a dashboard body, so equal bodies hash the same regardless of key order
+    or whitespace
+
+    Args:
+        dashboard (dict): Dashboard body
+
+    Returns:
+        str: SHA-256 hex digest of the dashboard body
+    """
+    canonical_body = json.dumps(dashboard, **CANONICAL_JSON_OPTIONS)
+    return hashlib.sha256(canonical_body.encode('utf-8')).hexdigest()
 
 
 class DashboardGenerator():
-    def __init__(self) -> None:
+    def __init__(self, cloudwatch=None, pipeline_registry: Optional[PipelineRegistry] = None) -> None:
         self.logger = Logger(logger_name='DashboardGenerator', level='INFO').setup_logger()
-        self.cloudwatch = boto3.client('cloudwatch')
+        self.cloudwatch = cloudwatch or get_client('cloudwatch')
+        self.pipeline_registry = pipeline_registry or get_pipeline_registry()
+        self.pipeline_retention_days = float(os.environ.get('PIPELINE_RETENTION_DAYS', '30'))
         self.namespace = 'Pipeline'
         self.dimension = 'PipelineName'
+        self.fleet_dimensions = get_fleet_dimensions()
+        self.discovery_metric_names = ['SuccessCount', 'FailureCount']
         self.region = os.environ['AWS_REGION']
+        self.home_source = DashboardSource(self.region)
+        self.sources = get_dashboard_sources(self.region)
+        self.max_source_workers = int(os.environ.get('DASHBOARD_SOURCE_WORKERS', '8'))
         self.dashboard_name = f'Pipelines-{self.region}'
+        self.period = 60 * 60 * 24 * 30  # 30 days
+        self.max_pipelines_per_dashboard = int(os.environ.get('DASHBOARD_MAX_PIPELINES', '100'))
+        self.shard_headroom = float(os.environ.get('DASHBOARD_SHARD_HEADROOM', '1.0'))
+        self.max_workers = int(os.environ.get('DASHBOARD_WRITE_WORKERS', '4'))
         self.widget_descriptions = [
             {
                 "title": "Success Lead Time",
@@ -43,53 +125,204 @@ class DashboardGenerator():
             }
         ]
 
-    def _cloudwatch_list_metrics(self) -> list:
+    def _list_metrics(self, metric_name: str, cloudwatch=None) -> Iterator[list]:
         """
-        Uses the Boto3 API to create a list of metrics that match the desired name space
+        Uses the Boto3 API to list a single metric for every pipeline, leaving the filtering on the pipeline name
+        dimension to CloudWatch
 
-        Returns:
-            list: List of the specified metrics
-        """
-        metrics_list = []
+        Args:
+            metric_name (str): Name of the metric
+            cloudwatch: CloudWatch client of the source, defaults to the client of the generator
 
-        self.logger.debug(f"{inspect.stack()[0][3]} - Checking to see if the event state matches with the allowed list")
+        Yields:
+            list: Page of the specified metrics
+        """
+        self.logger.debug("Listing the %s metrics with a %s dimension", metric_name, self.dimension)
         try:
-            paginator = self.cloudwatch.get_paginator('list_metrics')
+            paginator = (cloudwatch or self.cloudwatch).get_paginator('list_metrics')
 
-            for response in paginator.paginate(Namespace=self.namespace, RecentlyActive='PT3H'):
-                metrics_list.extend(response['Metrics'])
+            for response in paginator.paginate(
+                Namespace=self.namespace,
+                MetricName=metric_name,
+                Dimensions=[{'Name': self.dimension}],
+                RecentlyActive='PT3H'
+            ):
+                yield response['Metrics']
         except botocore.exceptions.ClientError as e:
-            self.logger.exception(
-                f"{inspect.stack()[0][3]} - Error occurred while gathering the CloudWatch Metrics"
-                f"\nBotocore Exception: \n{e}"
-            )
+            self.logger.exception("Error occurred while gathering the CloudWatch Metrics\nBotocore Exception: \n%s", e)
             raise
 
-        self.logger.debug(f"{inspect.stack()[0][3]} - metrics_list: {metrics_list}")
-        return metrics_list
+    def _queue_metric_pages(
+        self,
+        metric_name: str,
+        pages: queue.Queue,
+        stopped: threading.Event,
+        cloudwatch=None
+    ) -> None:
+        """
+        Lists a discovery metric onto the queue of pages, followed by None once the metric has been listed
+
+        Args:
+            metric_name (str): Name of the metric
+            pages (queue.Queue): Bounded queue the pages are handed over on
+            stopped (threading.Event): Set once the pages are no longer being read
+            cloudwatch: CloudWatch client of the source, defaults to the client of the generator
+        """
+        try:
+            for metrics in self._list_metrics(metric_name, cloudwatch):
+                if stopped.is_set():
+                    break
+                pages.put(metrics)
+        finally:
+            pages.put(None)
+
+    def _cloudwatch_list_metrics(self, cloudwatch=None) -> Iterator[dict]:
+        """
+        Lists the discovery metrics concurrently. Every pipeline execution publishes either a SuccessCount or a
+        FailureCount, so between them they cover every pipeline without listing the rest of the name space. Pages are
+        handed over on a bounded queue as they arrive, so only a few pages are held in memory at any time.
+
+        Args:
+            cloudwatch: CloudWatch client of the source, defaults to the client of the generator
+
+        Yields:
+            dict: Metric matching the desired name space and dimension
+        """
+        workers = len(self.discovery_metric_names)
+        pages = queue.Queue(maxsize=workers)
+        stopped = threading.Event()
+        finished = 0
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self._queue_metric_pages, metric_name, pages, stopped, cloudwatch)
+                for metric_name in self.discovery_metric_names
+            ]
+            try:
+                while finished < workers:
+                    metrics = pages.get()
+                    if metrics is None:
+                        finished += 1
+                        continue
+                    yield from metrics
+            finally:
+                # Unblocks any worker still waiting to hand over a page when iteration stops early
+                stopped.set()
+                while finished < workers:
+                    finished += pages.get() is None
+
+            for future in futures:
+                future.result()
 
     def _get_pipelines(self) -> list:
+        """
+        Reads the pipelines seen within the retention period from the pipeline registry. Without a registry, runs
+        through the list of metrics and creates a unique list of names that match the desired dimension instead.
+
+        A registry that is empty, or started recording less than the discovery window ago, hasn't seen every active
+        pipeline send an event yet, such as on the first run after it was deployed. Until then the discovered pipelines
+        are added to the list and recorded in the registry, so the dashboard never loses pipelines it showed before.
+
+        Returns:
+            list: Unique list of pipeline names
+        """
+        if self.pipeline_registry:
+            now = time.time()
+            since = round((now - self.pipeline_retention_days * 24 * 60 * 60) * 1000)
+            pipelines = self.pipeline_registry.list_pipelines(since)
+
+            first_seen = self.pipeline_registry.first_seen()
+            if first_seen is None or first_seen > (now - RECENTLY_ACTIVE_SECONDS) * 1000:
+                self.logger.info("Pipeline registry is still filling, adding the pipelines discovered from the metrics")
+                discovered = self._discover_pipelines()
+                for pipeline in discovered:
+                    if pipeline not in pipelines:
+                        self.pipeline_registry.record_pipeline(pipeline, round(now * 1000))
+                pipelines = sorted(set(pipelines).union(discovered))
+
+            self.logger.debug("Registered pipeline list: %s", pipelines)
+            return pipelines
+
+        return self._discover_pipelines()
+
+    def _discover_pipelines(self, cloudwatch=None) -> list:
         """
         Runs through the list of metrics and creates a unique list of names that match the desired dimension
 
+        Args:
+            cloudwatch: CloudWatch client of the source, defaults to the client of the generator
+
         Returns:
             list: Unique list of pipeline names
         """
-        metrics_list = self._cloudwatch_list_metrics()
-        pipelines = []
+        pipelines = set()
 
-        self.logger.debug(
-            f"{inspect.stack()[0][3]} - Checking the metrics list for items matching the desired dimension"
-        )
-        for metric in metrics_list:
+        self.logger.debug("Checking the metrics for items matching the desired dimension")
+        for metric in self._cloudwatch_list_metrics(cloudwatch):
             for dimension in metric['Dimensions']:
                 if dimension['Name'] == self.dimension:
-                    pipelines.append(dimension['Value'])
+                    pipelines.add(dimension['Value'])
+
+        # Sorted so that the dashboard body, and its hash, is stable between runs
+        unique_pipelines = sorted(pipelines)
+
+        self.logger.debug("Unique pipeline list: %s", unique_pipelines)
+        return unique_pipelines
+
+    def _get_source_pipelines(self, source: DashboardSource) -> list:
+        """
+        Reads the pipelines of a source. The region the generator runs in uses the pipeline registry when there is one,
+        other regions and accounts are discovered from their own metrics with a client for the region and role.
+
+        Args:
+            source (DashboardSource): Region and account to read the pipelines of
+
+        Returns:
+            list: Unique list of pipeline names
+        """
+        if source == self.home_source:
+            return self._get_pipelines()
+
+        return self._discover_pipelines(get_client('cloudwatch', region_name=source.region, role_arn=source.role_arn))
+
+    def _get_all_pipelines(self) -> list:
+        """
+        Reads the pipelines of every source concurrently. A source that can't be read keeps the pipelines it had in the
+        previous run of a warm container, or is left off the dashboard, so one unavailable region or account doesn't
+        stop the rest of the dashboard from being updated. The error is raised when no source can be read at all.
+
+        Returns:
+            list: (DashboardSource, pipeline name) pairs, in the order of the sources then by name
+        """
+        if self.sources == [self.home_source]:
+            return [(self.home_source, pipeline) for pipeline in self._get_pipelines()]
+
+        with ThreadPoolExecutor(max_workers=min(self.max_source_workers, len(self.sources))) as executor:
+            futures = [executor.submit(self._get_source_pipelines, source) for source in self.sources]
 
-        self.logger.debug(f"{inspect.stack()[0][3]} - Unique pipeline list: {list(set(pipelines))}")
-        return list(set(pipelines))
+        pipelines = []
+        errors = []
+        for source, future in zip(self.sources, futures):
+            try:
+                source_pipelines = future.result()
+            except (botocore.exceptions.BotoCoreError, botocore.exceptions.ClientError) as e:
+                self.logger.exception("Unable to read the pipelines of %s\nBotocore Exception: \n%s", source.label, e)
+                errors.append(e)
+                if source not in discovered_pipelines:
+                    continue
+                source_pipelines = discovered_pipelines[source]
+                self.logger.warning("Showing the %s pipelines last read from %s", len(source_pipelines), source.label)
+            else:
+                discovered_pipelines[source] = source_pipelines
+
+            pipelines.extend((source, pipeline) for pipeline in source_pipelines)
+
+        if len(errors) == len(self.sources):
+            raise errors[0]
 
-    def _generate_widget(self, y: int, period: int, pipeline: str) -> dict:
+        return pipelines
+
+    def _generate_widget(self, y: int, period: int, pipeline: str, source: Optional[DashboardSource] = None) -> dict:
         """
         Defines the CloudWatch Dashboard Widget array structure
 
@@ -97,10 +330,13 @@ class DashboardGenerator():
             y (int): Vertical position of the widget on the dashboard grid
             period (int): The default period, in seconds, for all metrics in this widget
             pipeline (str): The title to be displayed for the graph or number
+            source (Optional[DashboardSource]): Region and account the metrics are read from, defaults to the region of
+                the generator
 
         Returns:
             dict: Widget array structure
         """
+        source = source or self.home_source
         widgets = {
             "type": "metric",
             "x": 0,
@@ -199,15 +435,46 @@ class DashboardGenerator():
                         }
                     ]
                 ],
-                "region": self.region,
-                "title": pipeline,
+                "region": source.region,
+                "title": pipeline if self.sources == [self.home_source] else f'{pipeline} ({source.label})',
                 "period": period
             }
         }
 
-        self.logger.debug(f"{inspect.stack()[0][3]} - widgets: {widgets}")
+        # Metrics of another account are read through CloudWatch cross-account observability
+        if source.account_id:
+            for metric in widgets['properties']['metrics']:
+                metric[-1]['accountId'] = source.account_id
+
+        self.logger.debug("widgets: %s", widgets)
         return widgets
 
+    def _generate_fleet_widget(self, y: int, period: int, source: Optional[DashboardSource] = None) -> dict:
+        """
+        Defines the fleet overview widget, with the same metrics as a pipeline widget read from the fleet wide data
+        points, so the whole fleet is summarised by a handful of metric queries
+
+        Args:
+            y (int): Vertical position of the widget on the dashboard grid
+            period (int): The default period, in seconds, for all metrics in this widget
+            source (Optional[DashboardSource]): Region and account the metrics are read from, defaults to the region of
+                the generator
+
+        Returns:
+            dict: Widget array structure
+        """
+        widget = self._generate_widget(y, period, 'Fleet Overview', source)
+        fleet_dimensions = [
+            value for dimension in self.fleet_dimensions for value in (dimension['Name'], dimension['Value'])
+        ]
+        widget['properties']['metrics'] = [
+            [self.namespace, metric[1], *fleet_dimensions, metric[-1]]
+            for metric in widget['properties']['metrics']
+        ]
+
+        self.logger.debug("fleet widget: %s", widget)
+        return widget
+
     def _generate_widget_descriptions(self, x: int, y: int, title: str, description: str) -> dict:
         """
         Generates a widget descriptor
@@ -232,41 +499,274 @@ class DashboardGenerator():
             }
         }
 
-        self.logger.debug(f"{inspect.stack()[0][3]} - widget_description: {widget_description}")
+        self.logger.debug("widget_description: %s", widget_description)
         return widget_description
 
-    def cloudwatch_put_dashboard(self) -> None:
+    def _get_published_dashboard_hash(self, dashboard_name: str) -> Optional[str]:
+        """
+        Looks up the hash of the dashboard body that was last published, from the warm container when possible and
+        otherwise by reading the dashboard back from CloudWatch
+
+        Args:
+            dashboard_name (str): Name of the dashboard
+
+        Returns:
+            Optional[str]: Hash of the published dashboard body, or None when it is unknown
+        """
+        if dashboard_name in published_dashboard_hashes:
+            return published_dashboard_hashes[dashboard_name]
+
+        self.logger.debug("Reading the published %s dashboard", dashboard_name)
+        try:
+            response = self.cloudwatch.get_dashboard(DashboardName=dashboard_name)
+        except botocore.exceptions.ClientError as e:
+            if e.response.get('Error', {}).get('Code') != 'ResourceNotFound':
+                self.logger.warning("Unable to read the published %s dashboard: %s", dashboard_name, e)
+            return None
+
+        published_hash = dashboard_body_hash(json.loads(response['DashboardBody']))
+        published_dashboard_hashes[dashboard_name] = published_hash
+        return published_hash
+
+    def _generate_widget_templates(self) -> dict:
         """
-        Creates or updates the CloudWatch Dashboard with widgets and descriptions for each
+        Serialises the pipeline widget of each source once per run, with placeholders for the pipeline name and y
+        position
+
+        Returns:
+            dict: WidgetTemplate of each DashboardSource, the widget of every pipeline is rendered from
+        """
+        return {
+            source: WidgetTemplate(self._generate_widget(Y_PLACEHOLDER, self.period, PIPELINE_PLACEHOLDER, source))
+            for source in self.sources
+        }
+
+    def _generate_dashboard(self, pipelines: list, widget_templates: dict) -> DashboardBody:
+        """
+        Generates the dashboard body with the fleet overview of each source, unless FLEET_METRICS is turned off, then a
+        widget for each pipeline followed by the widget descriptions. The widgets are streamed into the body as they are
+        generated.
+
+        Args:
+            pipelines (list): (DashboardSource, pipeline name) pairs of the pipelines on the dashboard
+            widget_templates (dict): WidgetTemplate of each DashboardSource
+
+        Returns:
+            DashboardBody: Serialised dashboard body
         """
         x = 0
         y = 0
-        period = 60 * 60 * 24 * 30  # 30 days
-        dashboard = {
-            "widgets": []
-        }
+        dashboard = DashboardBodyBuilder()
+
+        if self.fleet_dimensions is not None:
+            self.logger.debug("Creating the fleet overview")
+            for source in self.sources:
+                dashboard.add_widget(self._generate_fleet_widget(y, self.period, source))
+                y += 3
 
-        self.logger.debug(f"{inspect.stack()[0][3]} - Creating the group of widgets")
-        for pipeline in self._get_pipelines():
-            widgets = self._generate_widget(y, period, pipeline)
+        self.logger.debug("Creating the group of widgets")
+        for source, pipeline in pipelines:
+            dashboard.add_pipeline_widget(widget_templates[source], pipeline, y)
             y += 3
-            dashboard['widgets'].append(widgets)
 
-        self.logger.debug(f"{inspect.stack()[0][3]} - Creating the widget descriptions")
+        self.logger.debug("Creating the widget descriptions")
         for widget_description in self.widget_descriptions:
             title = widget_description['title']
             description = widget_description['description']
 
             descriptor = self._generate_widget_descriptions(x, y, title, description)
             x += 4
-            dashboard['widgets'].append(descriptor)
+            dashboard.add_widget(descriptor)
+
+        return dashboard.build()
+
+    def _estimate_size(self, widget: str) -> int:
+        # The y position is the only value that differs once the widget is placed on a dashboard, so a few bytes are
+        # added for its digits
+        return len(widget) + len(', ') + 8
+
+    def _split_pipelines(self, pipelines: list, widget_templates: dict) -> list:
+        """
+        Splits the pipelines across dashboards without going over the widget, metric or body size limits of a CloudWatch
+        dashboard, or the configured number of pipelines per dashboard. A fleet that fits on one dashboard stays on one.
+        Larger fleets get the dashboards they need times DASHBOARD_SHARD_HEADROOM, and each pipeline goes on the
+        dashboard its name hashes to, or the next one with room. With some spare room, adding or removing a pipeline
+        only changes the dashboard it is on, so the other dashboards are skipped as unchanged.
+
+        Args:
+            pipelines (list): Sorted (DashboardSource, pipeline name) pairs
+            widget_templates (dict): WidgetTemplate of each DashboardSource
+
+        Returns:
+            list: List of (DashboardSource, pipeline name) pairs for each dashboard, keeping the order of the pipelines.
+                Dashboards no pipeline hashed to are left empty, so the others keep their number.
+        """
+        base_dashboard = self._generate_dashboard([], widget_templates)
+        max_pipelines = min(self.max_pipelines_per_dashboard, MAX_WIDGETS_PER_DASHBOARD - base_dashboard.widgets)
+        max_metrics = MAX_METRICS_PER_DASHBOARD - base_dashboard.metrics
+        max_size = MAX_DASHBOARD_BODY_BYTES - base_dashboard.size
+        widget_metrics = [widget_templates[source].metrics for source, _pipeline in pipelines]
+        widget_sizes = [
+            self._estimate_size(widget_templates[source].render(pipeline, 0)) for source, pipeline in pipelines
+        ]
+
+        required = max(
+            math.ceil(len(pipelines) / max_pipelines),
+            math.ceil(sum(widget_metrics) / max_metrics),
+            math.ceil(sum(widget_sizes) / max_size)
+        )
+        if required <= 1:
+            return [list(pipelines)]
+
+        shard_count = max(required, math.ceil(required * self.shard_headroom))
+        shards = [[] for _ in range(shard_count)]
+        shard_metrics = [0] * shard_count
+        shard_sizes = [0] * shard_count
+        for (source, pipeline), metrics, size in zip(pipelines, widget_metrics, widget_sizes):
+            index = _shard_of(f'{source.region}/{source.role_arn}/{pipeline}', shard_count)
+            for _attempt in range(len(shards)):
+                if not shards[index] or (
+                    len(shards[index]) < max_pipelines
+                    and shard_metrics[index] + metrics <= max_metrics
+                    and shard_sizes[index] + size <= max_size
+                ):
+                    break
+                index = (index + 1) % len(shards)
+            else:
+                index = len(shards)
+                shards.append([])
+                shard_metrics.append(0)
+                shard_sizes.append(0)
+
+            shards[index].append((source, pipeline))
+            shard_metrics[index] += metrics
+            shard_sizes[index] += size
+
+        self.logger.debug("Split %s pipelines across %s dashboards", len(pipelines), len(shards))
+        return shards
+
+    def _generate_dashboards(self, pipelines: list) -> dict:
+        """
+        Generates the dashboards for the pipelines, rendered from one widget template for each source. A fleet that fits
+        on one dashboard keeps the Pipelines-{region} name, larger fleets are split across Pipelines-{region}-1..N.
+
+        Args:
+            pipelines (list): Sorted (DashboardSource, pipeline name) pairs
+
+        Returns:
+            dict: Serialised dashboard body of each dashboard name
+        """
+        widget_templates = self._generate_widget_templates()
+        shards = self._split_pipelines(pipelines, widget_templates)
+        if len(shards) == 1:
+            return {self.dashboard_name: self._generate_dashboard(shards[0], widget_templates)}
+
+        return {
+            f'{self.dashboard_name}-{index}': self._generate_dashboard(shard, widget_templates)
+            for index, shard in enumerate(shards, start=1) if shard
+        }
+
+    def _list_dashboards(self) -> list:
+        """
+        Uses the Boto3 API to list the dashboards written by the generator for this region, including numbered shards
+
+        Returns:
+            list: Names of the existing dashboards
+        """
+        dashboard_names = []
+
+        try:
+            paginator = self.cloudwatch.get_paginator('list_dashboards')
+
+            for response in paginator.paginate(DashboardNamePrefix=self.dashboard_name):
+                dashboard_names.extend(
+                    dashboard['DashboardName'] for dashboard in response['DashboardEntries']
+                    if re.fullmatch(rf'{re.escape(self.dashboard_name)}(-\d+)?', dashboard['DashboardName'])
+                )
+        except botocore.exceptions.ClientError as e:
+            self.logger.exception("Error occurred while listing the CloudWatch Dashboards\nBotocore Exception: \n%s", e)
+            raise
+
+        return dashboard_names
+
+    def _delete_dashboards(self, dashboard_names: list) -> None:
+        """
+        Uses the Boto3 API to delete dashboards that are no longer needed
+
+        Args:
+            dashboard_names (list): Names of the dashboards to delete
+        """
+        self.logger.info("Deleting the unused dashboards: %s", dashboard_names)
+        try:
+            self.cloudwatch.delete_dashboards(DashboardNames=dashboard_names)
+        except botocore.exceptions.ClientError as e:
+            self.logger.exception("Error occurred while deleting the CloudWatch Dashboards\nBotocore Exception: \n%s", e)
+            raise
+
+        for dashboard_name in dashboard_names:
+            published_dashboard_hashes.pop(dashboard_name, None)
+
+    def _put_dashboard(self, dashboard_name: str, dashboard: DashboardBody) -> None:
+        """
+        Creates or updates a CloudWatch Dashboard, skipping the update when the dashboard body is the same as the one
+        that was last published
+
+        Args:
+            dashboard_name (str): Name of the dashboard
+            dashboard (DashboardBody): Serialised dashboard body
+        """
+        body_hash = dashboard.hash
+        unchanged = body_hash == self._get_published_dashboard_hash(dashboard_name)
+        with statistics_lock:
+            dashboard_update_statistics['checks'] += 1
+            dashboard_update_statistics['skips'] += unchanged
+            checks = dashboard_update_statistics['checks']
+            skips = dashboard_update_statistics['skips']
+
+        if unchanged:
+            self.logger.info("Dashboard %s is unchanged, skipped %s of %s updates", dashboard_name, skips, checks)
+            return
 
-        self.logger.debug(f"{inspect.stack()[0][3]} - Creating or updating the CloudWatch Dashboard")
+        self.logger.debug("Creating or updating the %s CloudWatch Dashboard", dashboard_name)
         try:
-            self.cloudwatch.put_dashboard(DashboardName=self.dashboard_name, DashboardBody=json.dumps(dashboard))
+            self.cloudwatch.put_dashboard(DashboardName=dashboard_name, DashboardBody=dashboard.body)
         except botocore.exceptions.ClientError as e:
             self.logger.exception(
-                f"{inspect.stack()[0][3]} - Error occurred while creating or updating the CloudWatch Dashboard"
-                f"\nBotocore Exception: \n{e}"
+                "Error occurred while creating or updating the CloudWatch Dashboard\nBotocore Exception: \n%s", e
             )
             raise
+
+        published_dashboard_hashes[dashboard_name] = body_hash
+        self.logger.info("Dashboard %s updated, skipped %s of %s updates", dashboard_name, skips, checks)
+
+    def cloudwatch_put_dashboard(self) -> None:
+        """
+        Creates or updates the CloudWatch Dashboard with widgets and descriptions for each. The pipelines of every
+        configured region and account are shown together on the dashboards of the region the generator runs in. Large
+        fleets are split across numbered dashboards (Pipelines-{region}-1..N) that are written concurrently, and
+        dashboards left over from a previous split are deleted. A fleet that fits on one dashboard keeps the
+        Pipelines-{region} name. Each step is timed when the INSTRUMENTATION setting is enabled.
+        """
+        instrumentation = Instrumentation('DashboardGenerator')
+        instrumentation.attach(self.cloudwatch)
+
+        with instrumentation.phase('GetPipelines'):
+            pipelines = self._get_all_pipelines()
+        with instrumentation.phase('GenerateDashboards'):
+            dashboards = self._generate_dashboards(pipelines)
+
+        with instrumentation.phase('PutDashboards'), ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(self._put_dashboard, dashboard_name, dashboard)
+                for dashboard_name, dashboard in dashboards.items()
+            ]
+            for future in futures:
+                future.result()
+
+        with instrumentation.phase('DeleteDashboards'):
+            unused_dashboards = [
+                dashboard_name for dashboard_name in self._list_dashboards() if dashboard_name not in dashboards
+            ]
+            if unused_dashboards:
+                self._delete_dashboards(unused_dashboards)
+        instrumentation.emit()
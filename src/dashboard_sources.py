@@ -0,0 +1,49 @@
+import os
+from typing import NamedTuple, Optional
+
+
+class DashboardSource(NamedTuple):
+    """
+    A region of an account whose pipelines are shown on the dashboard. The role is assumed to read the metrics of
+    another account, the pipelines of the account the generator runs in are read with its own credentials.
+    """
+    region: str
+    role_arn: Optional[str] = None
+
+    @property
+    def account_id(self) -> Optional[str]:
+        """
+        Returns:
+            Optional[str]: Account of the assumed role, or None for the account the generator runs in
+        """
+        return self.role_arn.split(':')[4] if self.role_arn else None
+
+    @property
+    def label(self) -> str:
+        """
+        Returns:
+            str: Region, preceded by the account when the role of another account is assumed
+        """
+        return f'{self.account_id} {self.region}' if self.role_arn else self.region
+
+
+def _split_setting(value: str) -> list:
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def get_dashboard_sources(region: str) -> list:
+    """
+    Reads the regions and accounts the dashboard is built from. DASHBOARD_REGIONS lists the regions, the region of the
+    generator on its own by default, and DASHBOARD_ROLE_ARNS lists the roles assumed to read the same regions of other
+    accounts, next to the account the generator runs in.
+
+    Args:
+        region (str): Region the generator runs in
+
+    Returns:
+        list: DashboardSource for every region of every account
+    """
+    regions = _split_setting(os.environ.get('DASHBOARD_REGIONS', '')) or [region]
+    role_arns = [None] + _split_setting(os.environ.get('DASHBOARD_ROLE_ARNS', ''))
+
+    return [DashboardSource(source_region, role_arn) for role_arn in role_arns for source_region in regions]
@@ -0,0 +1,93 @@
+import datetime
+import enum
+from typing import NamedTuple, Optional
+
+
+def to_epoch_milliseconds(time: datetime.datetime) -> int:
+    """
+    Converts a timezone aware datetime to epoch milliseconds
+
+    Args:
+        time (datetime.datetime): Time value
+
+    Returns:
+        int: Milliseconds since the epoch
+    """
+    return round(time.timestamp() * 1000)
+
+
+class ExecutionStatus(enum.IntEnum):
+    """
+    Final status of a pipeline execution. The values double as the status codes used by the metrics engine.
+    """
+    FAILED = 0
+    SUCCEEDED = 1
+
+    @property
+    def codepipeline_status(self) -> str:
+        """
+        Returns:
+            str: Status as written by CodePipeline, e.g. 'Succeeded'
+        """
+        return self.name.capitalize()
+
+    @classmethod
+    def from_codepipeline_status(cls, status: str) -> Optional['ExecutionStatus']:
+        """
+        Looks up the final status matching a CodePipeline execution status
+
+        Args:
+            status (str): CodePipeline execution status, e.g. 'Succeeded'
+
+        Returns:
+            Optional[ExecutionStatus]: Final status, or None when the execution isn't in a final state we track
+        """
+        return cls.__members__.get(status.upper())
+
+
+class ExecutionRecord(NamedTuple):
+    """
+    Immutable, compact copy of the fields we read from a CodePipeline execution summary. Times are epoch milliseconds.
+    Records are only built for executions with a final status, and are far smaller than the summaries they replace since
+    the nested sourceRevisions and trigger structures are dropped while the pages are parsed.
+    """
+    execution_id: str
+    status: ExecutionStatus
+    start_time: int
+    last_update_time: int
+
+    @classmethod
+    def from_summary(cls, summary: dict) -> Optional['ExecutionRecord']:
+        """
+        Builds a record from a CodePipeline execution summary
+
+        Args:
+            summary (dict): Execution summary as returned by list_pipeline_executions
+
+        Returns:
+            Optional[ExecutionRecord]: Execution record, or None when the execution doesn't have a final status
+        """
+        status = ExecutionStatus.from_codepipeline_status(summary['status'])
+        if status is None:
+            return None
+
+        return cls(
+            summary['pipelineExecutionId'],
+            status,
+            to_epoch_milliseconds(summary['startTime']),
+            to_epoch_milliseconds(summary['lastUpdateTime'])
+        )
+
+
+def parse_execution_summaries(summaries: list) -> list:
+    """
+    Converts a page of execution summaries into records, dropping the executions that don't have a final status
+
+    Args:
+        summaries (list): Execution summaries as returned by list_pipeline_executions
+
+    Returns:
+        list: Execution records in the same order
+    """
+    records = (ExecutionRecord.from_summary(summary) for summary in summaries)
+    return [record for record in records if record is not None]
@@ -0,0 +1,361 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Optional
+
+import botocore
+
+from clients import get_client
+from execution_record import ExecutionRecord, ExecutionStatus
+from logger import Logger
+from shared_backend import SharedBackend
+
+if TYPE_CHECKING:
+    import sqlite3
+
+# DynamoDB BatchWriteItem service limit
+MAX_BATCH_WRITE_ITEMS = 25
+
+
+class ExecutionStore(ABC):
+    """
+    Interface for the persisted execution history of each pipeline. Executions are exchanged as ExecutionRecords, with
+    times in epoch milliseconds.
+    """
+
+    @abstractmethod
+    def upsert_executions(self, pipeline_name: str, executions: list) -> None:
+        """
+        Inserts or replaces the executions of a pipeline
+
+        Args:
+            pipeline_name (str): Name of the pipeline
+            executions (list): Execution records
+        """
+
+    @abstractmethod
+    def get_execution(self, pipeline_name: str, execution_id: str) -> Optional[ExecutionRecord]:
+        """
+        Looks up a single execution of a pipeline
+
+        Args:
+            pipeline_name (str): Name of the pipeline
+            execution_id (str): CodePipeline execution id
+
+        Returns:
+            Optional[ExecutionRecord]: Execution record or None
+        """
+
+    @abstractmethod
+    def get_latest_execution(self, pipeline_name: str) -> Optional[ExecutionRecord]:
+        """
+        Looks up the most recently started execution that has been stored for a pipeline
+
+        Args:
+            pipeline_name (str): Name of the pipeline
+
+        Returns:
+            Optional[ExecutionRecord]: Execution record or None
+        """
+
+    @abstractmethod
+    def get_prior_execution(self, pipeline_name: str, status: ExecutionStatus, before: int) -> Optional[ExecutionRecord]:
+        """
+        Looks up the latest execution with the given status that started before a point in time
+
+        Args:
+            pipeline_name (str): Name of the pipeline
+            status (ExecutionStatus): Execution status to match
+            before (int): Exclusive upper bound of the execution start time
+
+        Returns:
+            Optional[ExecutionRecord]: Execution record or None
+        """
+
+    @abstractmethod
+    def get_first_execution(
+        self,
+        pipeline_name: str,
+        status: ExecutionStatus,
+        after: Optional[int],
+        before: int
+    ) -> Optional[ExecutionRecord]:
+        """
+        Looks up the earliest execution with the given status that started within a window of time
+
+        Args:
+            pipeline_name (str): Name of the pipeline
+            status (ExecutionStatus): Execution status to match
+            after (Optional[int]): Exclusive lower bound of the execution start time, None for no bound
+            before (int): Exclusive upper bound of the execution start time
+
+        Returns:
+            Optional[ExecutionRecord]: Execution record or None
+        """
+
+
+class SQLiteExecutionStore(ExecutionStore):
+    def __init__(self, path: str = ':memory:') -> None:
+        # Only this backend needs sqlite3, so it isn't loaded on cold starts that don't use it
+        import sqlite3
+
+        self.logger = Logger(logger_name='SQLiteExecutionStore', level='INFO').setup_logger()
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        """
+        Creates the executions table and the indexes used by the execution lookups
+        """
+        self.logger.debug("Creating the execution history schema in %s", self.path)
+        with self.lock, self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS executions ("
+                "pipeline_name TEXT NOT NULL, "
+                "execution_id TEXT NOT NULL, "
+                "status TEXT NOT NULL, "
+                "start_time INTEGER NOT NULL, "
+                "last_update_time INTEGER NOT NULL, "
+                "PRIMARY KEY (pipeline_name, execution_id))"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS executions_by_start_time ON executions (pipeline_name, start_time)"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS executions_by_status ON executions (pipeline_name, status, start_time)"
+            )
+
+    def _to_execution(self, row: Optional['sqlite3.Row']) -> Optional[ExecutionRecord]:
+        """
+        Converts a table row into an execution record
+
+        Args:
+            row (Optional[sqlite3.Row]): Row of the executions table
+
+        Returns:
+            Optional[ExecutionRecord]: Execution record or None
+        """
+        if row is None:
+            return None
+
+        return ExecutionRecord(
+            row['execution_id'],
+            ExecutionStatus.from_codepipeline_status(row['status']),
+            row['start_time'],
+            row['last_update_time']
+        )
+
+    def _query_one(self, query: str, parameters: tuple) -> Optional[ExecutionRecord]:
+        with self.lock:
+            row = self.connection.execute(query, parameters).fetchone()
+
+        return self._to_execution(row)
+
+    def upsert_executions(self, pipeline_name: str, executions: list) -> None:
+        self.logger.debug("Storing %s executions for %s", len(executions), pipeline_name)
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO executions "
+                "(pipeline_name, execution_id, status, start_time, last_update_time) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        pipeline_name,
+                        execution.execution_id,
+                        execution.status.codepipeline_status,
+                        execution.start_time,
+                        execution.last_update_time
+                    )
+                    for execution in executions
+                ]
+            )
+
+    def get_execution(self, pipeline_name: str, execution_id: str) -> Optional[ExecutionRecord]:
+        return self._query_one(
+            "SELECT * FROM executions WHERE pipeline_name = ? AND execution_id = ?",
+            (pipeline_name, execution_id)
+        )
+
+    def get_latest_execution(self, pipeline_name: str) -> Optional[ExecutionRecord]:
+        return self._query_one(
+            "SELECT * FROM executions WHERE pipeline_name = ? ORDER BY start_time DESC LIMIT 1",
+            (pipeline_name,)
+        )
+
+    def get_prior_execution(self, pipeline_name: str, status: ExecutionStatus, before: int) -> Optional[ExecutionRecord]:
+        return self._query_one(
+            "SELECT * FROM executions WHERE pipeline_name = ? AND status = ? AND start_time < ? "
+            "ORDER BY start_time DESC LIMIT 1",
+            (pipeline_name, status.codepipeline_status, before)
+        )
+
+    def get_first_execution(
+        self,
+        pipeline_name: str,
+        status: ExecutionStatus,
+        after: Optional[int],
+        before: int
+    ) -> Optional[ExecutionRecord]:
+        return self._query_one(
+            "SELECT * FROM executions WHERE pipeline_name = ? AND status = ? AND start_time > ? AND start_time < ? "
+            "ORDER BY start_time ASC LIMIT 1",
+            (pipeline_name, status.codepipeline_status, after if after is not None else -1, before)
+        )
+
+
+class DynamoDBExecutionStore(ExecutionStore):
+    """
+    Execution history kept in a DynamoDB table with the following layout:
+
+    * Partition key `PipelineName` (S) and sort key `ExecutionId` (S)
+    * Global secondary index `StartTimeIndex`: partition key `PipelineName` (S), sort key `StartTime` (N)
+    * Global secondary index `StatusIndex`: partition key `PipelineStatus` (S), sort key `StartTime` (N)
+    """
+
+    def __init__(self, table_name: str, dynamodb=None) -> None:
+        self.logger = Logger(logger_name='DynamoDBExecutionStore', level='INFO').setup_logger()
+        self.table_name = table_name
+        self.dynamodb = dynamodb or get_client('dynamodb')
+
+    def _to_item(self, pipeline_name: str, execution: ExecutionRecord) -> dict:
+        """
+        Converts an execution record into a DynamoDB item
+
+        Args:
+            pipeline_name (str): Name of the pipeline
+            execution (ExecutionRecord): Execution record
+
+        Returns:
+            dict: DynamoDB item
+        """
+        return {
+            'PipelineName': {'S': pipeline_name},
+            'ExecutionId': {'S': execution.execution_id},
+            'Status': {'S': execution.status.codepipeline_status},
+            'PipelineStatus': {'S': f"{pipeline_name}#{execution.status.codepipeline_status}"},
+            'StartTime': {'N': str(execution.start_time)},
+            'LastUpdateTime': {'N': str(execution.last_update_time)}
+        }
+
+    def _to_execution(self, item: Optional[dict]) -> Optional[ExecutionRecord]:
+        """
+        Converts a DynamoDB item into an execution record
+
+        Args:
+            item (Optional[dict]): DynamoDB item
+
+        Returns:
+            Optional[ExecutionRecord]: Execution record or None
+        """
+        if not item:
+            return None
+
+        return ExecutionRecord(
+            item['ExecutionId']['S'],
+            ExecutionStatus.from_codepipeline_status(item['Status']['S']),
+            int(item['StartTime']['N']),
+            int(item['LastUpdateTime']['N'])
+        )
+
+    def _query_one(self, **kwargs) -> Optional[ExecutionRecord]:
+        try:
+            response = self.dynamodb.query(TableName=self.table_name, Limit=1, **kwargs)
+        except botocore.exceptions.ClientError as e:
+            self.logger.exception("Error occurred while querying the execution history\nBotocore Exception: \n%s", e)
+            raise
+
+        return self._to_execution(next(iter(response['Items']), None))
+
+    def upsert_executions(self, pipeline_name: str, executions: list) -> None:
+        self.logger.debug("Storing %s executions for %s", len(executions), pipeline_name)
+        requests = [{'PutRequest': {'Item': self._to_item(pipeline_name, execution)}} for execution in executions]
+
+        try:
+            for index in range(0, len(requests), MAX_BATCH_WRITE_ITEMS):
+                request_items = {self.table_name: requests[index:index + MAX_BATCH_WRITE_ITEMS]}
+                while request_items:
+                    response = self.dynamodb.batch_write_item(RequestItems=request_items)
+                    request_items = response.get('UnprocessedItems')
+        except botocore.exceptions.ClientError as e:
+            self.logger.exception("Error occurred while storing the execution history\nBotocore Exception: \n%s", e)
+            raise
+
+    def get_execution(self, pipeline_name: str, execution_id: str) -> Optional[ExecutionRecord]:
+        try:
+            response = self.dynamodb.get_item(
+                TableName=self.table_name,
+                Key={
+                    'PipelineName': {'S': pipeline_name},
+                    'ExecutionId': {'S': execution_id}
+                }
+            )
+        except botocore.exceptions.ClientError as e:
+            self.logger.exception("Error occurred while reading the execution history\nBotocore Exception: \n%s", e)
+            raise
+
+        return self._to_execution(response.get('Item'))
+
+    def get_latest_execution(self, pipeline_name: str) -> Optional[ExecutionRecord]:
+        return self._query_one(
+            IndexName='StartTimeIndex',
+            KeyConditionExpression='PipelineName = :pipeline',
+            ExpressionAttributeValues={':pipeline': {'S': pipeline_name}},
+            ScanIndexForward=False
+        )
+
+    def get_prior_execution(self, pipeline_name: str, status: ExecutionStatus, before: int) -> Optional[ExecutionRecord]:
+        return self._query_one(
+            IndexName='StatusIndex',
+            KeyConditionExpression='PipelineStatus = :pipeline_status AND StartTime < :before',
+            ExpressionAttributeValues={
+                ':pipeline_status': {'S': f"{pipeline_name}#{status.codepipeline_status}"},
+                ':before': {'N': str(before)}
+            },
+            ScanIndexForward=False
+        )
+
+    def get_first_execution(
+        self,
+        pipeline_name: str,
+        status: ExecutionStatus,
+        after: Optional[int],
+        before: int
+    ) -> Optional[ExecutionRecord]:
+        # BETWEEN is inclusive, so the bounds are moved in by a millisecond to keep them exclusive
+        lower_bound = after + 1 if after is not None else 0
+        upper_bound = before - 1
+        if lower_bound > upper_bound:
+            return None
+
+        return self._query_one(
+            IndexName='StatusIndex',
+            KeyConditionExpression='PipelineStatus = :pipeline_status AND StartTime BETWEEN :after AND :before',
+            ExpressionAttributeValues={
+                ':pipeline_status': {'S': f"{pipeline_name}#{status.codepipeline_status}"},
+                ':after': {'N': str(lower_bound)},
+                ':before': {'N': str(upper_bound)}
+            },
+            ScanIndexForward=True
+        )
+
+
+def _create_execution_store(backend: str) -> Optional[ExecutionStore]:
+    if backend == 'sqlite':
+        return SQLiteExecutionStore(os.environ.get('EXECUTION_STORE_PATH', '/tmp/executions.db'))
+    if backend == 'dynamodb':
+        return DynamoDBExecutionStore(os.environ['EXECUTION_STORE_TABLE'])
+    return None
+
+
+_execution_store = SharedBackend('EXECUTION_STORE', _create_execution_store)
+
+
+def get_execution_store() -> Optional[ExecutionStore]:
+    """
+    Returns:
+        Optional[ExecutionStore]: Execution store selected through EXECUTION_STORE ('sqlite' or 'dynamodb'), or None
+            when no store has been configured
+    """
+    return _execution_store.get()
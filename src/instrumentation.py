@@ -0,0 +1,191 @@
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from typing import Iterator, Optional, TextIO
+
+from logger import Logger
+
+# The instrumentation of the invocation that is running, the botocore event hooks registered on the shared clients
+# report to it
+_active_instrumentation = None
+
+
+def _before_call(context: dict, **kwargs) -> None:
+    context['instrumentation_start'] = time.perf_counter()
+
+
+def _after_call(event_name: str, context: dict, http_response=None, parsed: dict = None, **kwargs) -> None:
+    instrumentation = _active_instrumentation
+    if instrumentation is not None:
+        retries = (parsed or {}).get('ResponseMetadata', {}).get('RetryAttempts', 0)
+        failed = http_response is not None and http_response.status_code >= 300
+        instrumentation.record_call(event_name, context, retries, failed=failed)
+
+
+def _after_call_error(event_name: str, context: dict, **kwargs) -> None:
+    instrumentation = _active_instrumentation
+    if instrumentation is not None:
+        instrumentation.record_call(event_name, context, 0, failed=True)
+
+
+class Instrumentation():
+    """
+    Opt-in timing of the steps of an invocation along with the count, latency and retries of every boto3 operation it
+    makes, collected through botocore event hooks. Enabled through the INSTRUMENTATION environment variable: 'log'
+    writes a summary record to the logs at the end of the invocation, 'emf' also writes it in the CloudWatch Embedded
+    Metric Format so the latencies and API calls per invocation can be graphed. When disabled every method is a no-op.
+    """
+
+    def __init__(self, name: str, mode: Optional[str] = None, stream: Optional[TextIO] = None) -> None:
+        self.logger = Logger(logger_name='Instrumentation', level='INFO').setup_logger()
+        self.name = name
+        self.mode = mode if mode is not None else os.environ.get('INSTRUMENTATION', '')
+        self.enabled = self.mode in ['log', 'emf']
+        self.stream = stream
+        self.lock = threading.Lock()
+        self.start = time.perf_counter()
+        self.phases = {}
+        self.operations = {}
+
+    def attach(self, *clients) -> None:
+        """
+        Registers the event hooks on the clients and makes this the active instrumentation. The hooks are registered
+        with a unique id, so attaching a shared client on every invocation doesn't add them more than once.
+
+        Args:
+            clients (botocore.client.BaseClient): Clients whose operations are counted
+        """
+        global _active_instrumentation
+        if not self.enabled:
+            return
+
+        for client in clients:
+            client.meta.events.register('before-call', _before_call, unique_id='instrumentation-before-call')
+            client.meta.events.register('after-call', _after_call, unique_id='instrumentation-after-call')
+            client.meta.events.register(
+                'after-call-error', _after_call_error, unique_id='instrumentation-after-call-error'
+            )
+        _active_instrumentation = self
+
+    @contextlib.contextmanager
+    def phase(self, phase_name: str) -> Iterator[None]:
+        """
+        Times the block as a step of the invocation. Time spent in the same step more than once is added up.
+
+        Args:
+            phase_name (str): Name of the step
+        """
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.phases[phase_name] = self.phases.get(phase_name, 0.0) + time.perf_counter() - start
+
+    def record_call(self, event_name: str, context: dict, retries: int, failed: bool) -> None:
+        """
+        Records a boto3 operation once its response has been received
+
+        Args:
+            event_name (str): botocore event name, e.g. 'after-call.cloudwatch.PutMetricData'
+            context (dict): Request context holding the time the call started
+            retries (int): Number of retries the call needed
+            failed (bool): True if the call returned an error or raised an exception
+        """
+        operation_name = '.'.join(event_name.split('.')[1:])
+        duration = time.perf_counter() - context.get('instrumentation_start', time.perf_counter())
+
+        with self.lock:
+            operation = self.operations.setdefault(
+                operation_name, {'calls': 0, 'retries': 0, 'errors': 0, 'seconds': 0.0}
+            )
+            operation['calls'] += 1
+            operation['retries'] += retries
+            operation['errors'] += failed
+            operation['seconds'] += duration
+
+    def summary(self) -> dict:
+        """
+        Returns:
+            dict: Duration of the invocation and of each step in milliseconds, along with the API call totals and the
+                  statistics of every operation
+        """
+        with self.lock:
+            operations = {
+                operation_name: {
+                    'calls': operation['calls'],
+                    'retries': operation['retries'],
+                    'errors': operation['errors'],
+                    'milliseconds': round(operation['seconds'] * 1000, 3)
+                }
+                for operation_name, operation in self.operations.items()
+            }
+            return {
+                'name': self.name,
+                'duration_ms': round((time.perf_counter() - self.start) * 1000, 3),
+                'phases_ms': {phase_name: round(seconds * 1000, 3) for phase_name, seconds in self.phases.items()},
+                'api_calls': sum(operation['calls'] for operation in operations.values()),
+                'retries': sum(operation['retries'] for operation in operations.values()),
+                'operations': operations
+            }
+
+    def _emf_document(self, summary: dict) -> dict:
+        """
+        Args:
+            summary (dict): Invocation summary
+
+        Returns:
+            dict: Summary as an EMF document in the Pipeline/Instrumentation namespace, with the name as dimension
+        """
+        units = {'Duration': 'Milliseconds', 'ApiCalls': 'Count', 'Retries': 'Count'}
+        metrics = {'Duration': summary['duration_ms'], 'ApiCalls': summary['api_calls'], 'Retries': summary['retries']}
+        metrics.update({f'{phase_name}Duration': value for phase_name, value in summary['phases_ms'].items()})
+        document = {
+            '_aws': {
+                'Timestamp': round(time.time() * 1000),
+                'CloudWatchMetrics': [
+                    {
+                        'Namespace': 'Pipeline/Instrumentation',
+                        'Dimensions': [['Name']],
+                        'Metrics': [
+                            {'Name': metric_name, 'Unit': units.get(metric_name, 'Milliseconds')}
+                            for metric_name in metrics
+                        ]
+                    }
+                ]
+            },
+            'Name': self.name,
+            'Operations': summary['operations']
+        }
+        document.update(metrics)
+        return document
+
+    def emit(self) -> Optional[dict]:
+        """
+        Writes the summary record of the invocation and deactivates the instrumentation
+
+        Returns:
+            Optional[dict]: Invocation summary, or None when the instrumentation is disabled
+        """
+        global _active_instrumentation
+        if not self.enabled:
+            return None
+
+        if _active_instrumentation is self:
+            _active_instrumentation = None
+
+        summary = self.summary()
+        self.logger.info("Invocation summary: %s", json.dumps(summary), extra={'instrumentation': summary})
+        if self.mode == 'emf':
+            stream = self.stream or sys.stdout
+            stream.write(json.dumps(self._emf_document(summary), separators=(',', ':')) + '\n')
+            stream.flush()
+
+        return summary
@@ -1,21 +1,61 @@
+import json
 import logging
+import os
 import sys
 
+# Attributes present on every LogRecord, anything else on a record was passed through the `extra` argument
+RESERVED_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Formats the record as a single line JSON document, including any structured fields passed through `extra`
+
+        Args:
+            record (logging.LogRecord): Record to format
+
+        Returns:
+            str: JSON representation of the record
+        """
+        log_record = {
+            'timestamp': self.formatTime(record),
+            'logger': record.name,
+            'level': record.levelname,
+            'function': record.funcName,
+            'message': record.getMessage()
+        }
+
+        for key, value in vars(record).items():
+            if key not in RESERVED_RECORD_ATTRIBUTES:
+                log_record[key] = value
+
+        if record.exc_info:
+            log_record['exception'] = self.formatException(record.exc_info)
+
+        return json.dumps(log_record, default=str)
+
+
 class Logger:
     def __init__(self, logger_name='default_logger', level='INFO') -> None:
         self.logger_name = logger_name
-        self.level = level
-    
+        self.level = os.environ.get('LOG_LEVEL', level)
+        self.log_format = os.environ.get('LOG_FORMAT', 'text')
+
     def setup_logger(self):
         logger = logging.getLogger(self.logger_name)
 
         if len(logger.handlers) == 0:
-            logger.setLevel(self.level)
+            logger.setLevel(self.level.upper())
             handler = logging.StreamHandler(sys.stdout)
             handler.setLevel(self.level.upper())
-            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            if self.log_format == 'json':
+                formatter = JsonFormatter()
+            else:
+                # The calling function is resolved by the logging module only when a record is actually emitted
+                formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(funcName)s - %(message)s')
             handler.setFormatter(formatter)
             logger.addHandler(handler)
-            logger.info(f"Logger '{self.logger_name}' has been created and configured")
-        
+            logger.info("Logger '%s' has been created and configured", self.logger_name)
+
         return logger
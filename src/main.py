@@ -1,5 +1,7 @@
-from dashboard_generator import DashboardGenerator
-from pipeline_event_handler import PipelineEventHandler
+import os
+
+# The handler modules are imported inside each entry point, so a Lambda function only loads the modules of the handler
+# it runs on a cold start. EXECUTION_ENGINE=async runs the handlers on the asyncio engine instead.
 
 
 def pipeline_event_handler(event: dict, _context) -> None:
@@ -9,11 +11,53 @@ def pipeline_event_handler(event: dict, _context) -> None:
     Args:
         event (dict): Incoming lambda event
     """
+    if os.environ.get('EXECUTION_ENGINE') == 'async':
+        from async_engine import run_async
+        from async_pipeline_event_handler import AsyncPipelineEventHandler
+
+        run_async(AsyncPipelineEventHandler(event).execute_event_steps_async)
+        return
+
+    from pipeline_event_handler import PipelineEventHandler
+
     PipelineEventHandler(event).execute_event_steps()
 
 
+def pipeline_batch_event_handler(event, _context) -> dict:
+    """
+    Runs the items to handle a batch of pipeline execution events, either from an SQS event source or a list of events
+
+    Args:
+        event (dict | list): Incoming lambda event
+
+    Returns:
+        dict: Partial batch response listing the records that failed
+    """
+    records = event['Records'] if isinstance(event, dict) else event
+
+    if os.environ.get('EXECUTION_ENGINE') == 'async':
+        from async_batch_event_handler import AsyncBatchEventHandler
+        from async_engine import run_async
+
+        return run_async(AsyncBatchEventHandler(records).execute_batch_steps_async)
+
+    from batch_event_handler import BatchEventHandler
+
+    return BatchEventHandler(records).execute_batch_steps()
+
+
 def dashboard_handler(_event, _context) -> None:
     """
-    Runs the items to handle the pipeline dashboard creation
+    Runs the items to handle the pipeline dashboard creation, either on the schedule or when the event handler signals
+    a new pipeline through the regeneration queue. The event content isn't used, the whole dashboard is regenerated.
     """
+    if os.environ.get('EXECUTION_ENGINE') == 'async':
+        from async_dashboard_generator import AsyncDashboardGenerator
+        from async_engine import run_async
+
+        run_async(AsyncDashboardGenerator().cloudwatch_put_dashboard_async)
+        return
+
+    from dashboard_generator import DashboardGenerator
+
     DashboardGenerator().cloudwatch_put_dashboard()
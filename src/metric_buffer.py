@@ -0,0 +1,304 @@
+import datetime
+import json
+import os
+import sys
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+from typing import Optional, TextIO
+
+import botocore
+
+from execution_record import to_epoch_milliseconds
+from logger import Logger
+from rate_limiter import RateLimiter
+
+# CloudWatch PutMetricData service limits
+MAX_METRIC_DATA_PER_REQUEST = 1000
+MAX_REQUEST_SIZE_BYTES = 1000000
+
+# CloudWatch Embedded Metric Format limits
+MAX_METRICS_PER_EMF_DOCUMENT = 100
+MAX_VALUES_PER_EMF_METRIC = 100
+
+
+class MetricEmitter(ABC):
+    """
+    Interface for sending the CloudWatch Metric data points of an invocation. Data points are added to the buffered
+    metric_data list and only sent when the emitter is flushed.
+    """
+
+    metric_data: list
+
+    @abstractmethod
+    def add(self, metric_datum: dict) -> None:
+        """
+        Appends a CloudWatch Metric data point to the buffer so it can be sent with the next flush
+
+        Args:
+            metric_datum (dict): CloudWatch MetricDatum structure
+        """
+
+    @abstractmethod
+    def flush(self, executor: Optional[Executor] = None) -> int:
+        """
+        Sends every buffered data point and empties the buffer
+
+        Args:
+            executor (Optional[Executor]): Executor the requests are sent on concurrently, one after the other when None
+
+        Returns:
+            int: Number of requests or documents the data points were sent with
+        """
+
+
+class MetricBuffer(MetricEmitter):
+    def __init__(self, cloudwatch, namespace: str = 'Pipeline', rate_limiter: Optional[RateLimiter] = None) -> None:
+        self.logger = Logger(logger_name='MetricBuffer', level='INFO').setup_logger()
+        self.cloudwatch = cloudwatch
+        self.namespace = namespace
+        self.rate_limiter = rate_limiter
+        self.metric_data = []
+
+    def add(self, metric_datum: dict) -> None:
+        self.logger.debug("Buffering the %s data point", metric_datum['MetricName'])
+        self.metric_data.append(metric_datum)
+
+    def _estimate_size(self, metric_datum: dict) -> int:
+        """
+        Estimates the number of bytes a data point adds to the PutMetricData request
+
+        Args:
+            metric_datum (dict): CloudWatch MetricDatum structure
+
+        Returns:
+            int: Approximate serialised size of the data point
+        """
+        return len(json.dumps(metric_datum, default=str))
+
+    def _chunk_metric_data(self) -> list:
+        """
+        Splits the buffered data points into request sized chunks, only starting a new chunk when the per request
+        data point or payload size limit would be exceeded
+
+        Returns:
+            list: List of data point lists, one per PutMetricData request
+        """
+        chunks = []
+        chunk = []
+        chunk_size = len(self.namespace)
+
+        for metric_datum in self.metric_data:
+            datum_size = self._estimate_size(metric_datum)
+            if chunk and (
+                len(chunk) >= MAX_METRIC_DATA_PER_REQUEST or chunk_size + datum_size > MAX_REQUEST_SIZE_BYTES
+            ):
+                chunks.append(chunk)
+                chunk = []
+                chunk_size = len(self.namespace)
+
+            chunk.append(metric_datum)
+            chunk_size += datum_size
+
+        if chunk:
+            chunks.append(chunk)
+
+        return chunks
+
+    def _put_metric_data(self, chunk: list) -> None:
+        """
+        Uses the Boto3 API to send a chunk of data points with a single PutMetricData request
+
+        Args:
+            chunk (list): Data points that fit in one request
+        """
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+
+        try:
+            self.cloudwatch.put_metric_data(Namespace=self.namespace, MetricData=chunk)
+        except botocore.exceptions.ClientError as e:
+            self.logger.exception(
+                "Error occurred while creating new CloudWatch Metric data points\nBotocore Exception: \n%s", e
+            )
+            raise
+
+    def flush(self, executor: Optional[Executor] = None) -> int:
+        """
+        Uses the Boto3 API to send every buffered data point with as few PutMetricData requests as the service limits
+        allow, concurrently when an executor is given. Data points are removed from the buffer once their request
+        succeeds
+
+        Args:
+            executor (Optional[Executor]): Executor the requests are sent on concurrently, one after the other when None
+
+        Returns:
+            int: Number of PutMetricData requests made
+        """
+        if not self.metric_data:
+            self.logger.debug("No buffered data points to send")
+            return 0
+
+        chunks = self._chunk_metric_data()
+
+        self.logger.debug("Sending %s data points in %s request(s)", len(self.metric_data), len(chunks))
+        if executor is None:
+            for chunk in chunks:
+                self._put_metric_data(chunk)
+                self.metric_data = self.metric_data[len(chunk):]
+
+            return len(chunks)
+
+        futures = [executor.submit(self._put_metric_data, chunk) for chunk in chunks]
+        unsent_data = []
+        error = None
+        for chunk, future in zip(chunks, futures):
+            try:
+                future.result()
+            except botocore.exceptions.ClientError as e:
+                unsent_data.extend(chunk)
+                error = error or e
+
+        self.metric_data = unsent_data
+        if error:
+            raise error
+
+        return len(chunks)
+
+
+class EMFMetricEmitter(MetricEmitter):
+    """
+    Writes the data points to stdout in the CloudWatch Embedded Metric Format, so the Lambda log agent publishes them
+    asynchronously instead of the invocation making PutMetricData requests. Data points that share their dimensions and
+    timestamp are written in the same document.
+    """
+
+    def __init__(self, namespace: str = 'Pipeline', stream: Optional[TextIO] = None) -> None:
+        self.logger = Logger(logger_name='EMFMetricEmitter', level='INFO').setup_logger()
+        self.namespace = namespace
+        self.stream = stream
+        self.metric_data = []
+
+    def add(self, metric_datum: dict) -> None:
+        self.logger.debug("Buffering the %s data point", metric_datum['MetricName'])
+        self.metric_data.append(metric_datum)
+
+    def _timestamp(self, metric_datum: dict) -> int:
+        """
+        Args:
+            metric_datum (dict): CloudWatch MetricDatum structure
+
+        Returns:
+            int: Timestamp of the data point in epoch milliseconds, times without a timezone being UTC like the API
+        """
+        timestamp = metric_datum['Timestamp']
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=datetime.timezone.utc)
+        return to_epoch_milliseconds(timestamp)
+
+    def _build_documents(self) -> list:
+        """
+        Groups the buffered data points by dimensions and timestamp into EMF documents. Repeated values of a metric are
+        written as an array, and a new document is started once a document or metric limit would be exceeded.
+
+        Returns:
+            list: EMF documents
+        """
+        groups = {}
+
+        for metric_datum in self.metric_data:
+            dimensions = tuple((dimension['Name'], dimension['Value']) for dimension in metric_datum['Dimensions'])
+            documents = groups.setdefault((dimensions, self._timestamp(metric_datum)), [{}])
+            metrics = documents[-1]
+            metric = metrics.get(metric_datum['MetricName'])
+
+            if (metric is None and len(metrics) >= MAX_METRICS_PER_EMF_DOCUMENT) or (
+                metric is not None and len(metric['values']) >= MAX_VALUES_PER_EMF_METRIC
+            ):
+                metrics = {}
+                documents.append(metrics)
+                metric = None
+            if metric is None:
+                metric = metrics[metric_datum['MetricName']] = {'unit': metric_datum['Unit'], 'values': []}
+            metric['values'].append(metric_datum['Value'])
+
+        emf_documents = []
+        for (dimensions, timestamp), documents in groups.items():
+            for metrics in documents:
+                document = {
+                    '_aws': {
+                        'Timestamp': timestamp,
+                        'CloudWatchMetrics': [
+                            {
+                                'Namespace': self.namespace,
+                                'Dimensions': [[name for name, _value in dimensions]],
+                                'Metrics': [
+                                    {'Name': metric_name, 'Unit': metric['unit']}
+                                    for metric_name, metric in metrics.items()
+                                ]
+                            }
+                        ]
+                    }
+                }
+                document.update(dimensions)
+                for metric_name, metric in metrics.items():
+                    values = metric['values']
+                    document[metric_name] = values[0] if len(values) == 1 else values
+                emf_documents.append(document)
+
+        return emf_documents
+
+    def flush(self, executor: Optional[Executor] = None) -> int:
+        """
+        Writes every buffered data point to stdout as EMF documents, one JSON document per line
+
+        Args:
+            executor (Optional[Executor]): Unused, writing to stdout makes no requests
+
+        Returns:
+            int: Number of EMF documents written
+        """
+        if not self.metric_data:
+            self.logger.debug("No buffered data points to send")
+            return 0
+
+        documents = self._build_documents()
+        stream = self.stream or sys.stdout
+
+        self.logger.debug("Writing %s data points in %s EMF document(s)", len(self.metric_data), len(documents))
+        stream.write(''.join(json.dumps(document, separators=(',', ':')) + '\n' for document in documents))
+        stream.flush()
+        self.metric_data = []
+
+        return len(documents)
+
+
+def get_metric_emitter(cloudwatch, namespace: str = 'Pipeline') -> MetricEmitter:
+    """
+    Creates the metric emitter selected through the METRICS_EMITTER environment variable ('api', the default, or 'emf')
+
+    Args:
+        cloudwatch (botocore.client.BaseClient): CloudWatch client used by the PutMetricData emitter
+        namespace (str): CloudWatch Metric namespace
+
+    Returns:
+        MetricEmitter: PutMetricData buffer or EMF emitter
+    """
+    if os.environ.get('METRICS_EMITTER', 'api') == 'emf':
+        return EMFMetricEmitter(namespace=namespace)
+
+    return MetricBuffer(cloudwatch, namespace=namespace)
+
+
+def get_fleet_dimensions() -> Optional[list]:
+    """
+    Reads the dimensions of the fleet wide data points published next to each pipeline data point. FLEET_METRICS turns
+    them off with 'false', and PIPELINE_GROUP publishes them under a group instead of without any dimension.
+
+    Returns:
+        Optional[list]: CloudWatch Metric dimensions of the fleet data points, or None when they are turned off
+    """
+    if os.environ.get('FLEET_METRICS', 'true').lower() == 'false':
+        return None
+
+    group = os.environ.get('PIPELINE_GROUP')
+    return [{'Name': 'PipelineGroup', 'Value': group}] if group else []
@@ -0,0 +1,142 @@
+import datetime
+from typing import Iterator, Optional
+
+import numpy as np
+
+from execution_record import ExecutionStatus
+
+SUCCEEDED = int(ExecutionStatus.SUCCEEDED)
+FAILED = int(ExecutionStatus.FAILED)
+
+# Metric name and unit of every metric the engine computes, in the order the event handler adds them
+METRICS = [
+    ('SuccessCount', 'Count'),
+    ('FailureCount', 'Count'),
+    ('RedTime', 'Seconds'),
+    ('YellowTime', 'Seconds'),
+    ('SuccessCycleTime', 'Seconds'),
+    ('SuccessLeadTime', 'Seconds'),
+    ('DeliveryLeadTime', 'Seconds'),
+    ('FailureLeadTime', 'Seconds')
+]
+
+
+class MetricsEngine():
+    """
+    Computes the pipeline metrics for a whole execution history in one pass over columnar arrays, giving the same
+    results as running PipelineEventHandler for each execution.
+
+    The arrays are ordered from the oldest to the most recent execution and only hold executions with a final status.
+    Times are epoch milliseconds and statuses use the SUCCEEDED and FAILED codes.
+    """
+
+    def __init__(self, start_times: np.ndarray, last_update_times: np.ndarray, statuses: np.ndarray) -> None:
+        self.start_times = np.asarray(start_times, dtype=np.int64)
+        self.last_update_times = np.asarray(last_update_times, dtype=np.int64)
+        self.statuses = np.asarray(statuses, dtype=np.int8)
+
+    @classmethod
+    def from_executions(cls, executions: list) -> 'MetricsEngine':
+        """
+        Builds the columnar arrays from execution records
+
+        Args:
+            executions (list): Execution records, most recent first
+
+        Returns:
+            MetricsEngine: Engine over the executions
+        """
+        count = len(executions)
+
+        return cls(
+            np.fromiter((execution.start_time for execution in reversed(executions)), np.int64, count),
+            np.fromiter((execution.last_update_time for execution in reversed(executions)), np.int64, count),
+            np.fromiter((execution.status for execution in reversed(executions)), np.int8, count)
+        )
+
+    def _prior_same_status(self) -> np.ndarray:
+        """
+        Finds, for every execution, the most recent earlier execution with the same status
+
+        Returns:
+            np.ndarray: Index of the prior execution with the same status, or -1 when there isn't one
+        """
+        indexes = np.arange(len(self.statuses))
+        last_success = np.maximum.accumulate(np.where(self.statuses == SUCCEEDED, indexes, -1))
+        last_failure = np.maximum.accumulate(np.where(self.statuses == FAILED, indexes, -1))
+        prior_success = np.concatenate(([-1], last_success[:-1]))
+        prior_failure = np.concatenate(([-1], last_failure[:-1]))
+
+        return np.where(self.statuses == SUCCEEDED, prior_success, prior_failure)
+
+    def _seconds(self, start_times: np.ndarray, end_times: np.ndarray) -> np.ndarray:
+        return np.round((end_times - start_times) / 1000)
+
+    def compute(self) -> dict:
+        """
+        Computes every metric for every execution
+
+        Returns:
+            dict: Metric name mapped to an array of values per execution, NaN where the metric doesn't apply
+        """
+        indexes = np.arange(len(self.statuses))
+        succeeded = self.statuses == SUCCEEDED
+        prior_same_status = self._prior_same_status()
+        has_prior_same_status = prior_same_status >= 0
+        # The oldest execution in the streak of the other status leading up to each execution
+        prior_state = prior_same_status + 1
+        has_prior_state = prior_state < indexes
+        prior_state = np.where(has_prior_state, prior_state, indexes)
+        prior_same_status = np.where(has_prior_same_status, prior_same_status, indexes)
+
+        state_time = self._seconds(self.start_times[prior_state], self.start_times)
+        lead_time = self._seconds(self.start_times, self.last_update_times)
+        cycle_time = self._seconds(self.last_update_times[prior_same_status], self.last_update_times)
+        delivery_lead_time = self._seconds(self.start_times[prior_state], self.last_update_times)
+
+        metrics = {
+            'SuccessCount': np.where(succeeded, 1.0, np.nan),
+            'FailureCount': np.where(succeeded, np.nan, 1.0),
+            'RedTime': np.where(succeeded & has_prior_state, state_time, np.nan),
+            'YellowTime': np.where(~succeeded & has_prior_state, state_time, np.nan),
+            'SuccessCycleTime': np.where(succeeded & has_prior_same_status, cycle_time, np.nan),
+            'SuccessLeadTime': np.where(succeeded, lead_time, np.nan),
+            'DeliveryLeadTime': np.where(succeeded & has_prior_same_status, delivery_lead_time, np.nan),
+            'FailureLeadTime': np.where(succeeded, np.nan, lead_time)
+        }
+
+        # Zero values are never published by the event handler
+        return {metric_name: np.where(values == 0, np.nan, values) for metric_name, values in metrics.items()}
+
+    def metric_data(self, pipeline_name: str, oldest_timestamp: Optional[datetime.datetime] = None) -> Iterator[dict]:
+        """
+        Converts the computed metrics into CloudWatch Metric data points, timestamped with the time each execution
+        finished
+
+        Args:
+            pipeline_name (str): Name of the pipeline
+            oldest_timestamp (Optional[datetime.datetime]): Executions that finished before this time are skipped
+
+        Yields:
+            dict: CloudWatch MetricDatum structure
+        """
+        metrics = self.compute()
+        oldest_milliseconds = oldest_timestamp.timestamp() * 1000 if oldest_timestamp else -np.inf
+
+        for index in np.flatnonzero(self.last_update_times >= oldest_milliseconds):
+            timestamp = datetime.datetime.utcfromtimestamp(int(self.last_update_times[index]) // 1000)
+            for metric_name, unit in METRICS:
+                value = metrics[metric_name][index]
+                if not np.isnan(value):
+                    yield {
+                        'MetricName': metric_name,
+                        'Dimensions': [
+                            {
+                                'Name': 'PipelineName',
+                                'Value': pipeline_name
+                            }
+                        ],
+                        'Timestamp': timestamp,
+                        'Unit': unit,
+                        'Value': int(value)
+                    }
@@ -1,40 +1,71 @@
 import datetime
-import fnmatch
-import inspect
 import os
-from typing import Optional
+from typing import Iterator, Optional
 
-import boto3
 import botocore
-from dateutil.tz import tzlocal  # Needed for time conversion from pipeline state
+from botocore.paginate import TokenEncoder
 
+from cache import TTLCache
+from clients import get_client
+from execution_record import ExecutionRecord, ExecutionStatus, parse_execution_summaries, to_epoch_milliseconds
+from execution_store import ExecutionStore, get_execution_store
+from instrumentation import Instrumentation
 from logger import Logger
+from metric_buffer import MetricEmitter, get_fleet_dimensions, get_metric_emitter
+from pipeline_matcher import get_pipeline_matcher
+from pipeline_registry import PipelineRegistry, get_pipeline_registry
+from regeneration_signal import RegenerationSignal, get_regeneration_signal
+
+# Pages of pipeline executions are cached at module level so they are shared by every read within an invocation, and by
+# warm Lambda containers handling events for the same pipeline that arrive shortly after each other
+shared_execution_cache = TTLCache(
+    maxsize=int(os.environ.get('EXECUTION_CACHE_SIZE', '128')),
+    ttl=float(os.environ.get('EXECUTION_CACHE_TTL', '30'))
+)
 
 
 class PipelineEventHandler():
-    def __init__(self, event: dict) -> None:
+    def __init__(
+        self,
+        event: dict,
+        codepipeline=None,
+        cloudwatch=None,
+        execution_store: Optional[ExecutionStore] = None,
+        execution_cache: Optional[TTLCache] = None,
+        metric_buffer: Optional[MetricEmitter] = None,
+        pipeline_registry: Optional[PipelineRegistry] = None,
+        regeneration_signal: Optional[RegenerationSignal] = None
+    ) -> None:
         self.logger = Logger(logger_name='PipelineEventHandler', level='INFO').setup_logger()
         self.event = event
         self.allowed_state = ['SUCCEEDED', 'FAILED']
-        self.allowed_status = ['Succeeded', 'Failed']
-        self.codepipeline = boto3.client('codepipeline')
-        self.cloudwatch = boto3.client('cloudwatch')
+        self.allowed_status = [ExecutionStatus.SUCCEEDED, ExecutionStatus.FAILED]
+        self.codepipeline = codepipeline or get_client('codepipeline')
+        self.cloudwatch = cloudwatch or get_client('cloudwatch')
+        self.metric_buffer = metric_buffer or get_metric_emitter(self.cloudwatch, namespace='Pipeline')
+        self.execution_store = execution_store or get_execution_store()
+        self.execution_cache = execution_cache or shared_execution_cache
+        self.max_execution_pages = int(os.environ.get('EXECUTION_MAX_PAGES', '10'))
+        self.pipeline_registry = pipeline_registry or get_pipeline_registry()
+        self.regeneration_signal = regeneration_signal or get_regeneration_signal()
+        self.fleet_dimensions = get_fleet_dimensions()
         self.count = 'Count'
         self.seconds = 'Seconds'
         self.pipeline_pattern = os.environ['PIPELINE_PATTERN']
+        self.pipeline_matcher = get_pipeline_matcher(self.pipeline_pattern)
 
     def _check_for_allowed_state(self) -> None:
         """
         Checks the incoming event to ensure that the desired state is present. If the state matches a value from the
         allowed list then the pipeine name and execution id variables are set, otherwise it exits gracefully.
         """
-        self.logger.debug(f"{inspect.stack()[0][3]} - Checking to see if the event state matches with the allowed list")
+        self.logger.debug("Checking to see if the event state matches with the allowed list")
         if self.event['detail']['state'] in self.allowed_state:
             self.pipeline_name = self.event['detail']['pipeline']
             self.execution_id = self.event['detail']['execution-id']
-            self.logger.debug(f"{inspect.stack()[0][3]} - Event state matches with the allowed list")
+            self.logger.debug("Event state matches with the allowed list")
         else:
-            self.logger.info(f"{inspect.stack()[0][3]} - Pipeline state doesn't match what we are looking for, exiting")
+            self.logger.info("Pipeline state doesn't match what we are looking for, exiting")
             exit(0)
 
     def _check_for_pipeline_prefix(self) -> None:
@@ -42,121 +73,229 @@ class PipelineEventHandler():
         Checks the name of the pipeline from the incoming event and compares it against the pipeline pattern to ensure
         that we are only creating metrics and updating the dashboard for the desired pipelines
         """
-        self.logger.debug(
-            f"{inspect.stack()[0][3]} - Checking to see if the pipeline name matches the pipeline pattern"
-        )
-        if fnmatch.filter([self.pipeline_name], self.pipeline_pattern) != []:
-            self.logger.debug(
-                f"{inspect.stack()[0][3]} - Pipeline name matches the pipeline pattern")
+        self.logger.debug("Checking to see if the pipeline name matches the pipeline pattern")
+        if self.pipeline_matcher.matches(self.pipeline_name):
+            self.logger.debug("Pipeline name matches the pipeline pattern")
             pass
         else:
-            self.logger.info(f"{inspect.stack()[0][3]} - Pipeline name doesn't match what we are looking for, exiting")
+            self.logger.info("Pipeline name doesn't match what we are looking for, exiting")
             exit(0)
 
-    def _list_pipeline_executions(self) -> dict:
+    def _get_cached_executions(self) -> dict:
         """
-        Uses the Boto3 API to gather the a list of the pipeline executions for the pipeline listed within the incoming
-        event.
+        Looks up the cached pages of executions for the pipeline. The cached pages are only reused while they already
+        hold the execution from the incoming event, otherwise a newer execution has shown up or the execution hadn't
+        reached a final state yet, and the pages are invalidated.
 
         Returns:
-            dict: Summary of the most recent executions for a pipeline
+            dict: Cached pages of execution records along with the token of the next page that hasn't been requested yet
+        """
+        cached_executions = self.execution_cache.get(self.pipeline_name)
+
+        if cached_executions is not None:
+            for page in cached_executions['pages']:
+                for execution in page:
+                    if execution.execution_id == self.execution_id:
+                        return cached_executions
+
+            self.logger.debug("Cached %s pipeline executions are out of date", self.pipeline_name)
+            self.execution_cache.invalidate(self.pipeline_name)
+
+        cached_executions = {'pages': [], 'next_token': None, 'complete': False}
+        self.execution_cache.set(self.pipeline_name, cached_executions)
+        return cached_executions
+
+    def _list_pipeline_executions(self) -> Iterator[list]:
+        """
+        Uses the Boto3 API to page through the pipeline executions for the pipeline listed within the incoming event,
+        most recent first. Each page is only requested once the previous one has been consumed, so callers that stop
+        iterating early don't pay for the rest of the history. Every page is parsed once into execution records, and
+        pages that have already been requested are served from the execution cache. At most EXECUTION_MAX_PAGES pages
+        are listed, so an execution that is still listed as in progress, or a state change with no earlier execution of
+        the same status, doesn't page through the whole history of the pipeline.
+
+        Yields:
+            list: Page of execution records for the executions of the pipeline with a final status
         """
-        self.logger.debug(f"{inspect.stack()[0][3]} - Listing {self.pipeline_name} pipeline executions")
+        cached_executions = self._get_cached_executions()
+        page_index = 0
+
+        self.logger.debug("Listing %s pipeline executions", self.pipeline_name)
         try:
-            response = self.codepipeline.list_pipeline_executions(
-                pipelineName=self.pipeline_name
-            )
+            paginator = self.codepipeline.get_paginator('list_pipeline_executions')
+
+            while page_index < len(cached_executions['pages']) or not cached_executions['complete']:
+                if page_index == self.max_execution_pages:
+                    self.logger.debug("Stopped listing %s executions at the page limit", self.pipeline_name)
+                    break
+
+                if page_index == len(cached_executions['pages']):
+                    pagination_config = {}
+                    if cached_executions['next_token']:
+                        pagination_config['PaginationConfig'] = {
+                            'StartingToken': TokenEncoder().encode({'nextToken': cached_executions['next_token']})
+                        }
+
+                    response = next(iter(paginator.paginate(pipelineName=self.pipeline_name, **pagination_config)), None)
+                    self.logger.debug("response: %s", response)
+                    if response is None:
+                        cached_executions['complete'] = True
+                        break
 
-            self.logger.debug(f"{inspect.stack()[0][3]} - response: {response}")
-            return response
+                    cached_executions['pages'].append(parse_execution_summaries(response['pipelineExecutionSummaries']))
+                    cached_executions['next_token'] = response.get('nextToken')
+                    cached_executions['complete'] = cached_executions['next_token'] is None
+
+                yield cached_executions['pages'][page_index]
+                page_index += 1
         except botocore.exceptions.ClientError as e:
-            self.logger.exception(
-                f"{inspect.stack()[0][3]} - Error occurred while listing the pipeline executions"
-                f"\nBotocore Exception: \n{e}"
-            )
+            self.logger.exception("Error occurred while listing the pipeline executions\nBotocore Exception: \n%s", e)
             raise
 
-    def _filter_pipeline_executions(self) -> list:
+    def _filter_pipeline_executions(self) -> Iterator[ExecutionRecord]:
         """
-        Runs through the recent pipeline executions and adds any executions that match the allowed state to a list
+        Runs through the pipeline executions page by page and yields any executions that match the allowed state
 
-        Returns:
-            list: Pipeline executions that have a status that match the allowed list
+        Yields:
+            ExecutionRecord: Pipeline execution that has a status that matches the allowed list
         """
-        pipeline_summaries = []
-        pipeline_executions = self._list_pipeline_executions()
-
-        self.logger.debug(
-            f"{inspect.stack()[0][3]} - Filtering the pipeline executions for those matching the allowed status"
-        )
-        for execution in pipeline_executions['pipelineExecutionSummaries']:
-            if execution['status'] in self.allowed_status:
-                pipeline_summaries.append(execution)
+        self.logger.debug("Filtering the pipeline executions for those matching the allowed status")
+        for page in self._list_pipeline_executions():
+            for execution in page:
+                if execution.status in self.allowed_status:
+                    yield execution
 
-        self.logger.debug(f"{inspect.stack()[0][3]} - pipeline_summaries: {pipeline_summaries}")
-        return pipeline_summaries
-
-    def _get_pipeline_execution(self, execution_id: str) -> Optional[dict]:
+    def _get_pipeline_execution(self, execution_id: str) -> Optional[ExecutionRecord]:
         """
-        Checks the list of pipeline execution summaries for a matching execution id
+        Checks the list of pipeline executions for a matching execution id
 
         Args:
             execution_id (str): CodePipeline execution id
 
         Returns:
-            Optional[dict]: CodePipeline execution summary or None
+            Optional[ExecutionRecord]: Execution record or None
         """
-        self.logger.debug(
-            f"{inspect.stack()[0][3]} - Gathering the pipeline summary for the following execution id: {execution_id}"
-        )
-        for execution in self._list_pipeline_executions()['pipelineExecutionSummaries']:
-            if execution['pipelineExecutionId'] == execution_id:
-                return execution
+        self.logger.debug("Gathering the pipeline summary for the following execution id: %s", execution_id)
+        for page in self._list_pipeline_executions():
+            for execution in page:
+                if execution.execution_id == execution_id:
+                    return execution
 
-        self.logger.debug(f"{inspect.stack()[0][3]} - No matching execution found")
+        self.logger.debug("No matching execution found")
         return None
 
+    def _fetch_new_executions(self) -> list:
+        """
+        Uses the Boto3 API to page through the pipeline executions until the most recent execution held in the execution
+        store is reached, so only executions that haven't been stored yet are returned. Paging continues past that point
+        until the execution from the incoming event has been found, unless it is already stored, and never past the page
+        limit of _list_pipeline_executions. When nothing is stored for the pipeline only the first page is read.
+
+        Returns:
+            list: Execution records that match the allowed status and are missing from the execution store
+        """
+        latest_execution = self.execution_store.get_latest_execution(self.pipeline_name)
+        history_reached = False
+        event_execution_found = self.execution_store.get_execution(self.pipeline_name, self.execution_id) is not None
+        new_executions = []
+
+        self.logger.debug("Fetching %s pipeline executions newer than %s", self.pipeline_name, latest_execution)
+        for page in self._list_pipeline_executions():
+            for execution in page:
+                is_event_execution = execution.execution_id == self.execution_id
+                event_execution_found = event_execution_found or is_event_execution
+                if latest_execution and execution.start_time <= latest_execution.start_time:
+                    history_reached = True
+
+                if execution.status in self.allowed_status and (not history_reached or is_event_execution):
+                    new_executions.append(execution)
+
+            if (history_reached or latest_execution is None) and event_execution_found:
+                break
+
+        self.logger.debug("Found %s new pipeline executions", len(new_executions))
+        return new_executions
+
+    def _process_pipeline_executions_from_store(self) -> None:
+        """
+        Stores the new pipeline executions and sets the same class variables as _process_pipeline_executions, using
+        indexed lookups against the execution store instead of scanning the recent executions.
+        """
+        self.execution_store.upsert_executions(self.pipeline_name, self._fetch_new_executions())
+        current_execution = self.execution_store.get_execution(self.pipeline_name, self.execution_id)
+
+        if current_execution is None:
+            self.logger.debug("No matching execution found")
+            return
+
+        status = current_execution.status
+        other_status = ExecutionStatus.FAILED if status == ExecutionStatus.SUCCEEDED else ExecutionStatus.SUCCEEDED
+        self.current_pipeline_execution = current_execution
+        self.prior_success_plus_one_execution = current_execution
+
+        self.logger.debug("Finding the prior execution with the same status and the first state change after it")
+        prior_execution = self.execution_store.get_prior_execution(
+            self.pipeline_name, status, current_execution.start_time
+        )
+        state_change_execution = self.execution_store.get_first_execution(
+            self.pipeline_name,
+            other_status,
+            prior_execution.start_time if prior_execution else None,
+            current_execution.start_time
+        )
+
+        if state_change_execution:
+            self.prior_state_execution = state_change_execution
+        if status == ExecutionStatus.SUCCEEDED:
+            if prior_execution:
+                self.prior_success_execution = prior_execution
+            if state_change_execution:
+                self.prior_success_plus_one_execution = state_change_execution
+        if prior_execution:
+            self.pipeline_state_is_final = True
+
     def _process_pipeline_executions(self) -> None:
         """
         Runs through the list of pipeline executions and sets the proper class variables if specific criteria matches.
         """
+        if self.execution_store:
+            self._process_pipeline_executions_from_store()
+            return
+
         pipeline_executions = self._filter_pipeline_executions()
-        pipeline_state_is_final = False
 
-        self.logger.debug(f"{inspect.stack()[0][3]} - Running through pipeline execution list")
+        self.logger.debug("Running through pipeline execution list")
         for execution in pipeline_executions:
-            if not pipeline_state_is_final:
-                self.logger.debug(f"{inspect.stack()[0][3]} - Finding the current execution")
-                if execution['pipelineExecutionId'] == self.execution_id:
-                    self.current_pipeline_execution = execution
-                    self.prior_success_plus_one_execution = execution
-                elif self.current_pipeline_execution:
-                    self.logger.debug(
-                        f"{inspect.stack()[0][3]} - If the current execution is a success, find the prior successful "
-                        "run and the next execution after that"
-                    )
-                    if self.current_pipeline_execution['status'] == 'Succeeded':
-                        if execution['status'] == 'Succeeded':
-                            self.prior_success_execution = execution
-                        else:
-                            self.prior_success_plus_one_execution = execution
-                    self.logger.debug(
-                        f"{inspect.stack()[0][3]} - Next, if the state is different from the current then we keep it. "
-                        "Then finally we are done if the state is the same as current"
-                    )
-                    if execution['status'] != self.current_pipeline_execution['status']:
-                        self.prior_state_execution = execution
-                    elif execution['status'] == self.current_pipeline_execution['status']:
-                        pipeline_state_is_final = True
-                        self.pipeline_state_is_final = pipeline_state_is_final
+            self.logger.debug("Finding the current execution")
+            if execution.execution_id == self.execution_id:
+                self.current_pipeline_execution = execution
+                self.prior_success_plus_one_execution = execution
+            elif hasattr(self, 'current_pipeline_execution'):
+                self.logger.debug(
+                    "If the current execution is a success, find the prior successful "
+                    "run and the next execution after that"
+                )
+                if self.current_pipeline_execution.status == ExecutionStatus.SUCCEEDED:
+                    if execution.status == ExecutionStatus.SUCCEEDED:
+                        self.prior_success_execution = execution
+                    else:
+                        self.prior_success_plus_one_execution = execution
+                self.logger.debug(
+                    "Next, if the state is different from the current then we keep it. "
+                    "Then finally we are done if the state is the same as current"
+                )
+                if execution.status != self.current_pipeline_execution.status:
+                    self.prior_state_execution = execution
+                elif execution.status == self.current_pipeline_execution.status:
+                    self.logger.debug("Pipeline state is final, no further executions need to be listed")
+                    self.pipeline_state_is_final = True
+                    break
 
     def _handle_final_state(self) -> None:
         """
         Checks the value of the event state and creates a new CloudWatch Metric based on that value
         """
-        self.logger.debug(
-            f"{inspect.stack()[0][3]} - Checking the event status to determine what CloudWatch Metric to push"
-        )
+        self.logger.debug("Checking the event status to determine what CloudWatch Metric to push")
         if self.event['detail']['state'] == 'SUCCEEDED':
             self.add_metric('SuccessCount', self.count, 1)
         elif self.event['detail']['state'] == 'FAILED':
@@ -166,68 +305,70 @@ class PipelineEventHandler():
         """
         Checks to see if a yellow or red time metric should be added for the pipeline execution
         """
-        self.logger.debug(f"{inspect.stack()[0][3]} - Comparing the current and previous execution status")
+        self.logger.debug("Comparing the current and previous execution status")
         try:
-            if self.current_pipeline_execution['status'] != self.prior_state_execution['status']:
+            if self.current_pipeline_execution.status != self.prior_state_execution.status:
                 duration = self._duration_in_seconds(
-                    self.prior_state_execution['startTime'], self.current_pipeline_execution['startTime']
+                    self.prior_state_execution.start_time, self.current_pipeline_execution.start_time
                 )
 
-                if self.current_pipeline_execution['status'] == 'Succeeded':
+                if self.current_pipeline_execution.status == ExecutionStatus.SUCCEEDED:
                     self.add_metric('RedTime', self.seconds, duration)
-                elif self.current_pipeline_execution['status'] == 'Failed':
+                elif self.current_pipeline_execution.status == ExecutionStatus.FAILED:
                     self.add_metric('YellowTime', self.seconds, duration)
         except AttributeError as e:
             if "'PipelineEventHandler' object has no attribute 'prior_state_execution'" in str(e):
-                self.logger.debug(f"{inspect.stack()[0][3]} - No metrics to create for yellow or red time")
-        except TypeError as e:
-            if "'NoneType' object is not subscriptable" in str(e):
-                self.logger.debug(f"{inspect.stack()[0][3]} - No metrics to create for yellow or red time")
+                self.logger.debug("No metrics to create for yellow or red time")
+            elif "'NoneType' object has no attribute" in str(e):
+                self.logger.debug("No metrics to create for yellow or red time")
 
     def _handle_pipeline_cycle_time(self) -> None:
         """
         Checks to see if a successful cycle time metric should be added for the pipeline execution
         """
-        self.logger.debug(f"{inspect.stack()[0][3]} - Comparing the current and previous successful execution status")
+        self.logger.debug("Comparing the current and previous successful execution status")
         try:
-            if self.current_pipeline_execution and self.current_pipeline_execution['status'] == 'Succeeded' and self.prior_success_execution:
+            if self.current_pipeline_execution and self.current_pipeline_execution.status == ExecutionStatus.SUCCEEDED and self.prior_success_execution:
                 duration = self._duration_in_seconds(
-                    self.prior_success_execution['lastUpdateTime'], self.current_pipeline_execution['lastUpdateTime']
+                    self.prior_success_execution.last_update_time, self.current_pipeline_execution.last_update_time
                 )
                 self.add_metric('SuccessCycleTime', self.seconds, duration)
         except AttributeError as e:
             if "'PipelineEventHandler' object has no attribute 'prior_success_execution'" in str(e):
-                self.logger.debug(f"{inspect.stack()[0][3]} - No metrics to create for cycle time")
+                self.logger.debug("No metrics to create for cycle time")
 
     def _handle_pipeline_lead_time(self) -> None:
         """
         Checks to see if a successful or failure metric should be added for the pipeline execution
         """
-        self.logger.debug(f"{inspect.stack()[0][3]} - Checking the current execution status")
+        self.logger.debug("Checking the current execution status")
         try:
-            if self.current_pipeline_execution['status'] == 'Succeeded':
+            if self.current_pipeline_execution.status == ExecutionStatus.SUCCEEDED:
                 duration = self._duration_in_seconds(
-                    self.current_pipeline_execution['startTime'], self.current_pipeline_execution['lastUpdateTime']
+                    self.current_pipeline_execution.start_time, self.current_pipeline_execution.last_update_time
                 )
                 self.add_metric('SuccessLeadTime', self.seconds, duration)
                 if self.pipeline_state_is_final and self.prior_success_plus_one_execution:
                     lead_duration = self._duration_in_seconds(
-                        self.prior_success_plus_one_execution['startTime'],
-                        self.current_pipeline_execution['lastUpdateTime']
+                        self.prior_success_plus_one_execution.start_time,
+                        self.current_pipeline_execution.last_update_time
                     )
                     self.add_metric('DeliveryLeadTime', self.seconds, lead_duration)
-            elif self.current_pipeline_execution['status'] == 'Failed':
+            elif self.current_pipeline_execution.status == ExecutionStatus.FAILED:
                 duration = self._duration_in_seconds(
-                    self.current_pipeline_execution['startTime'], self.current_pipeline_execution['lastUpdateTime']
+                    self.current_pipeline_execution.start_time, self.current_pipeline_execution.last_update_time
                 )
                 self.add_metric('FailureLeadTime', self.seconds, duration)
         except AttributeError as e:
             if "'PipelineEventHandler' object has no attribute 'pipeline_state_is_final'" in str(e):
-                self.logger.debug(f"{inspect.stack()[0][3]} - No metrics to create for delivery lead time")
+                self.logger.debug("No metrics to create for delivery lead time")
 
     def add_metric(self, metric_name: str, unit: str, value: int) -> None:
         """
-        Uses Boto3 API to create a CloudWatch Metric with details provided from the incoming arguments
+        Adds a CloudWatch Metric data point with details provided from the incoming arguments to the metric emitter,
+        along with a fleet wide data point that the dashboard overview aggregates unless FLEET_METRICS is turned off.
+        The buffered data points are sent together once all of the event steps have run, either with PutMetricData or as
+        Embedded Metric Format logs depending on the METRICS_EMITTER setting.
 
         Args:
             metric_name (str): Name of the metric
@@ -235,60 +376,111 @@ class PipelineEventHandler():
             value (int): Value of the metric
         """
         if value == 0:
-            self.logger.debug(
-                f"{inspect.stack()[0][3]} - Value is 0, Will not create a new CloudWatch Metric data point"
-            )
+            self.logger.debug("Value is 0, Will not create a new CloudWatch Metric data point")
             return
 
-        self.logger.debug(f"{inspect.stack()[0][3]} - Creating a new CloudWatch Metric data point")
-        try:
-            self.cloudwatch.put_metric_data(
-                Namespace='Pipeline',
-                MetricData=[
-                    {
-                        'MetricName': metric_name,
-                        'Dimensions': [
-                            {
-                                'Name': 'PipelineName',
-                                'Value': self.pipeline_name
-                            }
-                        ],
-                        'Timestamp': datetime.datetime.strptime(self.event['time'], '%Y-%m-%dT%H:%M:%SZ'),
-                        'Unit': unit,
-                        'Value': value
-                    }
-                ]
-            )
-        except botocore.exceptions.ClientError as e:
-            self.logger.exception(
-                f"{inspect.stack()[0][3]} - Error occurred while creating a new CloudWatch Metric data point"
-                f"\nBotocore Exception: \n{e}"
-            )
-            raise
+        self.logger.debug("Creating a new CloudWatch Metric data point")
+        metric_datum = {
+            'MetricName': metric_name,
+            'Dimensions': [
+                {
+                    'Name': 'PipelineName',
+                    'Value': self.pipeline_name
+                }
+            ],
+            'Timestamp': datetime.datetime.strptime(self.event['time'], '%Y-%m-%dT%H:%M:%SZ'),
+            'Unit': unit,
+            'Value': value
+        }
+        self.metric_buffer.add(metric_datum)
+
+        if self.fleet_dimensions is not None:
+            self.metric_buffer.add(dict(metric_datum, Dimensions=self.fleet_dimensions))
 
     def _duration_in_seconds(self, time_1: int, time_2: int) -> int:
         """
-        Subtracts the values of two time value integers, converts that value to seconds, and rounds that value to the
-        nearest whole number
+        Subtracts the values of two epoch millisecond integers, converts that value to seconds, and rounds that value to
+        the nearest whole number
 
         Args:
-            time_1 (int): Time value
-            time_2 (int): Time value
+            time_1 (int): Time value in epoch milliseconds
+            time_2 (int): Time value in epoch milliseconds
 
         Returns:
             int: Time in seconds, rounded to the nearest whole number
         """
-        self.logger.debug(f"{inspect.stack()[0][3]} - Time in seconds = {round((time_2 - time_1).total_seconds())}")
-        return round((time_2 - time_1).total_seconds())
+        duration = round((time_2 - time_1) / 1000)
 
-    def execute_event_steps(self):
+        self.logger.debug("Time in seconds = %s", duration)
+        return duration
+
+    def _record_pipeline(self) -> None:
         """
-        Performs the list of steps and actions to create the necessary pipeline event metrics
+        Records the pipeline in the pipeline registry, if one has been configured, so the dashboard generator knows
+        about it without scanning the CloudWatch Metrics. A pipeline recorded for the first time signals the generator
+        to regenerate the dashboard, when a regeneration queue has been configured.
         """
-        self._check_for_allowed_state()
-        self._check_for_pipeline_prefix()
+        if not self.pipeline_registry:
+            return
+
+        event_time = datetime.datetime.strptime(self.event['time'], '%Y-%m-%dT%H:%M:%SZ')
+        if self.pipeline_registry.record_pipeline(
+            self.pipeline_name, to_epoch_milliseconds(event_time.replace(tzinfo=datetime.timezone.utc))
+        ):
+            self.logger.info("Pipeline %s added to the pipeline registry", self.pipeline_name)
+            if self.regeneration_signal:
+                self.regeneration_signal.signal(self.pipeline_name)
+
+    def _add_event_metrics(self) -> None:
+        """
+        Runs through the pipeline executions and adds the metrics for the event to the metric buffer
+        """
+        self._record_pipeline()
         self._process_pipeline_executions()
         self._handle_final_state()
         self._handle_pipeline_yellow_and_red_time()
         self._handle_pipeline_cycle_time()
         self._handle_pipeline_lead_time()
+
+    def process_event(self) -> bool:
+        """
+        Adds the metrics for the event to the metric buffer without sending them, so that several events can share the
+        same flush. Events that don't match the allowed state or the pipeline pattern are skipped instead of exiting.
+
+        Returns:
+            bool: True if metrics were added for the event, False if the event was skipped
+        """
+        detail = self.event['detail']
+        if detail['state'] not in self.allowed_state or not self.pipeline_matcher.matches(detail['pipeline']):
+            self.logger.debug("Skipping the %s event for %s", detail['state'], detail['pipeline'])
+            return False
+
+        self.pipeline_name = detail['pipeline']
+        self.execution_id = detail['execution-id']
+        self._add_event_metrics()
+        return True
+
+    def execute_event_steps(self):
+        """
+        Performs the list of steps and actions to create the necessary pipeline event metrics. Each step is timed when
+        the INSTRUMENTATION setting is enabled.
+        """
+        instrumentation = Instrumentation('PipelineEventHandler')
+        instrumentation.attach(self.codepipeline, self.cloudwatch)
+
+        with instrumentation.phase('CheckEvent'):
+            self._check_for_allowed_state()
+            self._check_for_pipeline_prefix()
+        with instrumentation.phase('RecordPipeline'):
+            self._record_pipeline()
+        with instrumentation.phase('ProcessExecutions'):
+            self._process_pipeline_executions()
+        with instrumentation.phase('AddMetrics'):
+            self._handle_final_state()
+            self._handle_pipeline_yellow_and_red_time()
+            self._handle_pipeline_cycle_time()
+            self._handle_pipeline_lead_time()
+        with instrumentation.phase('Flush'):
+            self.metric_buffer.flush()
+        self.logger.info("Execution cache statistics: %s", self.execution_cache.statistics())
+        instrumentation.emit()
@@ -0,0 +1,97 @@
+import fnmatch
+import functools
+import re
+
+
+class PipelineMatcher():
+    """
+    Matches pipeline names against a comma separated list of glob patterns. Patterns starting with '!' exclude the
+    pipelines they match, and a pipeline is matched when it matches at least one of the other patterns and none of the
+    exclusions. When only exclusions are given every other pipeline is matched, and an empty pattern matches nothing.
+
+    The patterns are compiled once: literal names go into a set, patterns that are a literal prefix followed by '*' are
+    checked with a single startswith call, and every other pattern is combined into one regular expression.
+    """
+
+    def __init__(self, pattern: str, cache_size: int = 4096) -> None:
+        patterns = [pattern.strip() for pattern in pattern.split(',') if pattern.strip()]
+        includes = [pattern for pattern in patterns if not pattern.startswith('!')]
+        excludes = [pattern[1:] for pattern in patterns if pattern.startswith('!')]
+
+        self.match_all = not includes and bool(excludes)
+        self.includes = self._compile(includes)
+        self.excludes = self._compile(excludes)
+        self.matches = functools.lru_cache(maxsize=cache_size)(self._matches)
+
+    def _compile(self, patterns: list) -> tuple:
+        """
+        Splits the patterns into literal names, literal prefixes and the remaining globs compiled into one regex
+
+        Args:
+            patterns (list): Glob patterns
+
+        Returns:
+            tuple: Set of names, tuple of prefixes and the compiled regex, or None when there are no other globs
+        """
+        names = set()
+        prefixes = set()
+        globs = []
+
+        for pattern in patterns:
+            if not any(character in pattern for character in '*?['):
+                names.add(pattern)
+            elif pattern.endswith('*') and not any(character in pattern[:-1] for character in '*?['):
+                prefixes.add(pattern[:-1])
+            else:
+                globs.append(pattern)
+
+        regex = re.compile('|'.join(fnmatch.translate(glob) for glob in globs)) if globs else None
+        return names, tuple(sorted(prefixes)), regex
+
+    def _match_any(self, rules: tuple, pipeline_name: str) -> bool:
+        names, prefixes, regex = rules
+        return (
+            pipeline_name in names
+            or pipeline_name.startswith(prefixes)
+            or (regex is not None and regex.match(pipeline_name) is not None)
+        )
+
+    def _matches(self, pipeline_name: str) -> bool:
+        """
+        Checks a pipeline name against the patterns. Called through the memoised matches method.
+
+        Args:
+            pipeline_name (str): Name of the pipeline
+
+        Returns:
+            bool: True if the pipeline is included and not excluded
+        """
+        if not self.match_all and not self._match_any(self.includes, pipeline_name):
+            return False
+
+        return not self._match_any(self.excludes, pipeline_name)
+
+    def filter(self, pipeline_names: list) -> list:
+        """
+        Args:
+            pipeline_names (list): Names of the pipelines
+
+        Returns:
+            list: Names of the pipelines that match, in the same order
+        """
+        return [pipeline_name for pipeline_name in pipeline_names if self.matches(pipeline_name)]
+
+
+@functools.lru_cache(maxsize=8)
+def get_pipeline_matcher(pattern: str) -> PipelineMatcher:
+    """
+    Compiles the matcher for a pipeline pattern once, so warm Lambda invocations reuse it along with its memoised
+    matches
+
+    Args:
+        pattern (str): Comma separated glob patterns, exclusions starting with '!'
+
+    Returns:
+        PipelineMatcher: Shared matcher for the pattern
+    """
+    return PipelineMatcher(pattern)
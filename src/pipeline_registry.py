@@ -0,0 +1,194 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import botocore
+
+from clients import get_client
+from logger import Logger
+from shared_backend import SharedBackend
+
+
+class PipelineRegistry(ABC):
+    """
+    Interface for the registry of pipelines that have sent events, along with the time each pipeline was last seen in
+    epoch milliseconds. The dashboard generator reads it instead of scanning the CloudWatch Metrics.
+    """
+
+    @abstractmethod
+    def record_pipeline(self, pipeline_name: str, last_seen: int) -> bool:
+        """
+        Records that an event was seen for a pipeline. The last seen time only ever moves forward, so events that are
+        delivered out of order don't rewind it.
+
+        Args:
+            pipeline_name (str): Name of the pipeline
+            last_seen (int): Time of the event in epoch milliseconds
+
+        Returns:
+            bool: True if the pipeline wasn't in the registry yet
+        """
+
+    @abstractmethod
+    def list_pipelines(self, since: int) -> list:
+        """
+        Lists the pipelines that have been seen since a point in time
+
+        Args:
+            since (int): Inclusive lower bound of the last seen time in epoch milliseconds
+
+        Returns:
+            list: Sorted names of the pipelines
+        """
+
+    @abstractmethod
+    def first_seen(self) -> Optional[int]:
+        """
+        Returns:
+            Optional[int]: Earliest time a pipeline was recorded in epoch milliseconds, or None while the registry is
+                empty
+        """
+
+
+class SQLitePipelineRegistry(PipelineRegistry):
+    def __init__(self, path: str = ':memory:') -> None:
+        import sqlite3
+
+        self.logger = Logger(logger_name='SQLitePipelineRegistry', level='INFO').setup_logger()
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        """
+        Creates the pipelines table and the index used to list the recently seen pipelines
+        """
+        self.logger.debug("Creating the pipeline registry schema in %s", self.path)
+        with self.lock, self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS pipelines ("
+                "pipeline_name TEXT NOT NULL PRIMARY KEY, "
+                "first_seen INTEGER NOT NULL, "
+                "last_seen INTEGER NOT NULL)"
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS pipelines_by_last_seen ON pipelines (last_seen)")
+
+    def record_pipeline(self, pipeline_name: str, last_seen: int) -> bool:
+        self.logger.debug("Recording %s as last seen at %s", pipeline_name, last_seen)
+        with self.lock, self.connection:
+            inserted = self.connection.execute(
+                "INSERT OR IGNORE INTO pipelines (pipeline_name, first_seen, last_seen) VALUES (?, ?, ?)",
+                (pipeline_name, last_seen, last_seen)
+            ).rowcount
+            if not inserted:
+                self.connection.execute(
+                    "UPDATE pipelines SET last_seen = ? WHERE pipeline_name = ? AND last_seen < ?",
+                    (last_seen, pipeline_name, last_seen)
+                )
+
+        return bool(inserted)
+
+    def list_pipelines(self, since: int) -> list:
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT pipeline_name FROM pipelines WHERE last_seen >= ? ORDER BY pipeline_name", (since,)
+            ).fetchall()
+
+        return [row[0] for row in rows]
+
+    def first_seen(self) -> Optional[int]:
+        with self.lock:
+            return self.connection.execute("SELECT MIN(first_seen) FROM pipelines").fetchone()[0]
+
+
+class DynamoDBPipelineRegistry(PipelineRegistry):
+    """
+    Pipeline registry kept in a DynamoDB table with the partition key `PipelineName` (S). Each item holds the
+    `FirstSeen` and `LastSeen` times (N) in epoch milliseconds.
+    """
+
+    def __init__(self, table_name: str, dynamodb=None) -> None:
+        self.logger = Logger(logger_name='DynamoDBPipelineRegistry', level='INFO').setup_logger()
+        self.table_name = table_name
+        self.dynamodb = dynamodb or get_client('dynamodb')
+        # Pipelines are never removed, so the earliest first seen time can only move back and is read once per container
+        self.earliest_first_seen = None
+
+    def record_pipeline(self, pipeline_name: str, last_seen: int) -> bool:
+        self.logger.debug("Recording %s as last seen at %s", pipeline_name, last_seen)
+        try:
+            response = self.dynamodb.update_item(
+                TableName=self.table_name,
+                Key={'PipelineName': {'S': pipeline_name}},
+                UpdateExpression='SET LastSeen = :last_seen, FirstSeen = if_not_exists(FirstSeen, :last_seen)',
+                ConditionExpression='attribute_not_exists(LastSeen) OR LastSeen < :last_seen',
+                ExpressionAttributeValues={':last_seen': {'N': str(last_seen)}},
+                ReturnValues='UPDATED_OLD'
+            )
+        except botocore.exceptions.ClientError as e:
+            if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+                return False
+            self.logger.exception("Error occurred while recording the pipeline\nBotocore Exception: \n%s", e)
+            raise
+
+        return 'FirstSeen' not in response.get('Attributes', {})
+
+    def list_pipelines(self, since: int) -> list:
+        pipelines = []
+
+        try:
+            paginator = self.dynamodb.get_paginator('scan')
+
+            for response in paginator.paginate(
+                TableName=self.table_name,
+                ProjectionExpression='PipelineName',
+                FilterExpression='LastSeen >= :since',
+                ExpressionAttributeValues={':since': {'N': str(since)}}
+            ):
+                pipelines.extend(item['PipelineName']['S'] for item in response['Items'])
+        except botocore.exceptions.ClientError as e:
+            self.logger.exception("Error occurred while reading the pipeline registry\nBotocore Exception: \n%s", e)
+            raise
+
+        return sorted(pipelines)
+
+    def first_seen(self) -> Optional[int]:
+        if self.earliest_first_seen is not None:
+            return self.earliest_first_seen
+
+        try:
+            paginator = self.dynamodb.get_paginator('scan')
+
+            first_seen_times = [
+                int(item['FirstSeen']['N'])
+                for response in paginator.paginate(TableName=self.table_name, ProjectionExpression='FirstSeen')
+                for item in response['Items'] if 'FirstSeen' in item
+            ]
+        except botocore.exceptions.ClientError as e:
+            self.logger.exception("Error occurred while reading the pipeline registry\nBotocore Exception: \n%s", e)
+            raise
+
+        self.earliest_first_seen = min(first_seen_times, default=None)
+        return self.earliest_first_seen
+
+
+def _create_pipeline_registry(backend: str) -> Optional[PipelineRegistry]:
+    if backend == 'sqlite':
+        return SQLitePipelineRegistry(os.environ.get('PIPELINE_REGISTRY_PATH', '/tmp/pipelines.db'))
+    if backend == 'dynamodb':
+        return DynamoDBPipelineRegistry(os.environ['PIPELINE_REGISTRY_TABLE'])
+    return None
+
+
+_pipeline_registry = SharedBackend('PIPELINE_REGISTRY', _create_pipeline_registry)
+
+
+def get_pipeline_registry() -> Optional[PipelineRegistry]:
+    """
+    Returns:
+        Optional[PipelineRegistry]: Pipeline registry selected through PIPELINE_REGISTRY ('sqlite' or 'dynamodb'), or
+            None when no registry has been configured
+    """
+    return _pipeline_registry.get()
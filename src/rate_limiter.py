@@ -0,0 +1,30 @@
+import threading
+import time
+from typing import Callable
+
+
+class RateLimiter():
+    def __init__(
+        self,
+        requests_per_second: float,
+        timer: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ) -> None:
+        self.interval = 1 / requests_per_second
+        self.timer = timer
+        self.sleep = sleep
+        self.lock = threading.Lock()
+        self.next_request_time = 0.0
+
+    def acquire(self) -> None:
+        """
+        Blocks until the next request can be made without exceeding the configured request rate. Threads sharing the
+        limiter are given evenly spaced request slots.
+        """
+        with self.lock:
+            now = self.timer()
+            request_time = max(now, self.next_request_time)
+            self.next_request_time = request_time + self.interval
+
+        if request_time > now:
+            self.sleep(request_time - now)
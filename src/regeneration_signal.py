@@ -0,0 +1,88 @@
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import botocore
+
+from clients import get_client
+from logger import Logger
+from shared_backend import SharedBackend
+
+
+class RegenerationSignal(ABC):
+    """
+    Interface for telling the dashboard generator that a pipeline it hasn't shown yet has sent its first event, so the
+    dashboard is regenerated when the fleet changes instead of on a fixed schedule
+    """
+
+    @abstractmethod
+    def signal(self, pipeline_name: str) -> bool:
+        """
+        Asks for the dashboard to be regenerated
+
+        Args:
+            pipeline_name (str): Name of the pipeline that was seen for the first time
+
+        Returns:
+            bool: True if a regeneration was requested, False if one was already requested for the same window
+        """
+
+
+class SQSRegenerationSignal(RegenerationSignal):
+    """
+    Signals the generator through an SQS FIFO queue with a delivery delay of at least the coalescing window. Every
+    signal within a window shares the same deduplication id, so SQS drops all but the first message and a burst of new
+    pipelines causes a single regeneration. The delay holds that message back until the window has closed, so the
+    regeneration includes every pipeline recorded during the window. The window can't be longer than the five minute
+    deduplication interval of SQS.
+    """
+
+    def __init__(self, queue_url: str, window_seconds: int = 60, sqs=None) -> None:
+        self.logger = Logger(logger_name='SQSRegenerationSignal', level='INFO').setup_logger()
+        self.queue_url = queue_url
+        self.window_seconds = window_seconds
+        self.sqs = sqs or get_client('sqs')
+        # Window of the last message sent by this container, so a burst seen by a warm container sends one message
+        self.signalled_window = None
+
+    def signal(self, pipeline_name: str) -> bool:
+        window = int(time.time() // self.window_seconds)
+        if window == self.signalled_window:
+            self.logger.debug("Regeneration already requested for window %s", window)
+            return False
+
+        try:
+            self.sqs.send_message(
+                QueueUrl=self.queue_url,
+                MessageBody=json.dumps({'pipeline': pipeline_name, 'window': window}),
+                MessageGroupId='dashboard',
+                MessageDeduplicationId=f'dashboard-{window}'
+            )
+        except botocore.exceptions.ClientError as e:
+            # The scheduled run of the generator still picks the pipeline up, so the event itself doesn't fail
+            self.logger.warning("Unable to request a dashboard regeneration for %s: %s", pipeline_name, e)
+            return False
+
+        self.signalled_window = window
+        self.logger.info("Dashboard regeneration requested for the new pipeline %s", pipeline_name)
+        return True
+
+
+# Shared so warm Lambda invocations know the window of the last message sent
+_regeneration_signal = SharedBackend(
+    'DASHBOARD_REGENERATION_QUEUE_URL',
+    lambda queue_url: SQSRegenerationSignal(
+        queue_url, window_seconds=int(os.environ.get('DASHBOARD_REGENERATION_WINDOW', '60'))
+    )
+)
+
+
+def get_regeneration_signal() -> Optional[RegenerationSignal]:
+    """
+    Returns:
+        Optional[RegenerationSignal]: Regeneration signal for the queue set in DASHBOARD_REGENERATION_QUEUE_URL, with
+            the coalescing window set in DASHBOARD_REGENERATION_WINDOW, or None when no queue has been configured
+    """
+    return _regeneration_signal.get()
@@ -0,0 +1,31 @@
+import os
+from typing import Any, Callable
+
+
+class SharedBackend():
+    """
+    Backend selected through an environment variable. It is created on first use and kept at module level by its
+    owner, so warm Lambda invocations reuse it along with its connection and state.
+    """
+
+    def __init__(self, setting: str, create: Callable[[str], Any]) -> None:
+        """
+        Args:
+            setting (str): Environment variable selecting the backend
+            create (Callable): Creates the backend from the value of the setting, returning None for unknown values
+        """
+        self.setting = setting
+        self.create = create
+        self.instance = None
+
+    def get(self) -> Any:
+        """
+        Returns:
+            Any: Shared backend, or None while the setting is empty
+        """
+        value = os.environ.get(self.setting)
+
+        if self.instance is None and value:
+            self.instance = self.create(value)
+
+        return self.instance if value else None
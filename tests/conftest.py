@@ -1,7 +1,39 @@
 import os
+import sys
 from unittest import mock
 
 import pytest
+from clients import reset_clients
+from dashboard_generator import dashboard_update_statistics, discovered_pipelines, published_dashboard_hashes
+from pipeline_event_handler import shared_execution_cache
+
+# The fakes of the AWS clients are shared with the benchmarks
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks'))
+from fake_services import FakeCloudWatch, FakeCodePipeline  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def shared_clients():
+    reset_clients()
+    yield
+    reset_clients()
+
+
+@pytest.fixture(autouse=True)
+def execution_cache():
+    shared_execution_cache.clear()
+    yield
+    shared_execution_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def published_dashboards():
+    published_dashboard_hashes.clear()
+    discovered_pipelines.clear()
+    dashboard_update_statistics.update(checks=0, skips=0)
+    yield
+    published_dashboard_hashes.clear()
+    discovered_pipelines.clear()
 
 
 @pytest.fixture()
@@ -86,3 +118,20 @@ def failing_prefix_event():
     }
 
     return event
+
+
+@pytest.fixture()
+def fake_codepipeline():
+    return FakeCodePipeline(
+        6,
+        4,
+        latency=0.02,
+        prefix='foo',
+        statuses=['Succeeded', 'Succeeded', 'Failed', 'Succeeded'],
+        failing_pipelines=['foo-00005']
+    )
+
+
+@pytest.fixture()
+def fake_cloudwatch():
+    return FakeCloudWatch([f'foo-{index:05d}' for index in range(6)], latency=0.02, keep_metric_data=True)
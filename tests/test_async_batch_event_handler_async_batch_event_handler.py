@@ -0,0 +1,117 @@
+import os
+import time
+from unittest import mock
+
+import botocore
+from async_batch_event_handler import AsyncBatchEventHandler
+from async_engine import run_async
+from batch_event_handler import BatchEventHandler
+from pipeline_event_handler import shared_execution_cache
+
+
+def batch_records(fake_codepipeline):
+    return [
+        fake_codepipeline.event(pipeline_name, index)
+        for pipeline_name in fake_codepipeline.pipeline_names
+        for index in [1, 0]
+    ]
+
+
+def data_points(fake_cloudwatch):
+    return sorted(
+        (
+            tuple(dimension['Value'] for dimension in datum['Dimensions']),
+            datum['MetricName'],
+            datum['Value']
+        )
+        for datum in fake_cloudwatch.metric_data
+    )
+
+
+def test_async_batch_event_handler_ensure_same_result_as_sync(fake_codepipeline, fake_cloudwatch, env_variables):
+    records = batch_records(fake_codepipeline)
+    sync_response = BatchEventHandler(
+        records, codepipeline=fake_codepipeline, cloudwatch=fake_cloudwatch
+    ).execute_batch_steps()
+    sync_data_points = data_points(fake_cloudwatch)
+    fake_cloudwatch.metric_data.clear()
+    shared_execution_cache.clear()
+
+    async_response = run_async(
+        AsyncBatchEventHandler(records, codepipeline=fake_codepipeline, cloudwatch=fake_cloudwatch)
+        .execute_batch_steps_async
+    )
+
+    assert async_response == sync_response
+    assert async_response == {'batchItemFailures': [{'itemIdentifier': 'foo-00005-00002'}, {'itemIdentifier': 'foo-00005-00003'}]}
+    assert data_points(fake_cloudwatch) == sync_data_points
+    assert len(sync_data_points) > 0
+
+
+def test_async_batch_event_handler_ensure_pipelines_are_listed_concurrently(
+    fake_codepipeline,
+    fake_cloudwatch,
+    env_variables
+):
+    handler = AsyncBatchEventHandler(
+        batch_records(fake_codepipeline), codepipeline=fake_codepipeline, cloudwatch=fake_cloudwatch
+    )
+
+    start = time.perf_counter()
+    with mock.patch.dict(os.environ, {'ASYNC_MAX_CONCURRENCY': '3'}):
+        run_async(handler.execute_batch_steps_async)
+    elapsed = time.perf_counter() - start
+
+    assert fake_codepipeline.max_in_flight == 3
+    assert fake_codepipeline.calls['list_pipeline_executions'] == 6
+    # Six pipelines three at a time, instead of one after the other
+    assert elapsed < 6 * fake_codepipeline.latency + fake_cloudwatch.latency
+
+
+def test_async_batch_event_handler_ensure_flush_failure_fails_processed_items(
+    fake_codepipeline,
+    fake_cloudwatch,
+    env_variables
+):
+    fake_cloudwatch.put_metric_data = mock.Mock(
+        side_effect=botocore.exceptions.ClientError({'Error': {'Code': 'Throttling'}}, 'PutMetricData')
+    )
+    records = batch_records(fake_codepipeline)
+
+    response = run_async(
+        AsyncBatchEventHandler(records, codepipeline=fake_codepipeline, cloudwatch=fake_cloudwatch)
+        .execute_batch_steps_async
+    )
+
+    assert len(response['batchItemFailures']) == len(records)
+
+
+def test_async_batch_event_handler_ensure_flush_failure_fails_only_unsent_items(
+    fake_codepipeline,
+    fake_cloudwatch,
+    env_variables
+):
+    put_metric_data = fake_cloudwatch.put_metric_data
+
+    def failing_put_metric_data(Namespace, MetricData):
+        if any(dimension['Value'] == 'foo-00001' for datum in MetricData for dimension in datum['Dimensions']):
+            raise botocore.exceptions.ClientError({'Error': {'Code': 'Throttling'}}, 'PutMetricData')
+        return put_metric_data(Namespace=Namespace, MetricData=MetricData)
+
+    fake_cloudwatch.put_metric_data = failing_put_metric_data
+    records = batch_records(fake_codepipeline)
+
+    with mock.patch('metric_buffer.MAX_METRIC_DATA_PER_REQUEST', 1):
+        response = run_async(
+            AsyncBatchEventHandler(records, codepipeline=fake_codepipeline, cloudwatch=fake_cloudwatch)
+            .execute_batch_steps_async
+        )
+
+    assert response == {
+        'batchItemFailures': [
+            {'itemIdentifier': 'foo-00005-00002'},
+            {'itemIdentifier': 'foo-00005-00003'},
+            {'itemIdentifier': 'foo-00001-00002'},
+            {'itemIdentifier': 'foo-00001-00003'}
+        ]
+    }
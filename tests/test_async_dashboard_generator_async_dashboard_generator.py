@@ -0,0 +1,45 @@
+import os
+from unittest import mock
+
+from async_dashboard_generator import AsyncDashboardGenerator
+from async_engine import run_async
+from fake_services import FakeCloudWatch
+from dashboard_generator import DashboardGenerator, published_dashboard_hashes
+
+
+def test_async_dashboard_generator_ensure_same_dashboards_as_sync(env_variables):
+    pipeline_names = [f'foo-{index:03d}' for index in range(250)]
+    sync_cloudwatch = FakeCloudWatch(pipeline_names, dashboards={'Pipelines-us-east-1': '{}'}, latency=0)
+    async_cloudwatch = FakeCloudWatch(pipeline_names, dashboards={'Pipelines-us-east-1': '{}'}, latency=0)
+
+    DashboardGenerator(cloudwatch=sync_cloudwatch).cloudwatch_put_dashboard()
+    published_dashboard_hashes.clear()
+    run_async(AsyncDashboardGenerator(cloudwatch=async_cloudwatch).cloudwatch_put_dashboard_async)
+
+    assert async_cloudwatch.dashboards == sync_cloudwatch.dashboards
+    assert sorted(async_cloudwatch.dashboards) == [f'Pipelines-us-east-1-{index}' for index in range(1, 4)]
+
+
+def test_async_dashboard_generator_ensure_dashboards_are_written_concurrently(env_variables):
+    cloudwatch = FakeCloudWatch([f'foo-{index:03d}' for index in range(500)], latency=0.02)
+
+    with mock.patch.dict(os.environ, {'ASYNC_MAX_CONCURRENCY': '4'}):
+        run_async(AsyncDashboardGenerator(cloudwatch=cloudwatch).cloudwatch_put_dashboard_async)
+
+    assert cloudwatch.calls['put_dashboard'] == 5
+    assert 1 < cloudwatch.max_in_flight <= 4
+
+
+def test_async_dashboard_generator_ensure_steps_are_timed_when_instrumented(env_variables, caplog):
+    cloudwatch = FakeCloudWatch(['foo-000'], dashboards={'Pipelines-us-east-1-1': '{}'})
+    cloudwatch.meta = mock.Mock()
+
+    with mock.patch.dict(os.environ, {'INSTRUMENTATION': 'log'}):
+        run_async(AsyncDashboardGenerator(cloudwatch=cloudwatch).cloudwatch_put_dashboard_async)
+
+    summaries = [record.instrumentation for record in caplog.records if hasattr(record, 'instrumentation')]
+
+    assert len(summaries) == 1
+    assert summaries[0]['name'] == 'DashboardGenerator'
+    assert sorted(summaries[0]['phases_ms']) == ['DeleteDashboards', 'GenerateDashboards', 'GetPipelines', 'PutDashboards']
+    assert list(cloudwatch.dashboards) == ['Pipelines-us-east-1']
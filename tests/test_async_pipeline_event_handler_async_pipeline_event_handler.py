@@ -0,0 +1,65 @@
+import os
+import subprocess
+import sys
+from unittest import mock
+
+from async_engine import run_async
+from async_pipeline_event_handler import AsyncPipelineEventHandler
+from pipeline_event_handler import PipelineEventHandler, shared_execution_cache
+
+
+def test_async_pipeline_event_handler_ensure_same_metrics_as_sync(fake_codepipeline, fake_cloudwatch, env_variables):
+    event = fake_codepipeline.event('foo-00000')
+    PipelineEventHandler(event, codepipeline=fake_codepipeline, cloudwatch=fake_cloudwatch).execute_event_steps()
+    sync_metric_data = list(fake_cloudwatch.metric_data)
+    fake_cloudwatch.metric_data.clear()
+    shared_execution_cache.clear()
+
+    run_async(
+        AsyncPipelineEventHandler(
+            event, codepipeline=fake_codepipeline, cloudwatch=fake_cloudwatch
+        ).execute_event_steps_async
+    )
+
+    assert fake_cloudwatch.metric_data == sync_metric_data
+    assert [datum['MetricName'] for datum in sync_metric_data if datum['Dimensions']] == [
+        'SuccessCount', 'RedTime', 'SuccessCycleTime', 'SuccessLeadTime', 'DeliveryLeadTime'
+    ]
+
+
+def test_async_pipeline_event_handler_ensure_other_handlers_are_not_imported():
+    code = (
+        "import sys, async_pipeline_event_handler; "
+        "print(sorted({'batch_event_handler', 'dashboard_generator'} & set(sys.modules)))"
+    )
+    src = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+    result = subprocess.run(
+        [sys.executable, '-c', code], env=dict(os.environ, PYTHONPATH=src), capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.strip() == '[]'
+
+
+def test_async_pipeline_event_handler_ensure_steps_are_timed_when_instrumented(
+    fake_codepipeline,
+    fake_cloudwatch,
+    env_variables,
+    caplog
+):
+    for client in [fake_codepipeline, fake_cloudwatch]:
+        client.meta = mock.Mock()
+    event = fake_codepipeline.event('foo-00000')
+
+    with mock.patch.dict(os.environ, {'INSTRUMENTATION': 'log'}):
+        run_async(
+            AsyncPipelineEventHandler(
+                event, codepipeline=fake_codepipeline, cloudwatch=fake_cloudwatch
+            ).execute_event_steps_async
+        )
+
+    summaries = [record.instrumentation for record in caplog.records if hasattr(record, 'instrumentation')]
+
+    assert len(summaries) == 1
+    assert summaries[0]['name'] == 'PipelineEventHandler'
+    assert sorted(summaries[0]['phases_ms']) == ['AddMetrics', 'CheckEvent', 'Flush', 'ProcessExecutions', 'RecordPipeline']
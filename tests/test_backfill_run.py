@@ -0,0 +1,135 @@
+import datetime
+import json
+from unittest import mock
+
+import botocore
+import pytest
+from backfill import Backfill
+
+
+def pipeline_executions(statuses):
+    """Builds execution summaries, newest first, from a list of statuses ordered oldest to newest"""
+    start_time = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=len(statuses))
+    return [
+        {
+            'pipelineExecutionId': f'execution-{index}',
+            'status': status,
+            'startTime': start_time + datetime.timedelta(days=index),
+            'lastUpdateTime': start_time + datetime.timedelta(days=index, minutes=5)
+        }
+        for index, status in reversed(list(enumerate(statuses)))
+    ]
+
+
+@pytest.fixture()
+def codepipeline():
+    codepipeline = mock.Mock()
+    paginators = {
+        'list_pipelines': mock.Mock(),
+        'list_pipeline_executions': mock.Mock()
+    }
+    paginators['list_pipelines'].paginate.return_value = [
+        {'pipelines': [{'name': 'foobar'}, {'name': 'foobaz'}, {'name': 'baz'}]}
+    ]
+    # Built once, so every listing returns the same times even when the test runs across a second boundary
+    executions = pipeline_executions(['Succeeded', 'Failed', 'InProgress', 'Succeeded'])
+    paginators['list_pipeline_executions'].paginate.side_effect = lambda pipelineName: [
+        {'pipelineExecutionSummaries': executions}
+    ]
+    codepipeline.get_paginator.side_effect = paginators.get
+    codepipeline.executions = executions
+
+    return codepipeline
+
+
+def test_run_ensure_every_matching_pipeline_is_replayed(codepipeline, tmp_path, env_variables):
+    cloudwatch = mock.Mock()
+    checkpoint_path = str(tmp_path / 'checkpoint.json')
+
+    report = Backfill(checkpoint_path, codepipeline=codepipeline, cloudwatch=cloudwatch).run()
+
+    assert report['pipelines'] == 2
+    assert report['executions'] == 6
+    assert report['failed_pipelines'] == []
+    assert cloudwatch.put_metric_data.call_count == 2
+    with open(checkpoint_path) as checkpoint_file:
+        assert json.load(checkpoint_file) == {'completed_pipelines': ['foobar', 'foobaz']}
+
+
+def test_run_ensure_metrics_use_the_execution_timestamps(codepipeline, tmp_path, env_variables):
+    cloudwatch = mock.Mock()
+    executions = codepipeline.executions
+
+    Backfill(str(tmp_path / 'checkpoint.json'), max_workers=1, codepipeline=codepipeline, cloudwatch=cloudwatch).run()
+
+    metric_data = cloudwatch.put_metric_data.call_args.kwargs['MetricData']
+    timestamps = {datum['Timestamp'] for datum in metric_data}
+    expected_timestamps = {
+        execution['lastUpdateTime'].replace(microsecond=0, tzinfo=None)
+        for execution in executions if execution['status'] != 'InProgress'
+    }
+    assert timestamps == expected_timestamps
+    assert ('RedTime', 'Seconds') in {(datum['MetricName'], datum['Unit']) for datum in metric_data}
+    assert ('YellowTime', 'Seconds') in {(datum['MetricName'], datum['Unit']) for datum in metric_data}
+
+
+def test_run_ensure_completed_pipelines_are_skipped(codepipeline, tmp_path, env_variables):
+    checkpoint_path = tmp_path / 'checkpoint.json'
+    checkpoint_path.write_text(json.dumps({'completed_pipelines': ['foobar']}))
+
+    report = Backfill(str(checkpoint_path), codepipeline=codepipeline, cloudwatch=mock.Mock()).run()
+
+    assert report['pipelines'] == 1
+
+
+def test_run_ensure_failed_pipeline_is_reported_and_not_checkpointed(codepipeline, tmp_path, env_variables):
+    cloudwatch = mock.Mock()
+    cloudwatch.put_metric_data.side_effect = botocore.exceptions.ClientError({}, 'foo')
+    checkpoint_path = tmp_path / 'checkpoint.json'
+
+    report = Backfill(str(checkpoint_path), codepipeline=codepipeline, cloudwatch=cloudwatch).run()
+
+    assert report['failed_pipelines'] == ['foobar', 'foobaz']
+    assert not checkpoint_path.exists()
+
+
+def test_run_ensure_connection_error_fails_only_its_pipeline(codepipeline, tmp_path, env_variables):
+    paginate = codepipeline.get_paginator('list_pipeline_executions').paginate
+    executions_page = paginate.side_effect
+
+    def failing_paginate(pipelineName):
+        if pipelineName == 'foobaz':
+            raise botocore.exceptions.EndpointConnectionError(endpoint_url='https://codepipeline')
+        return executions_page(pipelineName)
+
+    paginate.side_effect = failing_paginate
+    checkpoint_path = str(tmp_path / 'checkpoint.json')
+
+    report = Backfill(checkpoint_path, codepipeline=codepipeline, cloudwatch=mock.Mock()).run()
+
+    assert report['pipelines'] == 1
+    assert report['failed_pipelines'] == ['foobaz']
+    with open(checkpoint_path) as checkpoint_file:
+        assert json.load(checkpoint_file) == {'completed_pipelines': ['foobar']}
+
+
+def test_run_ensure_numpy_engine_publishes_the_same_metrics(codepipeline, tmp_path, env_variables):
+    pytest.importorskip('numpy')
+    handler_cloudwatch = mock.Mock()
+    numpy_cloudwatch = mock.Mock()
+
+    Backfill(str(tmp_path / 'handler.json'), codepipeline=codepipeline, cloudwatch=handler_cloudwatch).run()
+    Backfill(str(tmp_path / 'numpy.json'), engine='numpy', codepipeline=codepipeline, cloudwatch=numpy_cloudwatch).run()
+
+    def published(cloudwatch):
+        return sorted(
+            (
+                tuple(dimension['Value'] for dimension in datum['Dimensions']),
+                datum['MetricName'],
+                datum['Timestamp'],
+                datum['Value']
+            )
+            for call in cloudwatch.put_metric_data.call_args_list for datum in call.kwargs['MetricData']
+        )
+
+    assert published(numpy_cloudwatch) == published(handler_cloudwatch)
@@ -0,0 +1,123 @@
+import copy
+import datetime
+import json
+from unittest import mock
+
+import botocore
+import pytest
+from batch_event_handler import BatchEventHandler
+
+START_TIME = datetime.datetime(2021, 4, 20, 12, 0, 0, tzinfo=datetime.timezone.utc)
+
+
+def pipeline_executions(count):
+    return {
+        'pipelineExecutionSummaries': [
+            {
+                'pipelineExecutionId': f'execution-{index}',
+                'status': 'Succeeded',
+                'startTime': START_TIME + datetime.timedelta(hours=index),
+                'lastUpdateTime': START_TIME + datetime.timedelta(hours=index, minutes=5)
+            }
+            for index in reversed(range(count))
+        ]
+    }
+
+
+def sqs_record(event, pipeline, execution_id):
+    pipeline_event = copy.deepcopy(event)
+    pipeline_event['detail']['pipeline'] = pipeline
+    pipeline_event['detail']['execution-id'] = execution_id
+
+    return {'messageId': f'{pipeline}-{execution_id}', 'body': json.dumps(pipeline_event)}
+
+
+@pytest.fixture()
+def codepipeline():
+    codepipeline = mock.Mock()
+    codepipeline.get_paginator.return_value.paginate.side_effect = lambda **kwargs: iter([pipeline_executions(3)])
+
+    return codepipeline
+
+
+def test_execute_batch_steps_ensure_history_is_listed_once_per_pipeline(event, codepipeline, env_variables):
+    records = [
+        sqs_record(event, 'foobar', 'execution-1'),
+        sqs_record(event, 'foobaz', 'execution-2'),
+        sqs_record(event, 'foobar', 'execution-2')
+    ]
+    cloudwatch = mock.Mock()
+
+    response = BatchEventHandler(records, codepipeline=codepipeline, cloudwatch=cloudwatch).execute_batch_steps()
+
+    assert response == {'batchItemFailures': []}
+    assert codepipeline.get_paginator.return_value.paginate.call_count == 2
+    assert cloudwatch.put_metric_data.call_count == 1
+    pipelines = {
+        datum['Dimensions'][0]['Value'] for datum in cloudwatch.put_metric_data.call_args.kwargs['MetricData']
+        if datum['Dimensions']
+    }
+    assert pipelines == {'foobar', 'foobaz'}
+
+
+def test_execute_batch_steps_ensure_skipped_events_are_not_failures(event, failing_state_event, codepipeline, env_variables):
+    records = [
+        sqs_record(event, 'baz', 'execution-1'),
+        {'messageId': 'running', 'body': json.dumps(failing_state_event)}
+    ]
+    cloudwatch = mock.Mock()
+
+    response = BatchEventHandler(records, codepipeline=codepipeline, cloudwatch=cloudwatch).execute_batch_steps()
+
+    assert response == {'batchItemFailures': []}
+    assert not cloudwatch.put_metric_data.called
+
+
+def test_execute_batch_steps_ensure_failed_pipeline_is_reported(event, codepipeline, env_variables):
+    def paginate(pipelineName, **kwargs):
+        if pipelineName == 'foobaz':
+            raise botocore.exceptions.ClientError({}, 'foo')
+        return iter([pipeline_executions(3)])
+
+    codepipeline.get_paginator.return_value.paginate.side_effect = paginate
+    records = [
+        sqs_record(event, 'foobar', 'execution-1'),
+        sqs_record(event, 'foobaz', 'execution-1'),
+        {'messageId': 'malformed', 'body': 'foo'}
+    ]
+    cloudwatch = mock.Mock()
+
+    response = BatchEventHandler(records, codepipeline=codepipeline, cloudwatch=cloudwatch).execute_batch_steps()
+
+    assert response == {
+        'batchItemFailures': [{'itemIdentifier': 'malformed'}, {'itemIdentifier': 'foobaz-execution-1'}]
+    }
+    assert cloudwatch.put_metric_data.call_count == 1
+
+
+def test_execute_batch_steps_ensure_flush_failure_fails_every_processed_record(event, codepipeline, env_variables):
+    records = [sqs_record(event, 'foobar', 'execution-1'), sqs_record(event, 'foobaz', 'execution-1')]
+    cloudwatch = mock.Mock()
+    cloudwatch.put_metric_data.side_effect = botocore.exceptions.ClientError({}, 'foo')
+
+    response = BatchEventHandler(records, codepipeline=codepipeline, cloudwatch=cloudwatch).execute_batch_steps()
+
+    assert response == {
+        'batchItemFailures': [{'itemIdentifier': 'foobar-execution-1'}, {'itemIdentifier': 'foobaz-execution-1'}]
+    }
+
+
+def test_execute_batch_steps_ensure_flush_failure_fails_only_unsent_records(event, codepipeline, env_variables):
+    def put_metric_data(Namespace, MetricData):
+        if any(dimension['Value'] == 'foobaz' for datum in MetricData for dimension in datum['Dimensions']):
+            raise botocore.exceptions.ClientError({}, 'foo')
+
+    records = [sqs_record(event, 'foobar', 'execution-1'), sqs_record(event, 'foobaz', 'execution-1')]
+    cloudwatch = mock.Mock()
+    cloudwatch.put_metric_data.side_effect = put_metric_data
+
+    # One request for each data point, so the data points of foobar are sent before the first foobaz request fails
+    with mock.patch('metric_buffer.MAX_METRIC_DATA_PER_REQUEST', 1):
+        response = BatchEventHandler(records, codepipeline=codepipeline, cloudwatch=cloudwatch).execute_batch_steps()
+
+    assert response == {'batchItemFailures': [{'itemIdentifier': 'foobaz-execution-1'}]}
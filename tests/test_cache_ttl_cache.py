@@ -0,0 +1,51 @@
+from cache import TTLCache
+
+
+class FakeTimer():
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_ensure_hits_and_misses_are_counted():
+    cache = TTLCache()
+    cache.set('foo', 'bar')
+
+    assert cache.get('foo') == 'bar'
+    assert cache.get('baz') is None
+    assert cache.statistics() == {'size': 1, 'hits': 1, 'misses': 1, 'evictions': 0, 'invalidations': 0}
+
+
+def test_get_ensure_expired_entries_are_evicted():
+    timer = FakeTimer()
+    cache = TTLCache(ttl=10, timer=timer)
+    cache.set('foo', 'bar')
+    timer.now = 10
+
+    assert cache.get('foo') is None
+    assert cache.statistics()['evictions'] == 1
+    assert cache.statistics()['size'] == 0
+
+
+def test_set_ensure_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2)
+    cache.set('foo', 1)
+    cache.set('bar', 2)
+    cache.get('foo')
+    cache.set('baz', 3)
+
+    assert cache.get('bar') is None
+    assert cache.get('foo') == 1
+    assert cache.get('baz') == 3
+
+
+def test_invalidate_ensure_entry_is_dropped():
+    cache = TTLCache()
+    cache.set('foo', 'bar')
+    cache.invalidate('foo')
+    cache.invalidate('baz')
+
+    assert cache.get('foo') is None
+    assert cache.statistics()['invalidations'] == 1
@@ -0,0 +1,96 @@
+import datetime
+import os
+from unittest import mock
+
+from clients import client_config, get_client
+
+
+@mock.patch('clients.boto3')
+def test_get_client_ensure_client_is_reused(mock_boto):
+    first_client = get_client('cloudwatch')
+    second_client = get_client('cloudwatch')
+
+    assert first_client is second_client
+    assert mock_boto.client.call_count == 1
+
+
+@mock.patch('clients.boto3')
+def test_get_client_ensure_clients_are_created_per_service_and_region(mock_boto):
+    get_client('cloudwatch')
+    get_client('codepipeline')
+    get_client('cloudwatch', region_name='us-west-2')
+
+    assert mock_boto.client.call_count == 3
+
+
+@mock.patch('clients.boto3')
+def test_get_client_ensure_shared_config_is_passed(mock_boto):
+    get_client('cloudwatch')
+
+    config = mock_boto.client.call_args.kwargs['config']
+
+    assert config.max_pool_connections == 10
+    assert config.retries == {'mode': 'standard', 'max_attempts': 3}
+
+
+def test_client_config_ensure_environment_overrides_are_used():
+    with mock.patch.dict(
+        os.environ,
+        {
+            'BOTO_MAX_POOL_CONNECTIONS': '50',
+            'BOTO_CONNECT_TIMEOUT': '1',
+            'BOTO_READ_TIMEOUT': '2',
+            'BOTO_RETRY_MODE': 'adaptive',
+            'BOTO_MAX_ATTEMPTS': '5'
+        }
+    ):
+        config = client_config()
+
+    assert config.max_pool_connections == 50
+    assert config.connect_timeout == 1
+    assert config.read_timeout == 2
+    assert config.retries == {'mode': 'adaptive', 'max_attempts': 5}
+
+
+def assumed_role(expiration):
+    return {
+        'Credentials': {
+            'AccessKeyId': 'foo',
+            'SecretAccessKey': 'bar',
+            'SessionToken': 'baz',
+            'Expiration': expiration
+        }
+    }
+
+
+@mock.patch('clients.boto3')
+def test_get_client_ensure_role_is_assumed_once_for_every_client(mock_boto):
+    role_arn = 'arn:aws:iam::123456789012:role/dashboard'
+    expiration = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=1)
+    mock_boto.client.return_value.assume_role.return_value = assumed_role(expiration)
+
+    first_client = get_client('cloudwatch', region_name='us-west-2', role_arn=role_arn)
+    second_client = get_client('cloudwatch', region_name='us-west-2', role_arn=role_arn)
+    get_client('cloudwatch', region_name='eu-west-1', role_arn=role_arn)
+
+    assert first_client is second_client
+    assert mock_boto.client.return_value.assume_role.call_count == 1
+    mock_boto.Session.assert_called_once_with(
+        aws_access_key_id='foo',
+        aws_secret_access_key='bar',
+        aws_session_token='baz'
+    )
+    assert mock_boto.Session.return_value.client.call_count == 2
+
+
+@mock.patch('clients.boto3')
+def test_get_client_ensure_expiring_role_credentials_are_renewed(mock_boto):
+    role_arn = 'arn:aws:iam::123456789012:role/dashboard'
+    expiration = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(minutes=1)
+    mock_boto.client.return_value.assume_role.return_value = assumed_role(expiration)
+
+    get_client('cloudwatch', region_name='us-west-2', role_arn=role_arn)
+    get_client('cloudwatch', region_name='us-west-2', role_arn=role_arn)
+
+    assert mock_boto.client.return_value.assume_role.call_count == 2
+    assert mock_boto.Session.return_value.client.call_count == 2
@@ -0,0 +1,56 @@
+import json
+import os
+from unittest import mock
+
+import pytest
+from dashboard_body import DashboardBodyBuilder
+from dashboard_generator import DashboardGenerator, dashboard_body_hash
+
+PIPELINES = [[], ['foobar'], ['foobar', 'foo-baz_1.2@3', 'føø']]
+
+
+def legacy_dashboard(generator, source, pipelines):
+    """Builds the same dashboard as a tree of dicts, one widget at a time"""
+    widgets = [generator._generate_fleet_widget(0, generator.period, source)]
+    widgets.extend(
+        generator._generate_widget(y, generator.period, pipeline, source) for y, pipeline in enumerate(pipelines, 1)
+    )
+    widgets.append(generator._generate_widget_descriptions(0, len(pipelines) + 1, 'MTTR', '100% of the time'))
+    return {'widgets': widgets}
+
+
+def built_dashboard(generator, source, pipelines):
+    widget_template = generator._generate_widget_templates()[source]
+    dashboard = DashboardBodyBuilder()
+    dashboard.add_widget(generator._generate_fleet_widget(0, generator.period, source))
+    for y, pipeline in enumerate(pipelines, start=1):
+        dashboard.add_pipeline_widget(widget_template, pipeline, y)
+    dashboard.add_widget(generator._generate_widget_descriptions(0, len(pipelines) + 1, 'MTTR', '100% of the time'))
+    return dashboard.build()
+
+
+@pytest.mark.parametrize('pipelines', PIPELINES)
+def test_dashboard_body_builder_ensure_body_matches_the_serialised_dict(pipelines, env_variables):
+    generator = DashboardGenerator()
+    dashboard = legacy_dashboard(generator, generator.home_source, pipelines)
+
+    body = built_dashboard(generator, generator.home_source, pipelines)
+
+    assert body.body == json.dumps(dashboard)
+    assert body.hash == dashboard_body_hash(dashboard)
+    assert body.widgets == len(pipelines) + 2
+    assert body.metrics == 8 * (len(pipelines) + 1)
+    assert body.size == len(json.dumps(dashboard).encode('utf-8'))
+
+
+@pytest.mark.parametrize('pipelines', PIPELINES)
+def test_dashboard_body_builder_ensure_source_titles_match_the_serialised_dict(pipelines, env_variables):
+    with mock.patch.dict(os.environ, {'DASHBOARD_ROLE_ARNS': 'arn:aws:iam::123456789012:role/dashboard'}):
+        generator = DashboardGenerator()
+    source = generator.sources[-1]
+    dashboard = legacy_dashboard(generator, source, pipelines)
+
+    body = built_dashboard(generator, source, pipelines)
+
+    assert body.body == json.dumps(dashboard)
+    assert body.hash == dashboard_body_hash(dashboard)
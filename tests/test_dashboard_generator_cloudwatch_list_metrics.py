@@ -1,28 +1,107 @@
+import collections
+import tracemalloc
+from typing import Iterator
 from unittest import mock
 
 import botocore
 import pytest
 from dashboard_generator import DashboardGenerator
 
+# ListMetrics page size
+PAGE_SIZE = 500
 
-@mock.patch('dashboard_generator.boto3')
+
+@mock.patch('clients.boto3')
 def test_cloudwatch_list_metrics_ensure_paginator_operation_name_is_called_properly(mock_boto, env_variables):
-    DashboardGenerator()._cloudwatch_list_metrics()
+    list(DashboardGenerator()._cloudwatch_list_metrics())
 
     assert mock_boto.client.return_value.get_paginator.called
     mock_boto.client.return_value.get_paginator.assert_called_with('list_metrics')
 
 
-@mock.patch('dashboard_generator.boto3')
-def test_cloudwatch_list_metrics_ensure_return_value_is_list(_mock_boto, env_variables):
+@mock.patch('clients.boto3')
+def test_cloudwatch_list_metrics_ensure_return_value_is_iterator(_mock_boto, env_variables):
     response = DashboardGenerator()._cloudwatch_list_metrics()
 
-    assert type(response) == list
+    assert isinstance(response, Iterator)
+    assert list(response) == []
 
 
-@mock.patch('dashboard_generator.boto3')
+@mock.patch('clients.boto3')
 def test_cloudwatch_list_metrics_ensure_exception_is_handled(mock_boto, env_variables):
     mock_boto.client.return_value.get_paginator.side_effect = botocore.exceptions.ClientError({}, 'foo')
 
     with pytest.raises(botocore.exceptions.ClientError):
-        DashboardGenerator()._cloudwatch_list_metrics()
+        list(DashboardGenerator()._cloudwatch_list_metrics())
+
+
+def test_cloudwatch_list_metrics_ensure_each_discovery_metric_is_filtered_by_the_server(env_variables):
+    cloudwatch = mock.Mock()
+    cloudwatch.get_paginator.return_value.paginate.side_effect = lambda **kwargs: [
+        {
+            'Metrics': [
+                {
+                    'Namespace': 'Pipeline',
+                    'MetricName': kwargs['MetricName'],
+                    'Dimensions': [{'Name': 'PipelineName', 'Value': 'foobar'}]
+                }
+            ]
+        }
+    ]
+
+    response = list(DashboardGenerator(cloudwatch=cloudwatch)._cloudwatch_list_metrics())
+
+    assert sorted(metric['MetricName'] for metric in response) == ['FailureCount', 'SuccessCount']
+    for call in cloudwatch.get_paginator.return_value.paginate.call_args_list:
+        assert call.kwargs['Dimensions'] == [{'Name': 'PipelineName'}]
+        assert call.kwargs['Namespace'] == 'Pipeline'
+
+
+def metric_pages(pipelines):
+    """Builds each page only when it is requested, like the real paginator"""
+    def paginate(**kwargs):
+        for index in range(0, pipelines, PAGE_SIZE):
+            yield {
+                'Metrics': [
+                    {
+                        'Namespace': 'Pipeline',
+                        'MetricName': kwargs['MetricName'],
+                        'Dimensions': [{'Name': 'PipelineName', 'Value': f'pipeline-{pipeline:05d}'}]
+                    }
+                    for pipeline in range(index, min(index + PAGE_SIZE, pipelines))
+                ]
+            }
+
+    return paginate
+
+
+def traced_peak(function):
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_cloudwatch_list_metrics_ensure_peak_memory_is_bounded_by_the_page_size(env_variables):
+    page_size = traced_peak(lambda: list(next(metric_pages(PAGE_SIZE)(MetricName='SuccessCount'))['Metrics']))
+    cloudwatch = mock.Mock()
+    cloudwatch.get_paginator.return_value.paginate.side_effect = metric_pages(20000)
+    dashboard_generator = DashboardGenerator(cloudwatch=cloudwatch)
+
+    # 80 pages are listed in total, but only the pages queued between the two workers and the reader are ever held
+    peak = traced_peak(lambda: collections.deque(dashboard_generator._cloudwatch_list_metrics(), maxlen=0))
+
+    assert peak < 8 * page_size
+
+
+def test_cloudwatch_list_metrics_ensure_early_stop_releases_the_workers(env_variables):
+    cloudwatch = mock.Mock()
+    cloudwatch.get_paginator.return_value.paginate.side_effect = metric_pages(5000)
+    metrics = DashboardGenerator(cloudwatch=cloudwatch)._cloudwatch_list_metrics()
+
+    next(metrics)
+    metrics.close()
+
+    assert cloudwatch.get_paginator.return_value.paginate.call_count == 2
@@ -4,18 +4,43 @@ from unittest import mock
 
 import botocore
 import pytest
-from dashboard_generator import DashboardGenerator
+from dashboard_generator import DashboardGenerator, dashboard_update_statistics, published_dashboard_hashes
 
+DASHBOARD_NOT_FOUND = botocore.exceptions.ClientError({'Error': {'Code': 'ResourceNotFound'}}, 'GetDashboard')
 
-@mock.patch('dashboard_generator.boto3')
+
+@mock.patch('clients.boto3')
 def test_cloudwatch_put_dashboard_ensure_parameters_are_passed_properly(mock_boto, env_variables):
     dashboard_name = f"Pipelines-{os.environ['AWS_REGION']}"
     dashboard_body = {
         "widgets": [
             {
-                "type": "text",
+                "type": "metric",
                 "x": 0,
                 "y": 0,
+                "width": 21,
+                "height": 3,
+                "properties": {
+                    "view": "singleValue",
+                    "metrics": [
+                        ["Pipeline", "SuccessCount", {"label": "Success Count", "stat": "Sum", "color": "#000000"}],
+                        ["Pipeline", "FailureCount", {"label": "Failed Count", "stat": "Sum", "color": "#808080"}],
+                        ["Pipeline", "SuccessLeadTime", {"label": "Success Lead Time", "stat": "Average", "color": "#2ca02c"}],
+                        ["Pipeline", "DeliveryLeadTime", {"label": "Delivery Lead Time", "stat": "Average", "color": "#212ebd"}],
+                        ["Pipeline", "SuccessCycleTime", {"label": "Cycle Time", "stat": "Average", "color": "#d6721b"}],
+                        ["Pipeline", "YellowTime", {"label": "MTBF", "stat": "Average", "color": "#ffcc33"}],
+                        ["Pipeline", "RedTime", {"label": "MTTR", "stat": "Average", "color": "#d62728"}],
+                        ["Pipeline", "FailureLeadTime", {"label": "Feedback Time", "stat": "Average", "color": "#a02899"}]
+                    ],
+                    "region": "us-east-1",
+                    "title": "Fleet Overview",
+                    "period": 2592000
+                }
+            },
+            {
+                "type": "text",
+                "x": 0,
+                "y": 3,
                 "width": 4,
                 "height": 2,
                 "properties": {
@@ -25,7 +50,7 @@ def test_cloudwatch_put_dashboard_ensure_parameters_are_passed_properly(mock_bot
             {
                 "type": "text",
                 "x": 4,
-                "y": 0,
+                "y": 3,
                 "width": 4,
                 "height": 2,
                 "properties": {
@@ -35,7 +60,7 @@ def test_cloudwatch_put_dashboard_ensure_parameters_are_passed_properly(mock_bot
             {
                 "type": "text",
                 "x": 8,
-                "y": 0,
+                "y": 3,
                 "width": 4,
                 "height": 2,
                 "properties": {
@@ -45,7 +70,7 @@ def test_cloudwatch_put_dashboard_ensure_parameters_are_passed_properly(mock_bot
             {
                 "type": "text",
                 "x": 12,
-                "y": 0,
+                "y": 3,
                 "width": 4,
                 "height": 2,
                 "properties": {
@@ -55,7 +80,7 @@ def test_cloudwatch_put_dashboard_ensure_parameters_are_passed_properly(mock_bot
             {
                 "type": "text",
                 "x": 16,
-                "y": 0,
+                "y": 3,
                 "width": 4,
                 "height": 2,
                 "properties": {
@@ -65,7 +90,7 @@ def test_cloudwatch_put_dashboard_ensure_parameters_are_passed_properly(mock_bot
             {
                 "type": "text",
                 "x": 20,
-                "y": 0,
+                "y": 3,
                 "width": 4,
                 "height": 2,
                 "properties": {
@@ -74,6 +99,7 @@ def test_cloudwatch_put_dashboard_ensure_parameters_are_passed_properly(mock_bot
             }
         ]
     }
+    mock_boto.client.return_value.get_dashboard.side_effect = DASHBOARD_NOT_FOUND
 
     DashboardGenerator().cloudwatch_put_dashboard()
 
@@ -84,15 +110,16 @@ def test_cloudwatch_put_dashboard_ensure_parameters_are_passed_properly(mock_bot
     )
 
 
-@mock.patch('dashboard_generator.boto3')
+@mock.patch('clients.boto3')
 def test_cloudwatch_put_dashboard_ensure_exception_is_handled(mock_boto, env_variables):
+    mock_boto.client.return_value.get_dashboard.side_effect = DASHBOARD_NOT_FOUND
     mock_boto.client.return_value.put_dashboard.side_effect = botocore.exceptions.ClientError({}, 'foo')
 
     with pytest.raises(botocore.exceptions.ClientError):
         DashboardGenerator().cloudwatch_put_dashboard()
 
 
-@mock.patch('dashboard_generator.boto3')
+@mock.patch('clients.boto3')
 @mock.patch('dashboard_generator.DashboardGenerator._get_pipelines')
 @mock.patch('dashboard_generator.DashboardGenerator._generate_widget')
 @mock.patch('dashboard_generator.DashboardGenerator._generate_widget_descriptions')
@@ -104,11 +131,149 @@ def test_cloudwatch_put_dashboard_ensure_methods_are_called(
     env_variables
 ):
     mock_generate_widget_descriptions.return_value = {}
-    mock_generate_widget.return_value = {}
+    mock_generate_widget.return_value = {'properties': {'metrics': []}}
     mock_get_pipelines.return_value = ['foobar']
+    mock_boto.client.return_value.get_dashboard.side_effect = DASHBOARD_NOT_FOUND
     DashboardGenerator().cloudwatch_put_dashboard()
 
     assert mock_boto.client.return_value.put_dashboard.called
     assert mock_get_pipelines.called
     assert mock_generate_widget.called
     assert mock_generate_widget_descriptions.called
+
+
+@mock.patch('dashboard_generator.DashboardGenerator._get_pipelines')
+def test_cloudwatch_put_dashboard_ensure_unchanged_dashboard_is_skipped_in_a_warm_container(
+    mock_get_pipelines,
+    env_variables
+):
+    cloudwatch = mock.Mock()
+    cloudwatch.get_dashboard.side_effect = DASHBOARD_NOT_FOUND
+    cloudwatch.get_paginator.return_value.paginate.return_value = []
+    mock_get_pipelines.return_value = ['foobar']
+
+    DashboardGenerator(cloudwatch=cloudwatch).cloudwatch_put_dashboard()
+    DashboardGenerator(cloudwatch=cloudwatch).cloudwatch_put_dashboard()
+    mock_get_pipelines.return_value = ['foobar', 'baz']
+    DashboardGenerator(cloudwatch=cloudwatch).cloudwatch_put_dashboard()
+
+    assert cloudwatch.get_dashboard.call_count == 1
+    assert cloudwatch.put_dashboard.call_count == 2
+    assert dashboard_update_statistics == {'checks': 3, 'skips': 1}
+
+
+@mock.patch('dashboard_generator.DashboardGenerator._get_pipelines')
+def test_cloudwatch_put_dashboard_ensure_published_dashboard_is_compared_on_a_cold_start(
+    mock_get_pipelines,
+    env_variables
+):
+    first_cloudwatch = mock.Mock()
+    first_cloudwatch.get_dashboard.side_effect = DASHBOARD_NOT_FOUND
+    first_cloudwatch.get_paginator.return_value.paginate.return_value = []
+    mock_get_pipelines.return_value = ['foobar']
+    DashboardGenerator(cloudwatch=first_cloudwatch).cloudwatch_put_dashboard()
+    published_body = json.loads(first_cloudwatch.put_dashboard.call_args.kwargs['DashboardBody'])
+    published_dashboard_hashes.clear()
+
+    cloudwatch = mock.Mock()
+    cloudwatch.get_paginator.return_value.paginate.return_value = []
+    # CloudWatch doesn't return the body byte for byte, so only the canonical form is compared
+    cloudwatch.get_dashboard.return_value = {'DashboardBody': json.dumps(published_body, indent=2, sort_keys=True)}
+    DashboardGenerator(cloudwatch=cloudwatch).cloudwatch_put_dashboard()
+
+    assert not cloudwatch.put_dashboard.called
+
+
+def dashboards_for(pipelines, dashboard_entries=()):
+    cloudwatch = mock.Mock()
+    cloudwatch.get_dashboard.side_effect = DASHBOARD_NOT_FOUND
+    cloudwatch.get_paginator.return_value.paginate.return_value = [
+        {'DashboardEntries': [{'DashboardName': dashboard_name} for dashboard_name in dashboard_entries]}
+    ]
+    with mock.patch('dashboard_generator.DashboardGenerator._get_pipelines', return_value=pipelines):
+        DashboardGenerator(cloudwatch=cloudwatch).cloudwatch_put_dashboard()
+
+    return cloudwatch, {
+        call.kwargs['DashboardName']: json.loads(call.kwargs['DashboardBody'])
+        for call in cloudwatch.put_dashboard.call_args_list
+    }
+
+
+def shard_titles(dashboard):
+    return [widget['properties']['title'] for widget in dashboard['widgets'][1:] if widget['type'] == 'metric']
+
+
+def test_cloudwatch_put_dashboard_ensure_large_fleet_is_sharded(env_variables):
+    pipelines = [f'foo-{index:03d}' for index in range(250)]
+
+    with mock.patch.dict(os.environ, {'DASHBOARD_MAX_PIPELINES': '100'}):
+        cloudwatch, dashboards = dashboards_for(pipelines, ['Pipelines-us-east-1', 'Pipelines-us-east-1-9'])
+
+    assert sorted(dashboards) == [f'Pipelines-us-east-1-{index}' for index in range(1, 4)]
+    shard_pipelines = [shard_titles(dashboards[dashboard_name]) for dashboard_name in sorted(dashboards)]
+    assert all(len(pipelines) <= 100 for pipelines in shard_pipelines)
+    assert all(pipelines == sorted(pipelines) for pipelines in shard_pipelines)
+    assert sorted(sum(shard_pipelines, [])) == pipelines
+    cloudwatch.delete_dashboards.assert_called_once_with(
+        DashboardNames=['Pipelines-us-east-1', 'Pipelines-us-east-1-9']
+    )
+
+
+def test_cloudwatch_put_dashboard_ensure_new_pipeline_changes_one_dashboard(env_variables):
+    pipelines = [f'foo-{index:03d}' for index in range(250)]
+
+    with mock.patch.dict(os.environ, {'DASHBOARD_MAX_PIPELINES': '100', 'DASHBOARD_SHARD_HEADROOM': '1.25'}):
+        _cloudwatch, dashboards = dashboards_for(pipelines)
+        _cloudwatch, new_dashboards = dashboards_for(sorted(pipelines + ['foo-000a']))
+
+    # Three dashboards are needed, with a quarter more room the pipelines are spread across four. The other dashboards
+    # are unchanged, so only the dashboard of the new pipeline is written again
+    assert len(dashboards) == 4
+    assert len(new_dashboards) == 1
+    assert 'foo-000a' in shard_titles(*new_dashboards.values())
+
+
+def test_cloudwatch_put_dashboard_ensure_metric_limit_is_respected(env_variables):
+    pipelines = [f'foo-{index:03d}' for index in range(400)]
+
+    with mock.patch.dict(os.environ, {'DASHBOARD_MAX_PIPELINES': '1000'}):
+        _cloudwatch, dashboards = dashboards_for(pipelines)
+
+    for dashboard in dashboards.values():
+        assert sum(len(widget['properties'].get('metrics', [])) for widget in dashboard['widgets']) <= 2500
+        assert len(json.dumps(dashboard)) <= 1000000
+    assert len(dashboards) == 2
+
+
+def test_cloudwatch_put_dashboard_ensure_single_dashboard_keeps_its_name(env_variables):
+    cloudwatch, dashboards = dashboards_for(['foobar'], ['Pipelines-us-east-1', 'Pipelines-us-east-1-1'])
+
+    assert list(dashboards) == ['Pipelines-us-east-1']
+    cloudwatch.delete_dashboards.assert_called_once_with(DashboardNames=['Pipelines-us-east-1-1'])
+
+
+def test_cloudwatch_put_dashboard_ensure_fleet_overview_is_the_top_row(env_variables):
+    _cloudwatch, dashboards = dashboards_for(['foobar', 'foobaz'])
+
+    widgets = dashboards['Pipelines-us-east-1']['widgets']
+    assert widgets[0]['properties']['title'] == 'Fleet Overview'
+    assert widgets[0]['y'] == 0
+    assert all(len(metric) == 3 for metric in widgets[0]['properties']['metrics'])
+    assert [widget['y'] for widget in widgets[1:3]] == [3, 6]
+
+
+def test_cloudwatch_put_dashboard_ensure_fleet_overview_uses_the_pipeline_group(env_variables):
+    with mock.patch.dict(os.environ, {'PIPELINE_GROUP': 'payments'}):
+        _cloudwatch, dashboards = dashboards_for(['foobar'])
+
+    metrics = dashboards['Pipelines-us-east-1']['widgets'][0]['properties']['metrics']
+    assert metrics[0][:4] == ['Pipeline', 'SuccessCount', 'PipelineGroup', 'payments']
+
+
+def test_cloudwatch_put_dashboard_ensure_fleet_overview_can_be_turned_off(env_variables):
+    with mock.patch.dict(os.environ, {'FLEET_METRICS': 'false'}):
+        _cloudwatch, dashboards = dashboards_for(['foobar'])
+
+    titles = [widget['properties'].get('title') for widget in dashboards['Pipelines-us-east-1']['widgets']]
+    assert 'Fleet Overview' not in titles
+    assert titles[0] == 'foobar'
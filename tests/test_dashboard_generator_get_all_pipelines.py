@@ -0,0 +1,111 @@
+import json
+import os
+from unittest import mock
+
+import botocore
+import pytest
+from fake_services import FakeCloudWatch
+from dashboard_generator import DashboardGenerator
+from dashboard_sources import DashboardSource
+
+ROLE_ARN = 'arn:aws:iam::123456789012:role/dashboard'
+
+
+@pytest.fixture()
+def sources_env_variables(env_variables):
+    with mock.patch.dict(
+        os.environ,
+        {
+            'DASHBOARD_REGIONS': 'us-east-1,eu-west-1',
+            'DASHBOARD_ROLE_ARNS': ROLE_ARN
+        }
+    ):
+        yield
+
+
+@pytest.fixture()
+def source_clients():
+    clients = {
+        ('eu-west-1', None): FakeCloudWatch(['foo-eu'], latency=0.05),
+        ('us-east-1', ROLE_ARN): FakeCloudWatch(['foo-other-us'], latency=0.05),
+        ('eu-west-1', ROLE_ARN): FakeCloudWatch(['foo-other-eu'], latency=0.05)
+    }
+    with mock.patch(
+        'dashboard_generator.get_client',
+        side_effect=lambda _service_name, region_name, role_arn: clients[(region_name, role_arn)]
+    ):
+        yield clients
+
+
+def test_get_all_pipelines_ensure_every_source_is_read(sources_env_variables, source_clients):
+    cloudwatch = FakeCloudWatch(['foo-us'], latency=0.05)
+
+    pipelines = DashboardGenerator(cloudwatch=cloudwatch)._get_all_pipelines()
+
+    assert pipelines == [
+        (DashboardSource('us-east-1'), 'foo-us'),
+        (DashboardSource('eu-west-1'), 'foo-eu'),
+        (DashboardSource('us-east-1', ROLE_ARN), 'foo-other-us'),
+        (DashboardSource('eu-west-1', ROLE_ARN), 'foo-other-eu')
+    ]
+    assert all(client.calls['list_metrics'] == 2 for client in source_clients.values())
+
+
+def test_get_all_pipelines_ensure_failed_source_is_tolerated(sources_env_variables, source_clients):
+    cloudwatch = FakeCloudWatch(['foo-us'], latency=0)
+    DashboardGenerator(cloudwatch=cloudwatch)._get_all_pipelines()
+    source_clients[('eu-west-1', None)].pipeline_names = ['foo-eu', 'foo-eu-2']
+    source_clients[('us-east-1', ROLE_ARN)].list_metrics = mock.Mock(
+        side_effect=botocore.exceptions.ClientError({'Error': {'Code': 'AccessDenied'}}, 'ListMetrics')
+    )
+    source_clients[('eu-west-1', ROLE_ARN)].list_metrics = mock.Mock(
+        side_effect=botocore.exceptions.EndpointConnectionError(endpoint_url='https://monitoring.eu-west-1')
+    )
+
+    pipelines = DashboardGenerator(cloudwatch=cloudwatch)._get_all_pipelines()
+
+    # The sources that can't be read keep the pipelines read by the previous run
+    assert [pipeline for _source, pipeline in pipelines] == [
+        'foo-us', 'foo-eu', 'foo-eu-2', 'foo-other-us', 'foo-other-eu'
+    ]
+
+
+def test_get_all_pipelines_ensure_source_never_read_is_left_off(sources_env_variables, source_clients):
+    source_clients[('us-east-1', ROLE_ARN)].list_metrics = mock.Mock(
+        side_effect=botocore.exceptions.ClientError({'Error': {'Code': 'AccessDenied'}}, 'ListMetrics')
+    )
+
+    pipelines = DashboardGenerator(cloudwatch=FakeCloudWatch(['foo-us'], latency=0))._get_all_pipelines()
+
+    assert [pipeline for _source, pipeline in pipelines] == ['foo-us', 'foo-eu', 'foo-other-eu']
+
+
+def test_get_all_pipelines_ensure_error_is_raised_when_no_source_can_be_read(sources_env_variables, source_clients):
+    error = botocore.exceptions.ClientError({'Error': {'Code': 'Throttling'}}, 'ListMetrics')
+    cloudwatch = FakeCloudWatch(latency=0)
+    for client in [cloudwatch, *source_clients.values()]:
+        client.list_metrics = mock.Mock(side_effect=error)
+
+    with pytest.raises(botocore.exceptions.ClientError):
+        DashboardGenerator(cloudwatch=cloudwatch)._get_all_pipelines()
+
+
+def test_cloudwatch_put_dashboard_ensure_sources_share_one_dashboard(sources_env_variables, source_clients):
+    cloudwatch = FakeCloudWatch(['foo-us'], latency=0)
+
+    DashboardGenerator(cloudwatch=cloudwatch).cloudwatch_put_dashboard()
+
+    assert list(cloudwatch.dashboards) == ['Pipelines-us-east-1']
+    widgets = json.loads(cloudwatch.dashboards['Pipelines-us-east-1'])['widgets']
+    pipeline_widgets = [widget['properties'] for widget in widgets[4:8]]
+    assert [(widget['title'], widget['region']) for widget in pipeline_widgets] == [
+        ('foo-us (us-east-1)', 'us-east-1'),
+        ('foo-eu (eu-west-1)', 'eu-west-1'),
+        ('foo-other-us (123456789012 us-east-1)', 'us-east-1'),
+        ('foo-other-eu (123456789012 eu-west-1)', 'eu-west-1')
+    ]
+    assert [widget['properties']['region'] for widget in widgets[:4]] == [
+        'us-east-1', 'eu-west-1', 'us-east-1', 'eu-west-1'
+    ]
+    assert all(metric[-1]['accountId'] == '123456789012' for metric in pipeline_widgets[2]['metrics'])
+    assert all('accountId' not in metric[-1] for metric in pipeline_widgets[0]['metrics'])
@@ -1,8 +1,10 @@
+import os
 from unittest import mock
 
 import botocore
 import pytest
 from dashboard_generator import DashboardGenerator
+from pipeline_registry import SQLitePipelineRegistry
 
 
 @mock.patch('dashboard_generator.DashboardGenerator._cloudwatch_list_metrics')
@@ -127,3 +129,60 @@ def test_get_pipelines_ensure_return_value_is_list(mock_cloudwatch_list_metrics,
 
     assert mock_cloudwatch_list_metrics.called
     assert type(response) == list
+
+
+@mock.patch('dashboard_generator.time.time', return_value=10 * 24 * 60 * 60)
+@mock.patch('dashboard_generator.DashboardGenerator._cloudwatch_list_metrics')
+def test_get_pipelines_ensure_registry_is_read_with_the_retention(
+    mock_cloudwatch_list_metrics,
+    _mock_time,
+    env_variables
+):
+    pipeline_registry = SQLitePipelineRegistry()
+    pipeline_registry.record_pipeline('foobar', 9 * 24 * 60 * 60 * 1000)
+    pipeline_registry.record_pipeline('baz', 1 * 24 * 60 * 60 * 1000)
+
+    with mock.patch.dict(os.environ, {'PIPELINE_RETENTION_DAYS': '7'}):
+        response = DashboardGenerator(cloudwatch=mock.Mock(), pipeline_registry=pipeline_registry)._get_pipelines()
+
+    assert response == ['foobar']
+    assert not mock_cloudwatch_list_metrics.called
+
+
+@mock.patch('dashboard_generator.time.time', return_value=10 * 24 * 60 * 60)
+@mock.patch('dashboard_generator.DashboardGenerator._cloudwatch_list_metrics')
+def test_get_pipelines_ensure_empty_registry_is_seeded_from_the_metrics(
+    mock_cloudwatch_list_metrics,
+    _mock_time,
+    env_variables
+):
+    mock_cloudwatch_list_metrics.return_value = [
+        {'Namespace': 'Pipeline', 'MetricName': 'SuccessCount', 'Dimensions': [{'Name': 'PipelineName', 'Value': name}]}
+        for name in ['foobar', 'baz']
+    ]
+    pipeline_registry = SQLitePipelineRegistry()
+
+    response = DashboardGenerator(cloudwatch=mock.Mock(), pipeline_registry=pipeline_registry)._get_pipelines()
+
+    assert response == ['baz', 'foobar']
+    assert pipeline_registry.list_pipelines(0) == ['baz', 'foobar']
+    assert pipeline_registry.first_seen() == 10 * 24 * 60 * 60 * 1000
+
+
+@mock.patch('dashboard_generator.time.time', return_value=10 * 24 * 60 * 60)
+@mock.patch('dashboard_generator.DashboardGenerator._cloudwatch_list_metrics')
+def test_get_pipelines_ensure_new_registry_is_merged_with_the_metrics(
+    mock_cloudwatch_list_metrics,
+    _mock_time,
+    env_variables
+):
+    mock_cloudwatch_list_metrics.return_value = [
+        {'Namespace': 'Pipeline', 'MetricName': 'SuccessCount', 'Dimensions': [{'Name': 'PipelineName', 'Value': 'baz'}]}
+    ]
+    pipeline_registry = SQLitePipelineRegistry()
+    pipeline_registry.record_pipeline('foobar', 10 * 24 * 60 * 60 * 1000 - 60 * 1000)
+
+    response = DashboardGenerator(cloudwatch=mock.Mock(), pipeline_registry=pipeline_registry)._get_pipelines()
+
+    assert response == ['baz', 'foobar']
+    assert mock_cloudwatch_list_metrics.called
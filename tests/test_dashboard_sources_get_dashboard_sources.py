@@ -0,0 +1,26 @@
+import os
+from unittest import mock
+
+from dashboard_sources import DashboardSource, get_dashboard_sources
+
+
+def test_get_dashboard_sources_ensure_region_of_the_generator_is_the_default():
+    with mock.patch.dict(os.environ, {'DASHBOARD_REGIONS': '', 'DASHBOARD_ROLE_ARNS': ''}):
+        assert get_dashboard_sources('us-east-1') == [DashboardSource('us-east-1')]
+
+
+def test_get_dashboard_sources_ensure_every_region_of_every_account_is_listed():
+    role_arn = 'arn:aws:iam::123456789012:role/dashboard'
+    with mock.patch.dict(os.environ, {'DASHBOARD_REGIONS': 'us-east-1, eu-west-1', 'DASHBOARD_ROLE_ARNS': role_arn}):
+        sources = get_dashboard_sources('us-east-1')
+
+    assert sources == [
+        DashboardSource('us-east-1'),
+        DashboardSource('eu-west-1'),
+        DashboardSource('us-east-1', role_arn),
+        DashboardSource('eu-west-1', role_arn)
+    ]
+    assert [source.label for source in sources] == [
+        'us-east-1', 'eu-west-1', '123456789012 us-east-1', '123456789012 eu-west-1'
+    ]
+    assert sources[0].account_id is None
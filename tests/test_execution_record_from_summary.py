@@ -0,0 +1,47 @@
+import datetime
+
+import pytest
+from execution_record import ExecutionRecord, ExecutionStatus, parse_execution_summaries
+
+START_TIME = datetime.datetime(2021, 4, 20, 12, 0, 0, 500000, tzinfo=datetime.timezone.utc)
+
+
+def execution_summary(execution_id, status):
+    return {
+        'pipelineExecutionId': execution_id,
+        'status': status,
+        'startTime': START_TIME,
+        'lastUpdateTime': START_TIME + datetime.timedelta(minutes=5),
+        'sourceRevisions': [{'actionName': 'Repo', 'revisionId': 'baz'}],
+        'trigger': {'triggerType': 'StartPipelineExecution'}
+    }
+
+
+def test_from_summary_ensure_record_holds_epoch_milliseconds():
+    record = ExecutionRecord.from_summary(execution_summary('foo', 'Succeeded'))
+
+    assert record == ExecutionRecord('foo', ExecutionStatus.SUCCEEDED, 1618920000500, 1618920300500)
+    assert record.status.codepipeline_status == 'Succeeded'
+
+
+def test_from_summary_ensure_record_is_immutable():
+    record = ExecutionRecord.from_summary(execution_summary('foo', 'Failed'))
+
+    with pytest.raises(AttributeError):
+        record.status = ExecutionStatus.SUCCEEDED
+    assert not hasattr(record, '__dict__')
+
+
+@pytest.mark.parametrize('status', ['InProgress', 'Stopped', 'Stopping', 'Superseded'])
+def test_from_summary_ensure_non_final_execution_is_skipped(status):
+    assert ExecutionRecord.from_summary(execution_summary('foo', status)) is None
+
+
+def test_parse_execution_summaries_ensure_order_is_kept():
+    summaries = [
+        execution_summary('foo', 'Succeeded'),
+        execution_summary('bar', 'InProgress'),
+        execution_summary('baz', 'Failed')
+    ]
+
+    assert [record.execution_id for record in parse_execution_summaries(summaries)] == ['foo', 'baz']
@@ -0,0 +1,77 @@
+from unittest import mock
+
+import botocore
+import pytest
+from execution_record import ExecutionRecord, ExecutionStatus
+from execution_store import MAX_BATCH_WRITE_ITEMS, DynamoDBExecutionStore
+
+START_TIME = 1618920000000
+HOUR = 3600000
+
+
+def execution(index, status):
+    return ExecutionRecord(f'execution-{index}', status, START_TIME + index * HOUR, START_TIME + index * HOUR + 300000)
+
+
+def test_upsert_executions_ensure_items_are_written_in_batches():
+    dynamodb = mock.Mock()
+    dynamodb.batch_write_item.return_value = {'UnprocessedItems': {}}
+    executions = [execution(index, ExecutionStatus.SUCCEEDED) for index in range(MAX_BATCH_WRITE_ITEMS + 1)]
+
+    DynamoDBExecutionStore('executions', dynamodb=dynamodb).upsert_executions('foobar', executions)
+
+    assert dynamodb.batch_write_item.call_count == 2
+    item = dynamodb.batch_write_item.call_args_list[0].kwargs['RequestItems']['executions'][0]['PutRequest']['Item']
+    assert item['PipelineName'] == {'S': 'foobar'}
+    assert item['PipelineStatus'] == {'S': 'foobar#Succeeded'}
+
+
+def test_upsert_executions_ensure_unprocessed_items_are_retried():
+    dynamodb = mock.Mock()
+    dynamodb.batch_write_item.side_effect = [{'UnprocessedItems': {'executions': ['foo']}}, {'UnprocessedItems': {}}]
+
+    DynamoDBExecutionStore('executions', dynamodb=dynamodb).upsert_executions('foobar', [execution(0, ExecutionStatus.FAILED)])
+
+    assert dynamodb.batch_write_item.call_count == 2
+    dynamodb.batch_write_item.assert_called_with(RequestItems={'executions': ['foo']})
+
+
+def test_get_execution_ensure_item_is_converted():
+    dynamodb = mock.Mock()
+    execution_store = DynamoDBExecutionStore('executions', dynamodb=dynamodb)
+    dynamodb.get_item.return_value = {'Item': execution_store._to_item('foobar', execution(1, ExecutionStatus.FAILED))}
+
+    assert execution_store.get_execution('foobar', 'execution-1') == execution(1, ExecutionStatus.FAILED)
+
+
+def test_get_prior_execution_ensure_status_index_is_queried():
+    dynamodb = mock.Mock()
+    dynamodb.query.return_value = {'Items': []}
+
+    response = DynamoDBExecutionStore('executions', dynamodb=dynamodb).get_prior_execution(
+        'foobar', ExecutionStatus.SUCCEEDED, START_TIME
+    )
+
+    assert response is None
+    assert dynamodb.query.call_args.kwargs['IndexName'] == 'StatusIndex'
+    assert dynamodb.query.call_args.kwargs['ScanIndexForward'] is False
+    assert dynamodb.query.call_args.kwargs['Limit'] == 1
+
+
+def test_get_first_execution_ensure_empty_window_is_not_queried():
+    dynamodb = mock.Mock()
+
+    response = DynamoDBExecutionStore('executions', dynamodb=dynamodb).get_first_execution(
+        'foobar', ExecutionStatus.FAILED, START_TIME, START_TIME
+    )
+
+    assert response is None
+    assert not dynamodb.query.called
+
+
+def test_get_latest_execution_ensure_exception_is_handled():
+    dynamodb = mock.Mock()
+    dynamodb.query.side_effect = botocore.exceptions.ClientError({}, 'foo')
+
+    with pytest.raises(botocore.exceptions.ClientError):
+        DynamoDBExecutionStore('executions', dynamodb=dynamodb).get_latest_execution('foobar')
@@ -0,0 +1,28 @@
+import os
+from unittest import mock
+
+from execution_store import DynamoDBExecutionStore, SQLiteExecutionStore, get_execution_store
+
+
+@mock.patch('execution_store._execution_store.instance', None)
+def test_get_execution_store_ensure_none_without_configuration():
+    assert get_execution_store() is None
+
+
+@mock.patch('execution_store._execution_store.instance', None)
+def test_get_execution_store_ensure_sqlite_store_is_shared():
+    with mock.patch.dict(os.environ, {'EXECUTION_STORE': 'sqlite', 'EXECUTION_STORE_PATH': ':memory:'}):
+        execution_store = get_execution_store()
+
+        assert isinstance(execution_store, SQLiteExecutionStore)
+        assert get_execution_store() is execution_store
+
+
+@mock.patch('execution_store._execution_store.instance', None)
+@mock.patch('clients.boto3')
+def test_get_execution_store_ensure_dynamodb_store_is_created(_mock_boto):
+    with mock.patch.dict(os.environ, {'EXECUTION_STORE': 'dynamodb', 'EXECUTION_STORE_TABLE': 'executions'}):
+        execution_store = get_execution_store()
+
+    assert isinstance(execution_store, DynamoDBExecutionStore)
+    assert execution_store.table_name == 'executions'
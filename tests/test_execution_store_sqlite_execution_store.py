@@ -0,0 +1,69 @@
+import pytest
+from execution_record import ExecutionRecord, ExecutionStatus
+from execution_store import SQLiteExecutionStore
+
+START_TIME = 1618920000000
+HOUR = 3600000
+
+
+def execution(index, status):
+    return ExecutionRecord(f'execution-{index}', status, START_TIME + index * HOUR, START_TIME + index * HOUR + 300000)
+
+
+@pytest.fixture()
+def execution_store():
+    execution_store = SQLiteExecutionStore()
+    execution_store.upsert_executions(
+        'foobar',
+        [
+            execution(0, ExecutionStatus.SUCCEEDED),
+            execution(1, ExecutionStatus.FAILED),
+            execution(2, ExecutionStatus.FAILED),
+            execution(3, ExecutionStatus.SUCCEEDED),
+            execution(4, ExecutionStatus.FAILED)
+        ]
+    )
+    execution_store.upsert_executions('baz', [execution(10, ExecutionStatus.SUCCEEDED)])
+
+    return execution_store
+
+
+def test_get_execution_ensure_stored_execution_is_returned(execution_store):
+    response = execution_store.get_execution('foobar', 'execution-1')
+
+    assert response == execution(1, ExecutionStatus.FAILED)
+
+
+def test_get_execution_ensure_none_is_returned_for_unknown_execution(execution_store):
+    assert execution_store.get_execution('foobar', 'execution-10') is None
+
+
+def test_upsert_executions_ensure_existing_execution_is_replaced(execution_store):
+    execution_store.upsert_executions('foobar', [execution(4, ExecutionStatus.SUCCEEDED)])
+
+    assert execution_store.get_execution('foobar', 'execution-4').status == ExecutionStatus.SUCCEEDED
+
+
+def test_get_latest_execution_ensure_latest_execution_of_the_pipeline_is_returned(execution_store):
+    assert execution_store.get_latest_execution('foobar').execution_id == 'execution-4'
+    assert execution_store.get_latest_execution('unknown') is None
+
+
+def test_get_prior_execution_ensure_latest_matching_status_before_the_time_is_returned(execution_store):
+    response = execution_store.get_prior_execution('foobar', ExecutionStatus.FAILED, execution(4, ExecutionStatus.FAILED).start_time)
+
+    assert response.execution_id == 'execution-2'
+
+
+def test_get_first_execution_ensure_earliest_matching_status_within_the_window_is_returned(execution_store):
+    response = execution_store.get_first_execution(
+        'foobar', ExecutionStatus.FAILED, execution(0, ExecutionStatus.SUCCEEDED).start_time, execution(3, ExecutionStatus.SUCCEEDED).start_time
+    )
+
+    assert response.execution_id == 'execution-1'
+
+
+def test_get_first_execution_ensure_missing_lower_bound_is_unbounded(execution_store):
+    response = execution_store.get_first_execution('foobar', ExecutionStatus.SUCCEEDED, None, execution(4, ExecutionStatus.FAILED).start_time)
+
+    assert response.execution_id == 'execution-0'
@@ -0,0 +1,107 @@
+import io
+import json
+
+import boto3
+import botocore
+import pytest
+from botocore.stub import Stubber
+from instrumentation import Instrumentation
+
+
+@pytest.fixture()
+def cloudwatch():
+    return boto3.client(
+        'cloudwatch', region_name='us-east-1', aws_access_key_id='foo', aws_secret_access_key='bar'
+    )
+
+
+def test_instrumentation_ensure_operations_and_retries_are_counted(cloudwatch):
+    instrumentation = Instrumentation('Test', mode='log')
+    instrumentation.attach(cloudwatch)
+
+    with Stubber(cloudwatch) as stubber:
+        stubber.add_response('put_metric_data', {'ResponseMetadata': {'RetryAttempts': 2}})
+        stubber.add_response('put_metric_data', {})
+        stubber.add_client_error('list_dashboards', service_error_code='Throttling', http_status_code=400)
+        cloudwatch.put_metric_data(Namespace='Pipeline', MetricData=[])
+        cloudwatch.put_metric_data(Namespace='Pipeline', MetricData=[])
+        with pytest.raises(botocore.exceptions.ClientError):
+            cloudwatch.list_dashboards()
+
+    summary = instrumentation.emit()
+
+    assert summary['api_calls'] == 3
+    assert summary['retries'] == 2
+    assert summary['operations']['cloudwatch.PutMetricData']['calls'] == 2
+    assert summary['operations']['cloudwatch.PutMetricData']['retries'] == 2
+    assert summary['operations']['cloudwatch.PutMetricData']['errors'] == 0
+    assert summary['operations']['cloudwatch.ListDashboards']['errors'] == 1
+
+
+def test_instrumentation_ensure_phases_are_timed():
+    instrumentation = Instrumentation('Test', mode='log')
+
+    with instrumentation.phase('Process'):
+        pass
+    with instrumentation.phase('Process'):
+        pass
+    with instrumentation.phase('Flush'):
+        pass
+
+    summary = instrumentation.emit()
+
+    assert list(summary['phases_ms']) == ['Process', 'Flush']
+    assert summary['duration_ms'] >= summary['phases_ms']['Process']
+
+
+def test_instrumentation_ensure_hooks_are_registered_once(cloudwatch):
+    Instrumentation('Previous', mode='log').attach(cloudwatch)
+    instrumentation = Instrumentation('Test', mode='log')
+    instrumentation.attach(cloudwatch)
+
+    with Stubber(cloudwatch) as stubber:
+        stubber.add_response('put_metric_data', {})
+        cloudwatch.put_metric_data(Namespace='Pipeline', MetricData=[])
+
+    assert instrumentation.emit()['api_calls'] == 1
+
+
+def test_instrumentation_ensure_calls_after_emit_are_not_counted(cloudwatch):
+    instrumentation = Instrumentation('Test', mode='log')
+    instrumentation.attach(cloudwatch)
+    instrumentation.emit()
+
+    with Stubber(cloudwatch) as stubber:
+        stubber.add_response('put_metric_data', {})
+        cloudwatch.put_metric_data(Namespace='Pipeline', MetricData=[])
+
+    assert instrumentation.summary()['api_calls'] == 0
+
+
+def test_instrumentation_ensure_emf_summary_is_written():
+    stream = io.StringIO()
+    instrumentation = Instrumentation('Test', mode='emf', stream=stream)
+
+    with instrumentation.phase('Flush'):
+        pass
+    instrumentation.emit()
+    document = json.loads(stream.getvalue())
+
+    assert document['Name'] == 'Test'
+    assert document['_aws']['CloudWatchMetrics'][0]['Namespace'] == 'Pipeline/Instrumentation'
+    assert [metric['Name'] for metric in document['_aws']['CloudWatchMetrics'][0]['Metrics']] == [
+        'Duration', 'ApiCalls', 'Retries', 'FlushDuration'
+    ]
+    assert document['ApiCalls'] == 0
+
+
+def test_instrumentation_ensure_disabled_by_default(cloudwatch, monkeypatch):
+    monkeypatch.delenv('INSTRUMENTATION', raising=False)
+    instrumentation = Instrumentation('Test')
+    instrumentation.attach(cloudwatch)
+
+    with instrumentation.phase('Flush'):
+        pass
+
+    assert instrumentation.emit() is None
+    assert instrumentation.phases == {}
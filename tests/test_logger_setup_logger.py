@@ -0,0 +1,44 @@
+import io
+import json
+import os
+from unittest import mock
+
+from logger import Logger
+
+
+def test_setup_logger_ensure_calling_function_is_included():
+    logger = Logger(logger_name='TextLoggerTest', level='INFO').setup_logger()
+    logger.handlers[0].stream = io.StringIO()
+
+    def calling_function():
+        logger.info("foo %s", 'bar')
+
+    calling_function()
+
+    assert ' - calling_function - foo bar' in logger.handlers[0].stream.getvalue()
+
+
+def test_setup_logger_ensure_json_output_is_structured():
+    with mock.patch.dict(os.environ, {'LOG_FORMAT': 'json'}):
+        logger = Logger(logger_name='JsonLoggerTest', level='INFO').setup_logger()
+    logger.handlers[0].stream = io.StringIO()
+
+    def calling_function():
+        logger.info("foo %s", 'bar', extra={'pipeline': 'foobar'})
+
+    calling_function()
+    log_record = json.loads(logger.handlers[0].stream.getvalue())
+
+    assert log_record['function'] == 'calling_function'
+    assert log_record['message'] == 'foo bar'
+    assert log_record['level'] == 'INFO'
+    assert log_record['pipeline'] == 'foobar'
+
+
+def test_setup_logger_ensure_debug_arguments_are_not_formatted_at_info_level():
+    logger = Logger(logger_name='LazyLoggerTest', level='INFO').setup_logger()
+    argument = mock.MagicMock()
+
+    logger.debug("response: %s", argument)
+
+    assert not argument.__str__.called
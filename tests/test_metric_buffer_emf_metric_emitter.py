@@ -0,0 +1,121 @@
+import datetime
+import io
+import json
+
+from metric_buffer import MAX_METRICS_PER_EMF_DOCUMENT, EMFMetricEmitter
+
+
+def metric_datum(metric_name='SuccessCount', value=1, pipeline='foobar', unit='Count', second=59):
+    return {
+        'MetricName': metric_name,
+        'Dimensions': [
+            {
+                'Name': 'PipelineName',
+                'Value': pipeline
+            }
+        ],
+        'Timestamp': datetime.datetime(2021, 4, 26, 15, 11, second),
+        'Unit': unit,
+        'Value': value
+    }
+
+
+def read_documents(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_emf_metric_emitter_ensure_event_is_one_document():
+    stream = io.StringIO()
+    emitter = EMFMetricEmitter(stream=stream)
+    emitter.add(metric_datum('SuccessCount', 1))
+    emitter.add(metric_datum('SuccessLeadTime', 300, unit='Seconds'))
+
+    response = emitter.flush()
+    documents = read_documents(stream)
+
+    assert response == 1
+    assert documents == [
+        {
+            '_aws': {
+                'Timestamp': 1619449919000,
+                'CloudWatchMetrics': [
+                    {
+                        'Namespace': 'Pipeline',
+                        'Dimensions': [['PipelineName']],
+                        'Metrics': [
+                            {'Name': 'SuccessCount', 'Unit': 'Count'},
+                            {'Name': 'SuccessLeadTime', 'Unit': 'Seconds'}
+                        ]
+                    }
+                ]
+            },
+            'PipelineName': 'foobar',
+            'SuccessCount': 1,
+            'SuccessLeadTime': 300
+        }
+    ]
+    assert emitter.metric_data == []
+
+
+def test_emf_metric_emitter_ensure_documents_per_pipeline_and_timestamp():
+    stream = io.StringIO()
+    emitter = EMFMetricEmitter(stream=stream)
+    emitter.add(metric_datum(pipeline='foo'))
+    emitter.add(metric_datum(pipeline='bar'))
+    emitter.add(metric_datum(pipeline='foo', second=58))
+
+    response = emitter.flush()
+    documents = read_documents(stream)
+
+    assert response == 3
+    assert [(document['PipelineName'], document['_aws']['Timestamp']) for document in documents] == [
+        ('foo', 1619449919000), ('bar', 1619449919000), ('foo', 1619449918000)
+    ]
+
+
+def test_emf_metric_emitter_ensure_repeated_metric_is_an_array():
+    stream = io.StringIO()
+    emitter = EMFMetricEmitter(stream=stream)
+    emitter.add(metric_datum('SuccessCount', 1))
+    emitter.add(metric_datum('SuccessCount', 1))
+
+    emitter.flush()
+    documents = read_documents(stream)
+
+    assert len(documents) == 1
+    assert documents[0]['SuccessCount'] == [1, 1]
+    assert documents[0]['_aws']['CloudWatchMetrics'][0]['Metrics'] == [{'Name': 'SuccessCount', 'Unit': 'Count'}]
+
+
+def test_emf_metric_emitter_ensure_metric_limit_is_respected():
+    stream = io.StringIO()
+    emitter = EMFMetricEmitter(stream=stream)
+    for index in range(MAX_METRICS_PER_EMF_DOCUMENT + 1):
+        emitter.add(metric_datum(f'Metric{index}'))
+
+    response = emitter.flush()
+    documents = read_documents(stream)
+
+    assert response == 2
+    assert len(documents[0]['_aws']['CloudWatchMetrics'][0]['Metrics']) == MAX_METRICS_PER_EMF_DOCUMENT
+    assert len(documents[1]['_aws']['CloudWatchMetrics'][0]['Metrics']) == 1
+
+
+def test_emf_metric_emitter_ensure_nothing_is_written_when_buffer_is_empty():
+    stream = io.StringIO()
+    emitter = EMFMetricEmitter(stream=stream)
+
+    response = emitter.flush()
+
+    assert response == 0
+    assert stream.getvalue() == ''
+
+
+def test_emf_metric_emitter_ensure_stdout_is_used_by_default(capsys):
+    emitter = EMFMetricEmitter()
+    emitter.add(metric_datum())
+
+    emitter.flush()
+    documents = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+    assert documents[0]['SuccessCount'] == 1
@@ -0,0 +1,96 @@
+import datetime
+from unittest import mock
+
+import botocore
+import pytest
+from metric_buffer import MAX_METRIC_DATA_PER_REQUEST, MetricBuffer
+
+
+def metric_datum(metric_name='SuccessCount', value=1, pipeline='foobar'):
+    return {
+        'MetricName': metric_name,
+        'Dimensions': [
+            {
+                'Name': 'PipelineName',
+                'Value': pipeline
+            }
+        ],
+        'Timestamp': datetime.datetime(2021, 4, 26, 15, 11, 59),
+        'Unit': 'Count',
+        'Value': value
+    }
+
+
+def test_flush_ensure_single_request_for_an_event():
+    cloudwatch = mock.Mock()
+    metric_buffer = MetricBuffer(cloudwatch)
+    for metric_name in ['SuccessCount', 'RedTime', 'SuccessCycleTime', 'SuccessLeadTime', 'DeliveryLeadTime']:
+        metric_buffer.add(metric_datum(metric_name))
+
+    response = metric_buffer.flush()
+
+    assert response == 1
+    assert cloudwatch.put_metric_data.call_count == 1
+    assert len(cloudwatch.put_metric_data.call_args.kwargs['MetricData']) == 5
+    assert cloudwatch.put_metric_data.call_args.kwargs['Namespace'] == 'Pipeline'
+    assert metric_buffer.metric_data == []
+
+
+def test_flush_ensure_no_request_when_buffer_is_empty():
+    cloudwatch = mock.Mock()
+
+    response = MetricBuffer(cloudwatch).flush()
+
+    assert response == 0
+    assert not cloudwatch.put_metric_data.called
+
+
+def test_flush_ensure_data_points_are_chunked_at_the_request_limit():
+    cloudwatch = mock.Mock()
+    metric_buffer = MetricBuffer(cloudwatch)
+    for _ in range(MAX_METRIC_DATA_PER_REQUEST + 1):
+        metric_buffer.add(metric_datum())
+
+    response = metric_buffer.flush()
+
+    assert response == 2
+    assert cloudwatch.put_metric_data.call_count == 2
+    assert len(cloudwatch.put_metric_data.call_args_list[0].kwargs['MetricData']) == MAX_METRIC_DATA_PER_REQUEST
+    assert len(cloudwatch.put_metric_data.call_args_list[1].kwargs['MetricData']) == 1
+
+
+@mock.patch('metric_buffer.MAX_REQUEST_SIZE_BYTES', 500)
+def test_flush_ensure_data_points_are_chunked_at_the_size_limit():
+    cloudwatch = mock.Mock()
+    metric_buffer = MetricBuffer(cloudwatch)
+    for _ in range(4):
+        metric_buffer.add(metric_datum())
+
+    response = metric_buffer.flush()
+
+    assert response == 2
+    assert cloudwatch.put_metric_data.call_count == 2
+
+
+def test_flush_ensure_exception_is_handled():
+    cloudwatch = mock.Mock()
+    cloudwatch.put_metric_data.side_effect = botocore.exceptions.ClientError({}, 'foo')
+    metric_buffer = MetricBuffer(cloudwatch)
+    metric_buffer.add(metric_datum())
+
+    with pytest.raises(botocore.exceptions.ClientError):
+        metric_buffer.flush()
+
+    assert len(metric_buffer.metric_data) == 1
+
+
+def test_flush_ensure_rate_limiter_is_acquired_per_request():
+    cloudwatch = mock.Mock()
+    rate_limiter = mock.Mock()
+    metric_buffer = MetricBuffer(cloudwatch, rate_limiter=rate_limiter)
+    for _ in range(MAX_METRIC_DATA_PER_REQUEST + 1):
+        metric_buffer.add(metric_datum())
+
+    metric_buffer.flush()
+
+    assert rate_limiter.acquire.call_count == 2
@@ -0,0 +1,21 @@
+import os
+from unittest import mock
+
+from metric_buffer import EMFMetricEmitter, MetricBuffer, get_metric_emitter
+
+
+def test_get_metric_emitter_ensure_put_metric_data_by_default():
+    cloudwatch = mock.Mock()
+    with mock.patch.dict(os.environ, {}, clear=True):
+        emitter = get_metric_emitter(cloudwatch)
+
+    assert isinstance(emitter, MetricBuffer)
+    assert emitter.cloudwatch == cloudwatch
+
+
+def test_get_metric_emitter_ensure_emf_emitter_is_selected():
+    with mock.patch.dict(os.environ, {'METRICS_EMITTER': 'emf'}):
+        emitter = get_metric_emitter(mock.Mock(), namespace='Pipeline')
+
+    assert isinstance(emitter, EMFMetricEmitter)
+    assert emitter.namespace == 'Pipeline'
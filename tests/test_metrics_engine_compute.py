@@ -0,0 +1,100 @@
+import datetime
+import random
+from unittest import mock
+
+import pytest
+from cache import TTLCache
+from execution_record import parse_execution_summaries
+from metric_buffer import MetricBuffer
+from pipeline_event_handler import PipelineEventHandler
+
+np = pytest.importorskip('numpy')
+from metrics_engine import MetricsEngine  # noqa: E402
+
+START_TIME = datetime.datetime(2021, 4, 20, 12, 0, 0, tzinfo=datetime.timezone.utc)
+
+
+def pipeline_executions(count, seed):
+    """Builds a random execution history, most recent first"""
+    generator = random.Random(seed)
+    executions = []
+    start_time = START_TIME
+
+    for index in range(count):
+        start_time += datetime.timedelta(seconds=generator.randint(1, 7200), milliseconds=generator.randint(0, 999))
+        executions.append({
+            'pipelineExecutionId': f'execution-{index}',
+            'status': generator.choice(['Succeeded', 'Succeeded', 'Failed', 'InProgress']),
+            'startTime': start_time,
+            'lastUpdateTime': start_time + datetime.timedelta(
+                seconds=generator.randint(0, 3600), milliseconds=generator.randint(0, 999)
+            )
+        })
+
+    return list(reversed(executions))
+
+
+def handler_metric_data(executions, env_variables):
+    """Runs every execution through the event handler, the same way as the backfill does"""
+    metric_buffer = MetricBuffer(mock.Mock())
+    execution_cache = TTLCache()
+
+    for index, execution in enumerate(executions):
+        execution_cache.set('foobar', {'pages': [executions[index:]], 'next_token': None, 'complete': True})
+        finished = datetime.datetime.fromtimestamp(execution.last_update_time / 1000, tz=datetime.timezone.utc)
+        event = {
+            'time': finished.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'detail': {
+                'pipeline': 'foobar',
+                'execution-id': execution.execution_id,
+                'state': execution.status.name
+            }
+        }
+        PipelineEventHandler(
+            event,
+            codepipeline=mock.Mock(),
+            cloudwatch=mock.Mock(),
+            execution_cache=execution_cache,
+            metric_buffer=metric_buffer
+        ).process_event()
+
+    # The engine computes the per pipeline data points only, the fleet twins are added when they are published
+    return [datum for datum in metric_buffer.metric_data if datum['Dimensions']]
+
+
+def summarise(metric_data):
+    return sorted((datum['MetricName'], datum['Timestamp'], datum['Unit'], datum['Value']) for datum in metric_data)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_compute_ensure_results_match_the_event_handler(seed, env_variables):
+    executions = parse_execution_summaries(pipeline_executions(200, seed))
+
+    engine_metric_data = list(MetricsEngine.from_executions(executions).metric_data('foobar'))
+
+    assert summarise(engine_metric_data) == summarise(handler_metric_data(executions, env_variables))
+
+
+def test_compute_ensure_metrics_for_a_red_streak():
+    start_times = np.array([0, 60000, 120000, 180000])
+    last_update_times = start_times + 30000
+    statuses = np.array([1, 0, 0, 1])
+
+    metrics = MetricsEngine(start_times, last_update_times, statuses).compute()
+
+    assert metrics['RedTime'][3] == 120
+    assert metrics['YellowTime'][1] == 60
+    assert np.isnan(metrics['YellowTime'][2])
+    assert metrics['SuccessCycleTime'][3] == 180
+    assert metrics['DeliveryLeadTime'][3] == 150
+    assert metrics['FailureLeadTime'][1] == 30
+    assert np.isnan(metrics['SuccessCycleTime'][0])
+
+
+def test_metric_data_ensure_old_executions_are_skipped():
+    start_times = np.array([0, 86400000])
+    engine = MetricsEngine(start_times, start_times + 1000, np.array([1, 1]))
+
+    metric_data = list(engine.metric_data('foobar', datetime.datetime(1970, 1, 1, 12, tzinfo=datetime.timezone.utc)))
+
+    assert {datum['Timestamp'] for datum in metric_data} == {datetime.datetime(1970, 1, 2, 0, 0, 1)}
@@ -0,0 +1,69 @@
+import os
+from unittest import mock
+
+from pipeline_event_handler import PipelineEventHandler
+
+
+@mock.patch('clients.boto3')
+def test_add_metric_ensure_data_point_is_buffered(mock_boto, event, env_variables):
+    event_handler = PipelineEventHandler(event)
+    event_handler._check_for_allowed_state()
+    event_handler.add_metric('SuccessCount', 'Count', 1)
+
+    assert not mock_boto.client.return_value.put_metric_data.called
+    assert len(event_handler.metric_buffer.metric_data) == 2
+    assert event_handler.metric_buffer.metric_data[0]['MetricName'] == 'SuccessCount'
+    assert event_handler.metric_buffer.metric_data[0]['Dimensions'] == [
+        {
+            'Name': 'PipelineName',
+            'Value': 'foobar'
+        }
+    ]
+    assert event_handler.metric_buffer.metric_data[1]['MetricName'] == 'SuccessCount'
+    assert event_handler.metric_buffer.metric_data[1]['Dimensions'] == []
+
+
+@mock.patch('clients.boto3')
+def test_add_metric_ensure_fleet_data_point_uses_the_pipeline_group(_mock_boto, event, env_variables):
+    with mock.patch.dict(os.environ, {'PIPELINE_GROUP': 'payments'}):
+        event_handler = PipelineEventHandler(event)
+    event_handler._check_for_allowed_state()
+    event_handler.add_metric('SuccessCount', 'Count', 1)
+
+    assert event_handler.metric_buffer.metric_data[1]['Dimensions'] == [
+        {
+            'Name': 'PipelineGroup',
+            'Value': 'payments'
+        }
+    ]
+
+
+@mock.patch('clients.boto3')
+def test_add_metric_ensure_fleet_data_point_can_be_turned_off(_mock_boto, event, env_variables):
+    with mock.patch.dict(os.environ, {'FLEET_METRICS': 'false'}):
+        event_handler = PipelineEventHandler(event)
+    event_handler._check_for_allowed_state()
+    event_handler.add_metric('SuccessCount', 'Count', 1)
+
+    assert len(event_handler.metric_buffer.metric_data) == 1
+
+
+@mock.patch('clients.boto3')
+def test_add_metric_ensure_zero_value_is_skipped(_mock_boto, event, env_variables):
+    event_handler = PipelineEventHandler(event)
+    event_handler._check_for_allowed_state()
+    event_handler.add_metric('RedTime', 'Seconds', 0)
+
+    assert event_handler.metric_buffer.metric_data == []
+
+
+@mock.patch('clients.boto3')
+def test_add_metric_ensure_injected_client_is_used(mock_boto, event, env_variables):
+    cloudwatch = mock.Mock()
+    event_handler = PipelineEventHandler(event, codepipeline=mock.Mock(), cloudwatch=cloudwatch)
+    event_handler._check_for_allowed_state()
+    event_handler.add_metric('SuccessCount', 'Count', 1)
+    event_handler.metric_buffer.flush()
+
+    assert cloudwatch.put_metric_data.called
+    assert not mock_boto.client.called
@@ -0,0 +1,140 @@
+import datetime
+import json
+import os
+from unittest import mock
+
+import pytest
+from dateutil.tz import tzutc
+from pipeline_event_handler import PipelineEventHandler
+
+
+@pytest.fixture()
+def pipeline_executions():
+    executions = {
+        'pipelineExecutionSummaries': [
+            {
+                'pipelineExecutionId': 'a577f902-c777-4b06-859a-378e2f3a8abe',
+                'status': 'Succeeded',
+                'startTime': datetime.datetime(2021, 4, 26, 15, 7, 41, tzinfo=tzutc()),
+                'lastUpdateTime': datetime.datetime(2021, 4, 26, 15, 11, 59, tzinfo=tzutc())
+            },
+            {
+                'pipelineExecutionId': '5edf3cfb-901d-463c-9447-fdfe6b491767',
+                'status': 'Failed',
+                'startTime': datetime.datetime(2021, 4, 25, 15, 2, 53, tzinfo=tzutc()),
+                'lastUpdateTime': datetime.datetime(2021, 4, 25, 15, 3, 45, tzinfo=tzutc())
+            },
+            {
+                'pipelineExecutionId': '48154471-3b8b-4fbf-9304-1458c1d1419c',
+                'status': 'Succeeded',
+                'startTime': datetime.datetime(2021, 4, 24, 15, 22, 59, tzinfo=tzutc()),
+                'lastUpdateTime': datetime.datetime(2021, 4, 24, 15, 26, 34, tzinfo=tzutc())
+            }
+        ]
+    }
+
+    return executions
+
+
+@mock.patch('clients.boto3')
+def test_execute_event_steps_ensure_metrics_are_sent_in_a_single_request(
+    mock_boto,
+    event,
+    pipeline_executions,
+    env_variables
+):
+    mock_boto.client.return_value.get_paginator.return_value.paginate.return_value = [pipeline_executions]
+    PipelineEventHandler(event).execute_event_steps()
+
+    put_metric_data = mock_boto.client.return_value.put_metric_data
+    metric_names = [datum['MetricName'] for datum in put_metric_data.call_args.kwargs['MetricData']]
+
+    assert put_metric_data.call_count == 1
+    # Every data point is sent once for the pipeline and once for the fleet
+    assert sorted(metric_names) == sorted(
+        ['SuccessCount', 'RedTime', 'SuccessCycleTime', 'SuccessLeadTime', 'DeliveryLeadTime'] * 2
+    )
+
+
+def emitted_data_points(metrics_emitter, mock_boto, capsys):
+    """
+    Reads the data points sent by either emitter as (dimension values, metric, unit, value, timestamp) tuples
+    """
+    if metrics_emitter == 'api':
+        return sorted(
+            (
+                tuple(dimension['Value'] for dimension in datum['Dimensions']),
+                datum['MetricName'],
+                datum['Unit'],
+                datum['Value'],
+                datum['Timestamp'].replace(tzinfo=datetime.timezone.utc).timestamp()
+            )
+            for call in mock_boto.client.return_value.put_metric_data.call_args_list
+            for datum in call.kwargs['MetricData']
+        )
+
+    data_points = []
+    for line in capsys.readouterr().out.splitlines():
+        if not line.startswith('{"_aws"'):
+            continue
+        document = json.loads(line)
+        for directive in document['_aws']['CloudWatchMetrics']:
+            assert directive['Namespace'] == 'Pipeline'
+            assert len(directive['Dimensions']) == 1
+            for metric in directive['Metrics']:
+                data_points.append((
+                    tuple(document[dimension] for dimension in directive['Dimensions'][0]),
+                    metric['Name'],
+                    metric['Unit'],
+                    document[metric['Name']],
+                    document['_aws']['Timestamp'] / 1000
+                ))
+    return sorted(data_points)
+
+
+@pytest.mark.parametrize('metrics_emitter', ['api', 'emf'])
+@mock.patch('clients.boto3')
+def test_execute_event_steps_ensure_both_emitters_send_the_same_data_points(
+    mock_boto,
+    metrics_emitter,
+    event,
+    pipeline_executions,
+    env_variables,
+    capsys
+):
+    mock_boto.client.return_value.get_paginator.return_value.paginate.return_value = [pipeline_executions]
+    with mock.patch.dict(os.environ, {'METRICS_EMITTER': metrics_emitter}):
+        PipelineEventHandler(event).execute_event_steps()
+
+    event_time = datetime.datetime(2021, 4, 26, 15, 11, 59, tzinfo=datetime.timezone.utc).timestamp()
+    assert emitted_data_points(metrics_emitter, mock_boto, capsys) == sorted(
+        (dimension_values, metric_name, unit, value, event_time)
+        for dimension_values in [('foobar',), ()]
+        for metric_name, unit, value in [
+            ('DeliveryLeadTime', 'Seconds', 86946),
+            ('RedTime', 'Seconds', 86688),
+            ('SuccessCount', 'Count', 1),
+            ('SuccessCycleTime', 'Seconds', 171925),
+            ('SuccessLeadTime', 'Seconds', 258)
+        ]
+    )
+    assert mock_boto.client.return_value.put_metric_data.called == (metrics_emitter == 'api')
+
+
+@mock.patch('clients.boto3')
+def test_execute_event_steps_ensure_steps_are_timed_when_instrumented(
+    mock_boto,
+    event,
+    pipeline_executions,
+    env_variables,
+    caplog
+):
+    mock_boto.client.return_value.get_paginator.return_value.paginate.return_value = [pipeline_executions]
+    with mock.patch.dict(os.environ, {'INSTRUMENTATION': 'log'}):
+        PipelineEventHandler(event).execute_event_steps()
+
+    summaries = [record.instrumentation for record in caplog.records if hasattr(record, 'instrumentation')]
+
+    assert len(summaries) == 1
+    assert summaries[0]['name'] == 'PipelineEventHandler'
+    assert list(summaries[0]['phases_ms']) == ['CheckEvent', 'RecordPipeline', 'ProcessExecutions', 'AddMetrics', 'Flush']
@@ -1,9 +1,13 @@
+import datetime
 from unittest import mock
 
 import botocore
 import pytest
+from execution_record import parse_execution_summaries
 from pipeline_event_handler import PipelineEventHandler
 
+EDT = datetime.timezone(datetime.timedelta(hours=-4))
+
 
 @pytest.fixture()
 def pipeline_executions():
@@ -12,8 +16,8 @@ def pipeline_executions():
             {
                 'pipelineExecutionId': '48154471-3b8b-4fbf-9304-1458c1d1419c',
                 'status': 'Succeeded',
-                'startTime': '2021-04-26 11:22:59.994000-04:00',
-                'lastUpdateTime': '2021-04-26 11:26:34.695000-04:00',
+                'startTime': datetime.datetime(2021, 4, 26, 11, 22, 59, 994000, tzinfo=EDT),
+                'lastUpdateTime': datetime.datetime(2021, 4, 26, 11, 26, 34, 695000, tzinfo=EDT),
                 'sourceRevisions': [
                     {
                         'actionName': 'Repo',
@@ -30,8 +34,8 @@ def pipeline_executions():
             {
                 'pipelineExecutionId': 'a577f902-c777-4b06-859a-378e2f3a8abe',
                 'status': 'InProgress',
-                'startTime': '2021-04-26 11:07:41.247000-04:00',
-                'lastUpdateTime': '2021-04-26 11:11:59.591000-04:00',
+                'startTime': datetime.datetime(2021, 4, 26, 11, 7, 41, 247000, tzinfo=EDT),
+                'lastUpdateTime': datetime.datetime(2021, 4, 26, 11, 11, 59, 591000, tzinfo=EDT),
                 'sourceRevisions': [
                     {
                         'actionName': 'Repo',
@@ -48,8 +52,8 @@ def pipeline_executions():
             {
                 'pipelineExecutionId': '5edf3cfb-901d-463c-9447-fdfe6b491767',
                 'status': 'Failed',
-                'startTime': '2021-04-25 11:02:53.013000-04:00',
-                'lastUpdateTime': '2021-04-25 11:03:45.440000-04:00',
+                'startTime': datetime.datetime(2021, 4, 25, 11, 2, 53, 13000, tzinfo=EDT),
+                'lastUpdateTime': datetime.datetime(2021, 4, 25, 11, 3, 45, 440000, tzinfo=EDT),
                 'sourceRevisions': [
                     {
                         'actionName': 'Repo',
@@ -76,9 +80,11 @@ def test_filter_pipeline_executions_ensure_return_is_properly_filtered(
     pipeline_executions,
     env_variables
 ):
-    mock_list_pipeline_executions.return_value = pipeline_executions
+    mock_list_pipeline_executions.return_value = iter(
+        [parse_execution_summaries(pipeline_executions['pipelineExecutionSummaries'])]
+    )
 
-    response = PipelineEventHandler(event)._filter_pipeline_executions()
+    response = list(PipelineEventHandler(event)._filter_pipeline_executions())
 
     assert mock_list_pipeline_executions.called
     assert isinstance(response, list)
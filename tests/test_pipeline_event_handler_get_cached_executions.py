@@ -0,0 +1,94 @@
+import datetime
+from unittest import mock
+
+from cache import TTLCache
+from execution_record import ExecutionStatus
+from pipeline_event_handler import PipelineEventHandler
+
+START_TIME = datetime.datetime(2021, 4, 20, 12, 0, 0, tzinfo=datetime.timezone.utc)
+
+
+def pipeline_execution(execution_id, status='Succeeded'):
+    return {
+        'pipelineExecutionId': execution_id,
+        'status': status,
+        'startTime': START_TIME,
+        'lastUpdateTime': START_TIME
+    }
+
+
+def event_handler_for(event, pages, execution_cache):
+    codepipeline = mock.Mock()
+    codepipeline.get_paginator.return_value.paginate.side_effect = lambda **kwargs: iter([pages.pop(0)])
+    event_handler = PipelineEventHandler(event, codepipeline=codepipeline, execution_cache=execution_cache)
+    event_handler._check_for_allowed_state()
+
+    return event_handler
+
+
+def test_get_cached_executions_ensure_pages_are_reused_within_an_invocation(event, env_variables):
+    execution_id = event['detail']['execution-id']
+    pages = [{'pipelineExecutionSummaries': [pipeline_execution(execution_id)]}]
+    execution_cache = TTLCache()
+    event_handler = event_handler_for(event, pages, execution_cache)
+
+    assert len(list(event_handler._filter_pipeline_executions())) == 1
+    assert event_handler._get_pipeline_execution(execution_id).execution_id == execution_id
+    assert event_handler.codepipeline.get_paginator.return_value.paginate.call_count == 1
+    assert execution_cache.statistics()['hits'] == 1
+
+
+def test_get_cached_executions_ensure_pages_are_reused_across_events(event, env_variables):
+    execution_id = event['detail']['execution-id']
+    execution_cache = TTLCache()
+    first_pages = [{'pipelineExecutionSummaries': [pipeline_execution(execution_id)]}]
+    list(event_handler_for(event, first_pages, execution_cache)._list_pipeline_executions())
+
+    event_handler = event_handler_for(event, [], execution_cache)
+
+    assert len(list(event_handler._list_pipeline_executions())) == 1
+    assert not event_handler.codepipeline.get_paginator.return_value.paginate.called
+
+
+def test_get_cached_executions_ensure_pages_are_invalidated_by_a_newer_execution(event, env_variables):
+    execution_cache = TTLCache()
+    first_pages = [{'pipelineExecutionSummaries': [pipeline_execution('foo')]}]
+    event['detail']['execution-id'] = 'foo'
+    list(event_handler_for(event, first_pages, execution_cache)._list_pipeline_executions())
+
+    event['detail']['execution-id'] = 'bar'
+    pages = [{'pipelineExecutionSummaries': [pipeline_execution('bar'), pipeline_execution('foo')]}]
+    response = list(event_handler_for(event, pages, execution_cache)._filter_pipeline_executions())
+
+    assert [execution.execution_id for execution in response] == ['bar', 'foo']
+    assert execution_cache.statistics()['invalidations'] == 1
+
+
+def test_get_cached_executions_ensure_in_progress_execution_invalidates_the_pages(event, env_variables):
+    execution_id = event['detail']['execution-id']
+    execution_cache = TTLCache()
+    first_pages = [{'pipelineExecutionSummaries': [pipeline_execution(execution_id, 'InProgress')]}]
+    list(event_handler_for(event, first_pages, execution_cache)._list_pipeline_executions())
+
+    pages = [{'pipelineExecutionSummaries': [pipeline_execution(execution_id)]}]
+    response = list(event_handler_for(event, pages, execution_cache)._filter_pipeline_executions())
+
+    assert response[0].status == ExecutionStatus.SUCCEEDED
+
+
+def test_list_pipeline_executions_ensure_paging_resumes_after_the_cached_pages(event, env_variables):
+    execution_id = event['detail']['execution-id']
+    execution_cache = TTLCache()
+    pages = [
+        {'pipelineExecutionSummaries': [pipeline_execution(execution_id)], 'nextToken': 'foo'},
+        {'pipelineExecutionSummaries': [pipeline_execution('bar')]}
+    ]
+    event_handler = event_handler_for(event, pages, execution_cache)
+    next(event_handler._list_pipeline_executions())
+
+    response = list(event_handler._list_pipeline_executions())
+    paginate = event_handler.codepipeline.get_paginator.return_value.paginate
+
+    assert len(response) == 2
+    assert paginate.call_count == 2
+    assert 'StartingToken' in paginate.call_args.kwargs['PaginationConfig']
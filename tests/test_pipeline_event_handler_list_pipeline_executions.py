@@ -5,23 +5,34 @@ import pytest
 from pipeline_event_handler import PipelineEventHandler
 
 
-@mock.patch('pipeline_event_handler.boto3')
+@mock.patch('clients.boto3')
 def test_list_pipeline_executions_ensure_parameters_are_called_properly(mock_boto, event, env_variables):
     event_handler = PipelineEventHandler(event)
     event_handler._check_for_allowed_state()
-    response = event_handler._list_pipeline_executions()
+    response = list(event_handler._list_pipeline_executions())
 
-    assert mock_boto.client.return_value.list_pipeline_executions.called
-    mock_boto.client.return_value.list_pipeline_executions.assert_called_with(
+    assert mock_boto.client.return_value.get_paginator.called
+    mock_boto.client.return_value.get_paginator.assert_called_with('list_pipeline_executions')
+    mock_boto.client.return_value.get_paginator.return_value.paginate.assert_called_with(
         pipelineName=event_handler.pipeline_name
     )
+    assert isinstance(response, list)
 
 
-@mock.patch('pipeline_event_handler.boto3')
+@mock.patch('clients.boto3')
+def test_list_pipeline_executions_ensure_pages_are_requested_lazily(mock_boto, event, env_variables):
+    event_handler = PipelineEventHandler(event)
+    event_handler._check_for_allowed_state()
+    event_handler._list_pipeline_executions()
+
+    assert not mock_boto.client.return_value.get_paginator.called
+
+
+@mock.patch('clients.boto3')
 def test_list_pipeline_executions_ensure_exception_is_handled(mock_boto, event, env_variables):
     event_handler = PipelineEventHandler(event)
     event_handler._check_for_allowed_state()
-    mock_boto.client.return_value.list_pipeline_executions.side_effect = botocore.exceptions.ClientError({}, 'foo')
+    mock_boto.client.return_value.get_paginator.side_effect = botocore.exceptions.ClientError({}, 'foo')
 
     with pytest.raises(botocore.exceptions.ClientError):
-        event_handler._list_pipeline_executions()
+        list(event_handler._list_pipeline_executions())
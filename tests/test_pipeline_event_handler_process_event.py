@@ -0,0 +1,64 @@
+from unittest import mock
+
+from pipeline_event_handler import PipelineEventHandler
+from pipeline_registry import SQLitePipelineRegistry
+
+
+@mock.patch('pipeline_event_handler.PipelineEventHandler._add_event_metrics')
+def test_process_event_ensure_matching_event_is_processed(mock_add_event_metrics, event, env_variables):
+    event_handler = PipelineEventHandler(event, codepipeline=mock.Mock(), cloudwatch=mock.Mock())
+
+    assert event_handler.process_event()
+    assert mock_add_event_metrics.called
+    assert event_handler.pipeline_name == 'foobar'
+
+
+@mock.patch('pipeline_event_handler.PipelineEventHandler._add_event_metrics')
+def test_process_event_ensure_non_allowed_state_is_skipped(mock_add_event_metrics, failing_state_event, env_variables):
+    event_handler = PipelineEventHandler(failing_state_event, codepipeline=mock.Mock(), cloudwatch=mock.Mock())
+
+    assert not event_handler.process_event()
+    assert not mock_add_event_metrics.called
+
+
+@mock.patch('pipeline_event_handler.PipelineEventHandler._add_event_metrics')
+def test_process_event_ensure_non_matching_pipeline_is_skipped(mock_add_event_metrics, failing_prefix_event, env_variables):
+    event_handler = PipelineEventHandler(failing_prefix_event, codepipeline=mock.Mock(), cloudwatch=mock.Mock())
+
+    assert not event_handler.process_event()
+    assert not mock_add_event_metrics.called
+
+
+@mock.patch('pipeline_event_handler.PipelineEventHandler._process_pipeline_executions')
+def test_process_event_ensure_pipeline_is_recorded_in_the_registry(_mock_process_pipeline_executions, event, env_variables):
+    pipeline_registry = SQLitePipelineRegistry()
+    event_handler = PipelineEventHandler(
+        event, codepipeline=mock.Mock(), cloudwatch=mock.Mock(), pipeline_registry=pipeline_registry
+    )
+
+    event_handler.process_event()
+
+    # 2021-04-26T15:11:59Z
+    assert pipeline_registry.list_pipelines(1619449919000) == ['foobar']
+    assert pipeline_registry.list_pipelines(1619449919001) == []
+
+
+@mock.patch('pipeline_event_handler.PipelineEventHandler._process_pipeline_executions')
+def test_process_event_ensure_regeneration_is_signalled_for_a_new_pipeline_only(
+    _mock_process_pipeline_executions,
+    event,
+    env_variables
+):
+    pipeline_registry = SQLitePipelineRegistry()
+    regeneration_signal = mock.Mock()
+
+    for _ in range(2):
+        PipelineEventHandler(
+            event,
+            codepipeline=mock.Mock(),
+            cloudwatch=mock.Mock(),
+            pipeline_registry=pipeline_registry,
+            regeneration_signal=regeneration_signal
+        ).process_event()
+
+    regeneration_signal.signal.assert_called_once_with('foobar')
@@ -0,0 +1,90 @@
+import datetime
+from unittest import mock
+
+from pipeline_event_handler import PipelineEventHandler
+
+START_TIME = datetime.datetime(2021, 4, 20, 12, 0, 0, tzinfo=datetime.timezone.utc)
+
+
+def pipeline_executions(statuses):
+    """Builds execution summaries, newest first, from a list of statuses ordered oldest to newest"""
+    return [
+        {
+            'pipelineExecutionId': f'execution-{index}',
+            'status': status,
+            'startTime': START_TIME + datetime.timedelta(hours=index),
+            'lastUpdateTime': START_TIME + datetime.timedelta(hours=index, minutes=5)
+        }
+        for index, status in reversed(list(enumerate(statuses)))
+    ]
+
+
+def paginated(executions, page_size, requested_pages):
+    for index in range(0, len(executions), page_size):
+        requested_pages.append(index // page_size)
+        response = {'pipelineExecutionSummaries': executions[index:index + page_size]}
+        if index + page_size < len(executions):
+            response['nextToken'] = f'token-{index // page_size + 1}'
+        yield response
+
+
+def event_handler_for(event, executions, page_size, requested_pages):
+    codepipeline = mock.Mock()
+    codepipeline.get_paginator.return_value.paginate.return_value = paginated(executions, page_size, requested_pages)
+    event_handler = PipelineEventHandler(event, codepipeline=codepipeline, cloudwatch=mock.Mock())
+    event_handler._check_for_allowed_state()
+
+    return event_handler
+
+
+def test_process_pipeline_executions_ensure_paging_stops_once_state_is_final(event, env_variables):
+    executions = pipeline_executions(['Succeeded'] * 10)
+    event['detail']['execution-id'] = 'execution-9'
+    requested_pages = []
+    event_handler = event_handler_for(event, executions, 2, requested_pages)
+
+    event_handler._process_pipeline_executions()
+
+    assert requested_pages == [0]
+    assert event_handler.pipeline_state_is_final
+    assert event_handler.prior_success_execution.execution_id == 'execution-8'
+
+
+def test_process_pipeline_executions_ensure_deep_history_is_resolved(event, env_variables):
+    executions = pipeline_executions(['Succeeded', 'Succeeded'] + ['Failed'] * 5 + ['Succeeded'])
+    event['detail']['execution-id'] = 'execution-7'
+    requested_pages = []
+    event_handler = event_handler_for(event, executions, 2, requested_pages)
+
+    event_handler._process_pipeline_executions()
+
+    assert requested_pages == [0, 1, 2, 3]
+    assert event_handler.pipeline_state_is_final
+    assert event_handler.prior_success_execution.execution_id == 'execution-1'
+    assert event_handler.prior_state_execution.execution_id == 'execution-2'
+    assert event_handler.prior_success_plus_one_execution.execution_id == 'execution-2'
+
+
+def test_process_pipeline_executions_ensure_paging_stops_at_the_page_limit(event, env_variables):
+    executions = pipeline_executions(['Failed'] * 99 + ['Succeeded'])
+    event['detail']['execution-id'] = 'execution-99'
+    requested_pages = []
+    event_handler = event_handler_for(event, executions, 2, requested_pages)
+
+    event_handler._process_pipeline_executions()
+
+    assert requested_pages == list(range(10))
+    assert event_handler.current_pipeline_execution.execution_id == 'execution-99'
+    assert not hasattr(event_handler, 'pipeline_state_is_final')
+
+
+def test_process_pipeline_executions_ensure_execution_in_progress_stops_at_the_page_limit(event, env_variables):
+    executions = pipeline_executions(['Succeeded'] * 99 + ['InProgress'])
+    event['detail']['execution-id'] = 'execution-99'
+    requested_pages = []
+    event_handler = event_handler_for(event, executions, 2, requested_pages)
+
+    event_handler._process_pipeline_executions()
+
+    assert requested_pages == list(range(10))
+    assert not hasattr(event_handler, 'current_pipeline_execution')
@@ -0,0 +1,161 @@
+import datetime
+from unittest import mock
+
+import pytest
+from cache import TTLCache
+from execution_record import ExecutionStatus, parse_execution_summaries
+from execution_store import SQLiteExecutionStore
+from pipeline_event_handler import PipelineEventHandler
+
+START_TIME = datetime.datetime(2021, 4, 20, 12, 0, 0, tzinfo=datetime.timezone.utc)
+
+
+def pipeline_executions(statuses):
+    """Builds execution summaries, newest first, from a list of statuses ordered oldest to newest"""
+    return [
+        {
+            'pipelineExecutionId': f'execution-{index}',
+            'status': status,
+            'startTime': START_TIME + datetime.timedelta(hours=index),
+            'lastUpdateTime': START_TIME + datetime.timedelta(hours=index, minutes=5 + index)
+        }
+        for index, status in reversed(list(enumerate(statuses)))
+    ]
+
+
+def pipeline_event(statuses):
+    return {
+        'time': '2021-04-26T15:11:59Z',
+        'detail': {
+            'pipeline': 'foobar',
+            'execution-id': f'execution-{len(statuses) - 1}',
+            'state': statuses[-1].upper()
+        }
+    }
+
+
+def put_metric_data(event, executions, execution_store=None):
+    codepipeline = mock.Mock()
+    codepipeline.get_paginator.return_value.paginate.return_value = [{'pipelineExecutionSummaries': executions}]
+    cloudwatch = mock.Mock()
+
+    PipelineEventHandler(
+        event,
+        codepipeline=codepipeline,
+        cloudwatch=cloudwatch,
+        execution_store=execution_store,
+        execution_cache=TTLCache()
+    ).execute_event_steps()
+
+    return sorted(
+        (datum['MetricName'], datum['Value']) for datum in cloudwatch.put_metric_data.call_args.kwargs['MetricData']
+    )
+
+
+@pytest.mark.parametrize('statuses', [
+    ['Succeeded'],
+    ['Failed'],
+    ['Succeeded', 'Succeeded'],
+    ['Succeeded', 'Failed'],
+    ['Failed', 'Succeeded'],
+    ['Succeeded', 'Failed', 'Failed', 'Succeeded'],
+    ['Failed', 'Succeeded', 'Succeeded', 'Failed', 'Failed'],
+    ['Succeeded', 'Succeeded', 'Failed', 'Succeeded', 'Failed', 'Failed', 'Failed', 'Succeeded']
+])
+def test_process_pipeline_executions_from_store_ensure_metrics_match_the_execution_scan(statuses, env_variables):
+    event = pipeline_event(statuses)
+    executions = pipeline_executions(statuses)
+
+    assert put_metric_data(event, executions, SQLiteExecutionStore()) == put_metric_data(event, executions)
+
+
+def test_process_pipeline_executions_from_store_ensure_history_is_used_across_events(env_variables):
+    statuses = ['Succeeded', 'Failed', 'Failed', 'Succeeded']
+    executions = pipeline_executions(statuses)
+    execution_store = SQLiteExecutionStore()
+    execution_store.upsert_executions('foobar', parse_execution_summaries(executions[1:]))
+
+    response = put_metric_data(pipeline_event(statuses), executions[:1], execution_store)
+
+    assert response == put_metric_data(pipeline_event(statuses), executions)
+    assert execution_store.get_execution('foobar', 'execution-3').status == ExecutionStatus.SUCCEEDED
+
+
+def test_fetch_new_executions_ensure_paging_stops_at_stored_history(event, env_variables):
+    statuses = ['Succeeded', 'Failed', 'Succeeded']
+    executions = pipeline_executions(statuses)
+    event['detail']['execution-id'] = 'execution-2'
+    execution_store = SQLiteExecutionStore()
+    execution_store.upsert_executions('foobar', parse_execution_summaries(executions[1:]))
+    pages = mock.MagicMock()
+    pages.__iter__.return_value = iter([
+        {'pipelineExecutionSummaries': executions[:2]},
+        {'pipelineExecutionSummaries': executions[2:]}
+    ])
+    codepipeline = mock.Mock()
+    codepipeline.get_paginator.return_value.paginate.return_value = pages
+
+    event_handler = PipelineEventHandler(event, codepipeline=codepipeline, execution_store=execution_store)
+    event_handler._check_for_allowed_state()
+    response = event_handler._fetch_new_executions()
+
+    assert response == parse_execution_summaries(executions[:1])
+    codepipeline.get_paginator.assert_called_with('list_pipeline_executions')
+    assert not codepipeline.list_pipeline_executions.called
+
+
+def test_fetch_new_executions_ensure_only_final_executions_are_returned(event, env_variables):
+    executions = pipeline_executions(['Succeeded', 'Succeeded'])
+    executions[1]['status'] = 'InProgress'
+    event['detail']['execution-id'] = 'execution-1'
+    codepipeline = mock.Mock()
+    codepipeline.get_paginator.return_value.paginate.return_value = [{'pipelineExecutionSummaries': executions}]
+
+    event_handler = PipelineEventHandler(event, codepipeline=codepipeline, execution_store=SQLiteExecutionStore())
+    event_handler._check_for_allowed_state()
+
+    assert event_handler._fetch_new_executions() == parse_execution_summaries(executions[:1])
+
+
+def paginated(executions, page_size, requested_pages):
+    for index in range(0, len(executions), page_size):
+        requested_pages.append(index // page_size)
+        response = {'pipelineExecutionSummaries': executions[index:index + page_size]}
+        if index + page_size < len(executions):
+            response['nextToken'] = f'token-{index // page_size + 1}'
+        yield response
+
+
+def fetch_new_executions(event, executions, execution_store, requested_pages):
+    codepipeline = mock.Mock()
+    codepipeline.get_paginator.return_value.paginate.return_value = paginated(executions, 2, requested_pages)
+
+    event_handler = PipelineEventHandler(event, codepipeline=codepipeline, execution_store=execution_store)
+    event_handler._check_for_allowed_state()
+    return event_handler._fetch_new_executions()
+
+
+def test_fetch_new_executions_ensure_execution_in_progress_stops_at_the_page_limit(event, env_variables):
+    executions = pipeline_executions(['Succeeded'] * 99 + ['InProgress'])
+    event['detail']['execution-id'] = 'execution-99'
+    execution_store = SQLiteExecutionStore()
+    execution_store.upsert_executions('foobar', parse_execution_summaries(executions[40:]))
+    requested_pages = []
+
+    response = fetch_new_executions(event, executions, execution_store, requested_pages)
+
+    assert requested_pages == list(range(10))
+    assert response == parse_execution_summaries(executions[1:20])
+
+
+def test_fetch_new_executions_ensure_stored_event_execution_stops_at_stored_history(event, env_variables):
+    executions = pipeline_executions(['Succeeded'] * 100)
+    event['detail']['execution-id'] = 'execution-90'
+    execution_store = SQLiteExecutionStore()
+    execution_store.upsert_executions('foobar', parse_execution_summaries(executions[5:]))
+    requested_pages = []
+
+    response = fetch_new_executions(event, executions, execution_store, requested_pages)
+
+    assert requested_pages == [0, 1, 2]
+    assert response == parse_execution_summaries(executions[:5])
@@ -0,0 +1,51 @@
+import fnmatch
+
+import pytest
+from pipeline_matcher import PipelineMatcher, get_pipeline_matcher
+
+
+@pytest.mark.parametrize('pattern', ['*', 'foo*', 'foo', 'f?o*', '*bar', 'foo[bx]*', '[!f]*', 'foo*bar'])
+def test_matches_ensure_single_pattern_matches_fnmatch(pattern):
+    pipeline_names = ['foo', 'foobar', 'foobaz', 'fox', 'bar', 'foo-x-bar', 'FOObar', '']
+    matcher = PipelineMatcher(pattern)
+
+    assert matcher.filter(pipeline_names) == fnmatch.filter(pipeline_names, pattern)
+
+
+def test_matches_ensure_any_include_pattern_is_enough():
+    matcher = PipelineMatcher('team-a-*, team-b-*,release')
+
+    assert matcher.filter(['team-a-api', 'team-b-web', 'team-c-db', 'release', 'release-2']) == [
+        'team-a-api', 'team-b-web', 'release'
+    ]
+
+
+def test_matches_ensure_exclusions_win_over_inclusions():
+    matcher = PipelineMatcher('team-*,!team-*-sandbox,!team-legacy')
+
+    assert matcher.matches('team-a-api')
+    assert not matcher.matches('team-a-sandbox')
+    assert not matcher.matches('team-legacy')
+
+
+def test_matches_ensure_only_exclusions_match_everything_else():
+    matcher = PipelineMatcher('!*-sandbox')
+
+    assert matcher.filter(['foo', 'foo-sandbox']) == ['foo']
+
+
+@pytest.mark.parametrize('pattern', ['', ' , '])
+def test_matches_ensure_empty_pattern_matches_nothing(pattern):
+    assert PipelineMatcher(pattern).filter(['foo', 'foo-sandbox']) == []
+
+
+def test_matches_ensure_results_are_memoised():
+    matcher = PipelineMatcher('foo*')
+    matcher.matches('foobar')
+    matcher.matches('foobar')
+
+    assert matcher.matches.cache_info().hits == 1
+
+
+def test_get_pipeline_matcher_ensure_matcher_is_compiled_once():
+    assert get_pipeline_matcher('foo*') is get_pipeline_matcher('foo*')
@@ -0,0 +1,77 @@
+from unittest import mock
+
+import botocore
+import pytest
+from pipeline_registry import DynamoDBPipelineRegistry
+
+
+def test_record_pipeline_ensure_first_sighting_is_reported():
+    dynamodb = mock.Mock()
+    dynamodb.update_item.return_value = {}
+
+    assert DynamoDBPipelineRegistry('pipelines', dynamodb=dynamodb).record_pipeline('foobar', 1000)
+    assert dynamodb.update_item.call_args.kwargs['Key'] == {'PipelineName': {'S': 'foobar'}}
+    assert dynamodb.update_item.call_args.kwargs['ExpressionAttributeValues'] == {':last_seen': {'N': '1000'}}
+
+
+def test_record_pipeline_ensure_known_pipeline_is_not_reported():
+    dynamodb = mock.Mock()
+    dynamodb.update_item.return_value = {'Attributes': {'FirstSeen': {'N': '500'}, 'LastSeen': {'N': '500'}}}
+
+    assert not DynamoDBPipelineRegistry('pipelines', dynamodb=dynamodb).record_pipeline('foobar', 1000)
+
+
+def test_record_pipeline_ensure_older_event_is_ignored():
+    dynamodb = mock.Mock()
+    dynamodb.update_item.side_effect = botocore.exceptions.ClientError(
+        {'Error': {'Code': 'ConditionalCheckFailedException'}}, 'UpdateItem'
+    )
+
+    assert not DynamoDBPipelineRegistry('pipelines', dynamodb=dynamodb).record_pipeline('foobar', 1000)
+
+
+def test_record_pipeline_ensure_exception_is_handled():
+    dynamodb = mock.Mock()
+    dynamodb.update_item.side_effect = botocore.exceptions.ClientError({}, 'foo')
+
+    with pytest.raises(botocore.exceptions.ClientError):
+        DynamoDBPipelineRegistry('pipelines', dynamodb=dynamodb).record_pipeline('foobar', 1000)
+
+
+def test_list_pipelines_ensure_pages_are_merged_and_sorted():
+    dynamodb = mock.Mock()
+    dynamodb.get_paginator.return_value.paginate.return_value = [
+        {'Items': [{'PipelineName': {'S': 'foobar'}}]},
+        {'Items': [{'PipelineName': {'S': 'baz'}}]}
+    ]
+
+    response = DynamoDBPipelineRegistry('pipelines', dynamodb=dynamodb).list_pipelines(1000)
+
+    assert response == ['baz', 'foobar']
+    dynamodb.get_paginator.assert_called_with('scan')
+    assert dynamodb.get_paginator.return_value.paginate.call_args.kwargs['ExpressionAttributeValues'] == {
+        ':since': {'N': '1000'}
+    }
+
+
+def test_first_seen_ensure_earliest_time_is_read_once():
+    dynamodb = mock.Mock()
+    dynamodb.get_paginator.return_value.paginate.return_value = [
+        {'Items': [{'FirstSeen': {'N': '2000'}}]},
+        {'Items': [{'FirstSeen': {'N': '1000'}}]}
+    ]
+    pipeline_registry = DynamoDBPipelineRegistry('pipelines', dynamodb=dynamodb)
+
+    assert pipeline_registry.first_seen() == 1000
+    assert pipeline_registry.first_seen() == 1000
+    assert dynamodb.get_paginator.return_value.paginate.call_count == 1
+
+
+def test_first_seen_ensure_empty_table_is_read_again():
+    dynamodb = mock.Mock()
+    dynamodb.get_paginator.return_value.paginate.return_value = [{'Items': []}]
+    pipeline_registry = DynamoDBPipelineRegistry('pipelines', dynamodb=dynamodb)
+
+    assert pipeline_registry.first_seen() is None
+    assert pipeline_registry.first_seen() is None
+    assert dynamodb.get_paginator.return_value.paginate.call_count == 2
@@ -0,0 +1,28 @@
+import os
+from unittest import mock
+
+from pipeline_registry import DynamoDBPipelineRegistry, SQLitePipelineRegistry, get_pipeline_registry
+
+
+@mock.patch('pipeline_registry._pipeline_registry.instance', None)
+def test_get_pipeline_registry_ensure_none_without_configuration():
+    assert get_pipeline_registry() is None
+
+
+@mock.patch('pipeline_registry._pipeline_registry.instance', None)
+def test_get_pipeline_registry_ensure_sqlite_registry_is_shared():
+    with mock.patch.dict(os.environ, {'PIPELINE_REGISTRY': 'sqlite', 'PIPELINE_REGISTRY_PATH': ':memory:'}):
+        pipeline_registry = get_pipeline_registry()
+
+        assert isinstance(pipeline_registry, SQLitePipelineRegistry)
+        assert get_pipeline_registry() is pipeline_registry
+
+
+@mock.patch('pipeline_registry._pipeline_registry.instance', None)
+@mock.patch('clients.boto3')
+def test_get_pipeline_registry_ensure_dynamodb_registry_is_created(_mock_boto):
+    with mock.patch.dict(os.environ, {'PIPELINE_REGISTRY': 'dynamodb', 'PIPELINE_REGISTRY_TABLE': 'pipelines'}):
+        pipeline_registry = get_pipeline_registry()
+
+    assert isinstance(pipeline_registry, DynamoDBPipelineRegistry)
+    assert pipeline_registry.table_name == 'pipelines'
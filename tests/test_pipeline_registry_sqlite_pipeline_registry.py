@@ -0,0 +1,33 @@
+import pytest
+from pipeline_registry import SQLitePipelineRegistry
+
+
+@pytest.fixture()
+def pipeline_registry():
+    pipeline_registry = SQLitePipelineRegistry()
+    pipeline_registry.record_pipeline('foobar', 1000)
+    pipeline_registry.record_pipeline('baz', 2000)
+
+    return pipeline_registry
+
+
+def test_record_pipeline_ensure_first_sighting_is_reported(pipeline_registry):
+    assert pipeline_registry.record_pipeline('foo', 3000)
+    assert not pipeline_registry.record_pipeline('foobar', 3000)
+
+
+def test_list_pipelines_ensure_pipelines_outside_the_retention_are_skipped(pipeline_registry):
+    assert pipeline_registry.list_pipelines(0) == ['baz', 'foobar']
+    assert pipeline_registry.list_pipelines(1500) == ['baz']
+
+
+def test_record_pipeline_ensure_last_seen_only_moves_forward(pipeline_registry):
+    pipeline_registry.record_pipeline('foobar', 3000)
+    pipeline_registry.record_pipeline('foobar', 500)
+
+    assert pipeline_registry.list_pipelines(2500) == ['foobar']
+
+
+def test_first_seen_ensure_earliest_sighting_is_returned(pipeline_registry):
+    assert pipeline_registry.first_seen() == 1000
+    assert SQLitePipelineRegistry().first_seen() is None
@@ -0,0 +1,34 @@
+from rate_limiter import RateLimiter
+
+
+class FakeClock():
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def timer(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_acquire_ensure_requests_are_spaced_by_the_rate():
+    clock = FakeClock()
+    rate_limiter = RateLimiter(4, timer=clock.timer, sleep=clock.sleep)
+
+    for _ in range(3):
+        rate_limiter.acquire()
+
+    assert clock.sleeps == [0.25, 0.25]
+
+
+def test_acquire_ensure_idle_limiter_does_not_sleep():
+    clock = FakeClock()
+    rate_limiter = RateLimiter(4, timer=clock.timer, sleep=clock.sleep)
+    rate_limiter.acquire()
+    clock.now += 1
+    rate_limiter.acquire()
+
+    assert clock.sleeps == []
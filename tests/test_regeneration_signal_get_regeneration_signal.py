@@ -0,0 +1,24 @@
+import os
+from unittest import mock
+
+from regeneration_signal import SQSRegenerationSignal, get_regeneration_signal
+
+
+@mock.patch('regeneration_signal._regeneration_signal.instance', None)
+def test_get_regeneration_signal_ensure_none_without_configuration():
+    with mock.patch.dict(os.environ, {'DASHBOARD_REGENERATION_QUEUE_URL': ''}):
+        assert get_regeneration_signal() is None
+
+
+@mock.patch('regeneration_signal._regeneration_signal.instance', None)
+@mock.patch('clients.boto3')
+def test_get_regeneration_signal_ensure_sqs_signal_is_shared(_mock_boto):
+    with mock.patch.dict(
+        os.environ,
+        {'DASHBOARD_REGENERATION_QUEUE_URL': 'https://sqs/queue.fifo', 'DASHBOARD_REGENERATION_WINDOW': '120'}
+    ):
+        regeneration_signal = get_regeneration_signal()
+
+        assert isinstance(regeneration_signal, SQSRegenerationSignal)
+        assert regeneration_signal.window_seconds == 120
+        assert get_regeneration_signal() is regeneration_signal
@@ -0,0 +1,46 @@
+import json
+from unittest import mock
+
+import botocore
+from regeneration_signal import SQSRegenerationSignal
+
+QUEUE_URL = 'https://sqs.us-east-1.amazonaws.com/123456789012/dashboard-regeneration.fifo'
+
+
+@mock.patch('regeneration_signal.time')
+def test_signal_ensure_message_is_deduplicated_by_window(mock_time):
+    mock_time.time.return_value = 1619449919
+    sqs = mock.Mock()
+
+    assert SQSRegenerationSignal(QUEUE_URL, window_seconds=60, sqs=sqs).signal('foobar')
+
+    sqs.send_message.assert_called_once_with(
+        QueueUrl=QUEUE_URL,
+        MessageBody=json.dumps({'pipeline': 'foobar', 'window': 26990831}),
+        MessageGroupId='dashboard',
+        MessageDeduplicationId='dashboard-26990831'
+    )
+
+
+def test_signal_ensure_one_message_is_sent_for_each_window():
+    sqs = mock.Mock()
+    regeneration_signal = SQSRegenerationSignal(QUEUE_URL, window_seconds=60, sqs=sqs)
+
+    with mock.patch('regeneration_signal.time') as mock_time:
+        mock_time.time.side_effect = [1619449920, 1619449979, 1619449980]
+        sent = [regeneration_signal.signal(pipeline_name) for pipeline_name in ['foo', 'bar', 'baz']]
+
+    assert sent == [True, False, True]
+    assert [call.kwargs['MessageDeduplicationId'] for call in sqs.send_message.call_args_list] == [
+        'dashboard-26990832', 'dashboard-26990833'
+    ]
+
+
+def test_signal_ensure_failed_request_is_retried_by_the_next_signal():
+    sqs = mock.Mock()
+    sqs.send_message.side_effect = [botocore.exceptions.ClientError({}, 'SendMessage'), {}]
+    regeneration_signal = SQSRegenerationSignal(QUEUE_URL, sqs=sqs)
+
+    assert not regeneration_signal.signal('foo')
+    assert regeneration_signal.signal('bar')
+    assert sqs.send_message.call_count == 2
@@ -0,0 +1,35 @@
+import os
+from unittest import mock
+
+from shared_backend import SharedBackend
+
+
+def test_shared_backend_ensure_backend_is_created_once():
+    create = mock.Mock()
+    shared_backend = SharedBackend('FOO_BACKEND', create)
+
+    with mock.patch.dict(os.environ, {'FOO_BACKEND': 'bar'}):
+        assert shared_backend.get() is create.return_value
+        assert shared_backend.get() is create.return_value
+
+    create.assert_called_once_with('bar')
+
+
+def test_shared_backend_ensure_none_without_setting():
+    shared_backend = SharedBackend('FOO_BACKEND', mock.Mock())
+
+    with mock.patch.dict(os.environ, {'FOO_BACKEND': 'bar'}):
+        shared_backend.get()
+    with mock.patch.dict(os.environ, {'FOO_BACKEND': ''}):
+        assert shared_backend.get() is None
+
+
+def test_shared_backend_ensure_unknown_backend_is_retried():
+    create = mock.Mock(return_value=None)
+    shared_backend = SharedBackend('FOO_BACKEND', create)
+
+    with mock.patch.dict(os.environ, {'FOO_BACKEND': 'bar'}):
+        assert shared_backend.get() is None
+        assert shared_backend.get() is None
+
+    assert create.call_count == 2